@@ -1,10 +1,17 @@
 """Article clustering to group similar news items into events."""
 
 import logging
-from typing import List, Dict, Any
+import math
+import time
+from array import array
+from collections import Counter
+from itertools import combinations
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from .models import NewsItem, Event
-from .utils import title_similarity, load_yaml, get_config_path
+from .utils import (
+    TokenVocabulary, ids_jaccard, get_title_tokens, load_yaml, get_config_path
+)
 
 
 logger = logging.getLogger(__name__)
@@ -19,82 +26,259 @@ def load_clustering_config() -> Dict[str, Any]:
         'financial_similarity_threshold': config.get('financial_similarity_threshold', 0.25),
         'min_sources_per_event': config.get('min_sources_per_event', 2),
         'financial_sources': set(config.get('financial_sources', [])),
+        'linkage': config.get('cluster_linkage', 'single'),
+        # The seed is always kept, so the window holds at least one set
+        'max_representatives': max(1, config.get('max_cluster_representatives', 5)),
+        'centroid_min_share': config.get('centroid_min_share', 0.5),
     }
 
 
+# How an incoming item is compared with an existing cluster:
+#   single          - every member (max similarity); cost grows with cluster size
+#   representatives - the seed plus the most recently joined members, at most
+#                     `max_representatives` token sets
+#   centroid        - one token set: tokens used by at least
+#                     `centroid_min_share` of the members
+LINKAGES = ('single', 'representatives', 'centroid')
+
+
 def _is_financial_item(item: NewsItem, financial_sources: set) -> bool:
     """Check if item is from a financial source."""
     return item.source_id in financial_sources
 
 
-def cluster_items(items: List[NewsItem]) -> List[Event]:
+class _Cluster:
+    """A cluster being built, with the token id lists items are matched against."""
+
+    def __init__(self, item: NewsItem, token_ids: array, is_financial: bool,
+                 linkage: str, config: Dict[str, Any]):
+        """Start a cluster seeded with a single item."""
+        self.items = [item]
+        # Items only join clusters of their own topic type, so the seed decides
+        self.is_financial = is_financial
+        self.linkage = linkage
+        self.config = config
+        # Sorted token id arrays
+        self.match_sets: List[array] = [token_ids]
+        self.token_counts: Counter = Counter(token_ids)
+
+    def add(self, item: NewsItem, token_ids: array) -> None:
+        """Add a member and update the token sets used for matching."""
+        self.items.append(item)
+
+        if self.linkage == 'single':
+            self.match_sets.append(token_ids)
+        elif self.linkage == 'representatives':
+            # Keep the seed and slide a window over the latest members;
+            # a window of one keeps only the seed
+            if self.config['max_representatives'] > 1:
+                if len(self.match_sets) >= self.config['max_representatives']:
+                    del self.match_sets[1]
+                self.match_sets.append(token_ids)
+        else:
+            self.token_counts.update(token_ids)
+            min_count = max(1, math.ceil(self.config['centroid_min_share'] * len(self.items)))
+            centroid = [t for t, n in self.token_counts.items() if n >= min_count]
+            if not centroid:
+                top = max(self.token_counts.values())
+                centroid = [t for t, n in self.token_counts.items() if n == top]
+            self.match_sets = [array('I', sorted(centroid))]
+
+
+def _min_overlap(threshold: float, size: int) -> int:
     """
-    Cluster news items into events based on title similarity.
+    Fewest shared tokens a set of `size` tokens needs to reach `threshold`.
 
-    Uses greedy clustering algorithm:
-    - Process items from newest to oldest
-    - For each item, find most similar existing cluster
-    - If similarity >= threshold, add to cluster
-    - Otherwise, create new cluster
+    Rounded down slightly so float error (0.35 * 20 = 7.000000000000001)
+    can only make the filters looser, never drop a true match.
+    """
+    return max(1, math.ceil(threshold * size - 1e-9))
+
+
+class _PrefixIndex:
+    """
+    Candidate generation for exact Jaccard matching (AllPairs/PPJoin filters).
+
+    Jaccard(x, y) >= t requires t <= |x|/|y| <= 1/t (size filter), and,
+    with tokens sorted in one global order (rarest first), x and y sharing
+    a token among their first |s| - ceil(t * |s|) + 1 tokens (prefix
+    filter). Only members passing both filters are returned; their exact
+    similarity is then computed as usual, so results are unchanged.
+
+    Token ids from TokenVocabulary.from_token_sets are already in that
+    order, so a prefix is just the start of the sorted id array.
+    """
+
+    def __init__(self, threshold: float, vocab_size: int):
+        """Create an empty index for one similarity threshold."""
+        self.threshold = threshold
+        self.postings: List[List[Tuple[int, int, array]]] = [[] for _ in range(vocab_size)]
+        self.size = 0
+
+    def _prefix(self, token_ids: array) -> array:
+        """Rarest token ids of a set, as many as the prefix filter needs."""
+        n = len(token_ids)
+        return token_ids[:n - _min_overlap(self.threshold, n) + 1]
+
+    def add(self, cluster_idx: int, token_ids: array) -> None:
+        """Index a cluster member by its prefix tokens."""
+        member = (self.size, cluster_idx, token_ids)
+        self.size += 1
+        for token_id in self._prefix(token_ids):
+            self.postings[token_id].append(member)
+
+    def candidates(self, token_ids: array) -> Iterator[Tuple[int, array]]:
+        """
+        Members that may reach the threshold with `token_ids`.
+
+        Yields:
+            (cluster index, member token ids), each member at most once
+        """
+        n = len(token_ids)
+        if not n:
+            return
+
+        min_size = self.threshold * n - 1e-9
+        max_size = n / self.threshold + 1e-9
+        seen: Set[int] = set()
+
+        for token_id in self._prefix(token_ids):
+            for member_id, cluster_idx, member_ids in self.postings[token_id]:
+                if member_id in seen:
+                    continue
+                seen.add(member_id)
+                if min_size <= len(member_ids) <= max_size:
+                    yield cluster_idx, member_ids
+
+
+def _greedy_cluster(items: List[NewsItem], config: Dict[str, Any],
+                    linkage: str) -> Tuple[List[List[NewsItem]], int]:
+    """
+    Group items into clusters with the greedy newest-first algorithm.
+
+    Titles are encoded once per run against a TokenVocabulary and compared
+    as sorted id arrays. Single-link matching only computes similarities for
+    members that pass the _PrefixIndex filters; the clusters are identical
+    to comparing string token sets against every member.
 
     Args:
-        items: List of NewsItem objects to cluster
+        items: Items to cluster
+        config: Clustering configuration
+        linkage: One of LINKAGES
 
     Returns:
-        List of Event objects (clusters)
+        Tuple of (clusters as item lists, number of token set comparisons)
     """
-    config = load_clustering_config()
-    threshold = config['similarity_threshold']
-    min_sources = config['min_sources_per_event']
+    if linkage not in LINKAGES:
+        raise ValueError(f"Unknown cluster linkage {linkage!r} (expected one of {LINKAGES})")
 
-    if not items:
-        return []
-
-    logger.info(f"Clustering {len(items)} items (threshold={threshold}, min_sources={min_sources})")
+    threshold = config['similarity_threshold']
+    financial_threshold = config['financial_similarity_threshold']
+    financial_sources = config['financial_sources']
 
     # Sort by published date (newest first)
     sorted_items = sorted(items, key=lambda x: x.published_at, reverse=True)
 
-    # Initialize clusters (list of lists of items)
-    clusters: List[List[NewsItem]] = []
+    token_sets = [get_title_tokens(item.title) for item in sorted_items]
+    vocab = TokenVocabulary.from_token_sets(token_sets)
+    item_ids = [vocab.token_ids(tokens) for tokens in token_sets]
+    del token_sets
+
+    # One index per topic type, since each has its own threshold
+    indexes: Optional[Dict[bool, _PrefixIndex]] = None
+    if linkage == 'single' and min(threshold, financial_threshold) > 0:
+        indexes = {
+            False: _PrefixIndex(threshold, len(vocab)),
+            True: _PrefixIndex(financial_threshold, len(vocab)),
+        }
+
+    clusters: List[_Cluster] = []
+    comparisons = 0
 
-    for item in sorted_items:
+    for item, token_ids in zip(sorted_items, item_ids):
+        id_set = set(token_ids)
         # Determine if this is a financial item
-        is_financial = _is_financial_item(item, config['financial_sources'])
+        is_financial = _is_financial_item(item, financial_sources)
         # Use lower threshold for financial items (more aggressive clustering)
-        item_threshold = config['financial_similarity_threshold'] if is_financial else threshold
+        item_threshold = financial_threshold if is_financial else threshold
 
         # Find best matching cluster
         best_cluster_idx = None
         best_similarity = 0.0
 
-        for idx, cluster in enumerate(clusters):
-            # Check if cluster has same topic type (financial vs general)
-            cluster_is_financial = any(_is_financial_item(c_item, config['financial_sources'])
-                                      for c_item in cluster)
-
-            # Only cluster with same topic type
-            if is_financial != cluster_is_financial:
-                continue
+        if indexes is not None:
+            # Candidates arrive in any order; ties go to the oldest cluster
+            for idx, other in indexes[is_financial].candidates(token_ids):
+                similarity = ids_jaccard(id_set, other)
+                comparisons += 1
+
+                if similarity > best_similarity or (
+                        similarity == best_similarity and best_cluster_idx is not None
+                        and idx < best_cluster_idx):
+                    best_similarity = similarity
+                    best_cluster_idx = idx
+        else:
+            for idx, cluster in enumerate(clusters):
+                # Only cluster with same topic type
+                if is_financial != cluster.is_financial:
+                    continue
 
-            # Calculate max similarity to any item in cluster
-            max_sim = max(
-                title_similarity(item.title, cluster_item.title)
-                for cluster_item in cluster
-            )
+                # Best similarity to any of the cluster's match sets
+                similarity = max(ids_jaccard(id_set, other) for other in cluster.match_sets)
+                comparisons += len(cluster.match_sets)
 
-            if max_sim > best_similarity:
-                best_similarity = max_sim
-                best_cluster_idx = idx
+                if similarity > best_similarity:
+                    best_similarity = similarity
+                    best_cluster_idx = idx
 
         # Add to best cluster if similarity meets threshold
         if best_similarity >= item_threshold and best_cluster_idx is not None:
-            clusters[best_cluster_idx].append(item)
+            clusters[best_cluster_idx].add(item, token_ids)
         else:
             # Create new cluster
-            clusters.append([item])
+            best_cluster_idx = len(clusters)
+            clusters.append(_Cluster(item, token_ids, is_financial, linkage, config))
 
-    logger.info(f"Created {len(clusters)} initial clusters")
+        if indexes is not None:
+            indexes[is_financial].add(best_cluster_idx, token_ids)
+
+    return [cluster.items for cluster in clusters], comparisons
+
+
+def cluster_items(items: List[NewsItem],
+                  config: Optional[Dict[str, Any]] = None) -> List[Event]:
+    """
+    Cluster news items into events based on title similarity.
+
+    Uses greedy clustering algorithm:
+    - Process items from newest to oldest
+    - For each item, find most similar existing cluster (see LINKAGES)
+    - If similarity >= threshold, add to cluster
+    - Otherwise, create new cluster
+
+    Args:
+        items: List of NewsItem objects to cluster
+        config: Clustering configuration (loaded if None)
+
+    Returns:
+        List of Event objects (clusters)
+    """
+    if config is None:
+        config = load_clustering_config()
+    threshold = config['similarity_threshold']
+    min_sources = config['min_sources_per_event']
+
+    if not items:
+        return []
+
+    logger.info(
+        f"Clustering {len(items)} items (threshold={threshold}, min_sources={min_sources}, "
+        f"linkage={config['linkage']})"
+    )
+
+    clusters, comparisons = _greedy_cluster(items, config, config['linkage'])
+
+    logger.info(f"Created {len(clusters)} initial clusters ({comparisons} comparisons)")
 
     # Convert clusters to Event objects
     events = []
@@ -115,6 +299,86 @@ def cluster_items(items: List[NewsItem]) -> List[Event]:
     return events
 
 
+def _co_clustered_pairs(clusters: List[List[NewsItem]]) -> Set[Tuple[int, int]]:
+    """Pairs of items (by identity) that share a cluster."""
+    pairs = set()
+    for cluster in clusters:
+        keys = sorted(id(item) for item in cluster)
+        pairs.update(combinations(keys, 2))
+    return pairs
+
+
+def compare_linkages(items: List[NewsItem],
+                     config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Cluster the same items with every linkage and score each against single-link.
+
+    Quality is measured by pair counting: a pair of items is "predicted"
+    when a linkage puts both in one cluster, and "true" when single-link
+    does. Identical clusterings score precision = recall = 1.
+
+    Args:
+        items: Items to cluster
+        config: Clustering configuration (loaded if None)
+
+    Returns:
+        One dict per linkage with clusters, comparisons, seconds,
+        precision, recall, f1 and identical_clusters (share of single-link
+        clusters reproduced exactly)
+    """
+    if config is None:
+        config = load_clustering_config()
+
+    results = []
+    baseline_pairs: Set[Tuple[int, int]] = set()
+    baseline_clusters: Set[frozenset] = set()
+
+    for linkage in LINKAGES:
+        start = time.perf_counter()
+        clusters, comparisons = _greedy_cluster(items, config, linkage)
+        seconds = time.perf_counter() - start
+
+        pairs = _co_clustered_pairs(clusters)
+        keys = {frozenset(id(item) for item in cluster) for cluster in clusters}
+        if linkage == 'single':
+            baseline_pairs, baseline_clusters = pairs, keys
+
+        shared = len(pairs & baseline_pairs)
+        precision = shared / len(pairs) if pairs else 1.0
+        recall = shared / len(baseline_pairs) if baseline_pairs else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+        results.append({
+            'linkage': linkage,
+            'clusters': len(clusters),
+            'comparisons': comparisons,
+            'seconds': seconds,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'identical_clusters': (
+                len(keys & baseline_clusters) / len(baseline_clusters) if baseline_clusters else 1.0
+            ),
+        })
+
+    return results
+
+
+def format_linkage_report(results: List[Dict[str, Any]]) -> List[str]:
+    """Format compare_linkages results as an aligned table."""
+    lines = [
+        f"{'linkage':<16}{'clusters':>9}{'comparisons':>13}{'ms':>9}"
+        f"{'precision':>11}{'recall':>8}{'f1':>7}{'identical':>11}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r['linkage']:<16}{r['clusters']:>9}{r['comparisons']:>13}"
+            f"{r['seconds'] * 1000:>9.1f}{r['precision']:>11.3f}{r['recall']:>8.3f}"
+            f"{r['f1']:>7.3f}{r['identical_clusters']:>10.1%}"
+        )
+    return lines
+
+
 def refine_canonical_title(event: Event) -> str:
     """
     Select the best canonical title for an event.
@@ -140,7 +404,7 @@ def refine_canonical_title(event: Event) -> str:
         return min(wire_items, key=lambda x: len(x.title)).title
 
     # Fall back to shortest title overall
-    return min(event.items, key=lambda x: len(x.title)).title
+    return event.shortest_title
 
 
 def _is_wire_source(source_id: str) -> bool:
@@ -149,15 +413,21 @@ def _is_wire_source(source_id: str) -> bool:
     return any(source_id.startswith(prefix) for prefix in wire_prefixes)
 
 
-def categorize_events(events: List[Event]) -> tuple[List[Event], List[Event]]:
+def categorize_events(events: List[Event],
+                      financial_sources: Optional[Set[str]] = None
+                      ) -> Tuple[List[Event], List[Event]]:
     """
     Categorize events into general news and financial news.
 
+    Args:
+        events: Events to categorize
+        financial_sources: Financial source ids (loaded from config if None)
+
     Returns:
         Tuple of (general_events, financial_events)
     """
-    config = load_clustering_config()
-    financial_sources = config['financial_sources']
+    if financial_sources is None:
+        financial_sources = load_clustering_config()['financial_sources']
 
     general_events = []
     financial_events = []
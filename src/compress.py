@@ -0,0 +1,119 @@
+"""Pre-compressed output variants (gzip, brotli) for static hosting."""
+
+import gzip
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Pattern
+
+from .utils import load_yaml, get_config_path, write_if_changed
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_compression_config() -> Dict[str, Any]:
+    """Load output compression configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    compression = config.get('compression') or {}
+
+    return {
+        'enabled': compression.get('enabled', True),
+        'gzip_level': compression.get('gzip_level', 9),
+        'brotli_quality': compression.get('brotli_quality', 11),
+        'archive_format': compression.get('archive_format', 'gzip'),
+    }
+
+
+def gzip_bytes(data: bytes, level: int = 9) -> bytes:
+    """
+    Gzip-compress data deterministically.
+
+    The header timestamp is fixed so identical input always produces
+    identical output, which keeps unchanged variants from being rewritten.
+    """
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compressed_variants(data: bytes, config: Dict[str, Any]) -> Dict[str, bytes]:
+    """
+    Build compressed encodings of data.
+
+    Returns:
+        Map of file suffix ('.gz', '.br') -> compressed bytes
+    """
+    variants = {'.gz': gzip_bytes(data, config['gzip_level'])}
+
+    # Imported here so rendering loads brotli only when it writes variants
+    try:
+        import brotli
+    except ImportError:  # Optional dependency
+        return variants
+
+    variants['.br'] = brotli.compress(data, quality=config['brotli_quality'])
+    return variants
+
+
+def publish_output(path: Path, content: str,
+                   config: Optional[Dict[str, Any]] = None,
+                   ignore: Optional[Pattern[str]] = None) -> bool:
+    """
+    Write an output file plus its pre-compressed variants.
+
+    Variants are written as `<name>.gz` and `<name>.br` (brotli only if the
+    `brotli` package is installed), ready for static servers such as nginx
+    `gzip_static`/`brotli_static`. Nothing is rewritten if the content is
+    unchanged and every variant already exists.
+
+    Args:
+        path: Output file path
+        content: Text content to write
+        config: Compression configuration (loaded if None)
+        ignore: Volatile text (e.g. a generation timestamp) that alone
+            does not count as a change; see write_if_changed
+
+    Returns:
+        True if the output file was written, False if it was up to date
+    """
+    if config is None:
+        config = load_compression_config()
+
+    path = Path(path)
+    written = write_if_changed(path, content, ignore=ignore)
+
+    if not config['enabled']:
+        return written
+
+    # Variants encode the file as it stands (its old text if only ignored
+    # text changed); the encoders are deterministic, so unchanged variants
+    # are left alone
+    data = content.encode('utf-8') if written else path.read_bytes()
+    variants = compressed_variants(data, config)
+    for suffix, data in variants.items():
+        write_if_changed(path.with_name(path.name + suffix), data)
+
+    return written
+
+
+def archive_file(source_path: Path, archive_path: Path,
+                 config: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Copy a file into the archive, compressing it if configured.
+
+    With `archive_format: gzip` the archive copy is `<archive_path>.gz`
+    (readable with zcat/zgrep); with `plain` it is an exact copy.
+
+    Returns:
+        Path of the archived file
+    """
+    if config is None:
+        config = load_compression_config()
+
+    data = Path(source_path).read_bytes()
+
+    if config['enabled'] and config['archive_format'] == 'gzip':
+        archive_path = archive_path.with_name(archive_path.name + '.gz')
+        data = gzip_bytes(data, config['gzip_level'])
+
+    write_if_changed(archive_path, data)
+
+    return archive_path
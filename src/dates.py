@@ -0,0 +1,151 @@
+"""Per-source date format learning for feed entry timestamps.
+
+Feeds that omit machine-parsed dates still emit the same string format for
+every entry. DateFormatCache remembers, per source, the strptime pattern
+that last worked, so dateutil's slow generic parser is only needed the
+first time a source is seen (or when it emits something unusual). Learned
+formats persist between runs in a small JSON file.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from .utils import get_data_path
+
+
+logger = logging.getLogger(__name__)
+
+
+# Tried in order when a source has no learned format yet
+CANDIDATE_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %z',   # RFC 822: Mon, 15 Jan 2024 14:30:00 +0100
+    '%a, %d %b %Y %H:%M:%S GMT',  # RFC 822: Mon, 15 Jan 2024 14:30:00 GMT
+    '%a, %d %b %Y %H:%M:%S UTC',
+    '%a, %d %b %Y %H:%M %z',
+    '%a, %d %b %Y %H:%M GMT',
+    '%d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S%z',        # ISO 8601: 2024-01-15T14:30:00+01:00 / Z
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S',
+]
+# No '%Z' formats: strptime accepts any zone name but returns a naive
+# datetime, so e.g. EST times would be read as UTC. Only GMT/UTC are
+# matched literally; other zone names go to dateutil with the offsets below.
+
+# Zone names RFC 822 defines, in seconds east of UTC
+TZ_ABBREVIATIONS = {
+    'UT': 0, 'GMT': 0, 'UTC': 0, 'Z': 0,
+    'EST': -5 * 3600, 'EDT': -4 * 3600,
+    'CST': -6 * 3600, 'CDT': -5 * 3600,
+    'MST': -7 * 3600, 'MDT': -6 * 3600,
+    'PST': -8 * 3600, 'PDT': -7 * 3600,
+}
+
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (naive values are taken as UTC)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class DateFormatCache:
+    """Learns and reuses the date format each source emits."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize an empty cache backed by `path` (default: data/date_formats.json)."""
+        if path is None:
+            path = get_data_path('date_formats.json')
+
+        self.path = path
+        self.formats: Dict[str, str] = {}
+        self.stats: Dict[str, int] = {
+            'learned': 0,    # parsed with the source's learned format
+            'searched': 0,   # parsed after trying candidate formats
+            'slow_path': 0,  # needed dateutil
+            'failed': 0,     # unparseable
+        }
+
+    def load(self) -> None:
+        """Load learned formats from disk (missing or corrupt files are ignored)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                formats = dict(json.load(f))
+        except FileNotFoundError:
+            return
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable date format cache {self.path}: {e}")
+            return
+
+        # Formats learned by older versions may use '%Z', which drops the zone
+        self.formats = {source: fmt for source, fmt in formats.items() if '%Z' not in fmt}
+
+    def save(self) -> None:
+        """Persist learned formats to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.formats, f, indent=2, sort_keys=True)
+
+    def parse(self, source_id: str, value: str) -> Optional[datetime]:
+        """
+        Parse a date string emitted by a source.
+
+        Tries the source's learned format, then the candidate formats
+        (learning the first that works), then dateutil.
+
+        Returns:
+            Naive UTC datetime, or None if the value cannot be parsed
+        """
+        value = value.strip()
+
+        learned = self.formats.get(source_id)
+        if learned is not None:
+            try:
+                result = to_naive_utc(datetime.strptime(value, learned))
+                self.stats['learned'] += 1
+                return result
+            except ValueError:
+                pass
+
+        for fmt in CANDIDATE_FORMATS:
+            if fmt == learned:
+                continue
+            try:
+                result = to_naive_utc(datetime.strptime(value, fmt))
+            except ValueError:
+                continue
+            self.formats[source_id] = fmt
+            self.stats['searched'] += 1
+            return result
+
+        # Imported on first use so runs that never need it don't pay for it
+        from dateutil import parser as date_parser
+
+        try:
+            result = to_naive_utc(date_parser.parse(value, tzinfos=TZ_ABBREVIATIONS))
+            self.stats['slow_path'] += 1
+            return result
+        except (ValueError, OverflowError):
+            self.stats['failed'] += 1
+            return None
+
+    def reset_stats(self) -> None:
+        """Zero the counters (e.g. at the start of a run)."""
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def summary(self) -> str:
+        """One-line description of how dates were parsed."""
+        total = sum(self.stats.values())
+        slow = self.stats['slow_path']
+        share = f"{100.0 * slow / total:.1f}%" if total else "0.0%"
+        return (
+            f"{self.stats['learned']} learned-format, {self.stats['searched']} format-search, "
+            f"{slow} dateutil ({share}), {self.stats['failed']} unparseable"
+        )
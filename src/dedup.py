@@ -0,0 +1,162 @@
+"""Near-duplicate collapse using SimHash fingerprints.
+
+Feeds republish the same story with tiny edits: one wire story on several
+outlets, or updated versions of one article from the same source. Every
+item gets a 64-bit SimHash of its title and summary at ingest. Before
+clustering, items whose fingerprints differ in at most `max_distance`
+bits collapse into their newest copy, which keeps the others in
+`NewsItem.duplicates`, so clustering sees each story once.
+"""
+
+import hashlib
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Event, NewsItem
+from .utils import load_yaml, get_config_path, popcount, preprocess_title
+
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+
+
+def load_dedup_config() -> Dict[str, Any]:
+    """Load near-duplicate configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    dedup = config.get('near_duplicates') or {}
+
+    return {
+        'enabled': dedup.get('enabled', True),
+        'max_distance': dedup.get('max_distance', 3),
+        'across_sources': dedup.get('across_sources', False),
+    }
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of a text.
+
+    Features are the preprocessed words, weighted by count; similar texts
+    get fingerprints that differ in few bits. Word bigrams are left out:
+    on texts as short as a headline and summary they make every edited
+    word flip several features, which pushes small edits past the
+    default distance.
+
+    Returns:
+        Unsigned 64-bit fingerprint
+    """
+    features = Counter(preprocess_title(text).split())
+
+    weights = [0] * SIMHASH_BITS
+    for feature, count in features.items():
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def item_simhash(title: str, summary: Optional[str]) -> int:
+    """Fingerprint of an item's title and summary."""
+    return simhash(f"{title} {summary or ''}")
+
+
+def _band_keys(fingerprint: int, bands: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """(band number, band value) for each band of a fingerprint."""
+    return [
+        (number, (fingerprint >> start) & ((1 << (end - start)) - 1))
+        for number, (start, end) in enumerate(bands)
+    ]
+
+
+def collapse_near_duplicates(items: List[NewsItem],
+                             config: Optional[Dict[str, Any]] = None) -> List[NewsItem]:
+    """
+    Collapse near-identical items into one representative each.
+
+    The newest item of each group is kept and the others are moved into
+    its `duplicates`. Candidates are found by splitting fingerprints into
+    max_distance + 1 bands: two fingerprints within max_distance bits
+    must agree on at least one band.
+
+    Items collapsed by an earlier call are expanded first, so calling
+    this again (e.g. on a reloaded cluster) regroups from scratch.
+
+    Args:
+        items: Items to deduplicate
+        config: Near-duplicate configuration (loaded if None)
+
+    Returns:
+        Representative items, newest first
+    """
+    if config is None:
+        config = load_dedup_config()
+    if not config['enabled']:
+        return items
+
+    max_distance = config['max_distance']
+    across_sources = config['across_sources']
+
+    all_items = []
+    for item in items:
+        all_items.append(item)
+        all_items.extend(item.duplicates)
+        item.duplicates = []
+    all_items.sort(key=lambda x: (x.published_at, x.id or 0), reverse=True)
+
+    n_bands = max_distance + 1
+    edges = [round(i * SIMHASH_BITS / n_bands) for i in range(n_bands + 1)]
+    bands = list(zip(edges, edges[1:]))
+
+    index: Dict[Tuple, List[NewsItem]] = defaultdict(list)
+    representatives: List[NewsItem] = []
+
+    for item in all_items:
+        if item.simhash is None:
+            item.simhash = item_simhash(item.title, item.summary)
+
+        scope = None if across_sources else item.source_id
+        keys = [(scope,) + key for key in _band_keys(item.simhash, bands)]
+
+        match = None
+        for key in keys:
+            for candidate in index.get(key, ()):
+                if popcount(candidate.simhash ^ item.simhash) <= max_distance:
+                    match = candidate
+                    break
+            if match is not None:
+                break
+
+        if match is not None:
+            match.duplicates.append(item)
+        else:
+            representatives.append(item)
+            for key in keys:
+                index[key].append(item)
+
+    return representatives
+
+
+def collapse_event_duplicates(events: List[Event],
+                              config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Collapse near-duplicates within each event loaded from the database.
+
+    Stored events and clusters keep collapsed copies as plain members, so
+    reloaded events are collapsed again to match the original run.
+    """
+    if config is None:
+        config = load_dedup_config()
+
+    for event in events:
+        event.items = collapse_near_duplicates(event.items, config)
@@ -0,0 +1,174 @@
+"""Fast streaming RSS 2.0 / Atom parser.
+
+Extracts only the fields ingest needs (title, link, id, dates, summary)
+using incremental ElementTree parsing. Entries are plain dicts with the
+same keys feedparser uses, so `ingest._parse_entry` accepts either.
+Anything this parser cannot handle raises, and the caller falls back to
+feedparser.
+"""
+
+import io
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+
+
+class UnsupportedFeedError(ValueError):
+    """Raised when a document is well-formed XML but not RSS 2.0 or Atom."""
+
+
+def parse_rfc822_date(value: str) -> Optional[time.struct_time]:
+    """Parse an RSS pubDate into a UTC struct_time (None if unparseable)."""
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt is None:
+        return None
+    return _to_utc_struct(dt)
+
+
+def parse_iso8601_date(value: str) -> Optional[time.struct_time]:
+    """Parse an Atom/Dublin Core date into a UTC struct_time (None if unparseable)."""
+    value = value.strip()
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return _to_utc_struct(dt)
+
+
+def _to_utc_struct(dt: datetime) -> time.struct_time:
+    """Convert a datetime to a UTC struct_time (naive values are taken as UTC)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.replace(tzinfo=None).timetuple()
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    """Full text content of an element (empty if missing)."""
+    if element is None:
+        return ''
+    return ''.join(element.itertext()).strip()
+
+
+def _set_date(entry: Dict[str, Any], key: str, value: str, parser) -> None:
+    """Store a raw date string and its parsed form, feedparser-style."""
+    if not value or key in entry:
+        return
+    entry[key] = value
+    parsed = parser(value)
+    if parsed is not None:
+        entry[f'{key}_parsed'] = parsed
+
+
+def _rss_item(item: ET.Element) -> Dict[str, Any]:
+    """Convert an RSS 2.0 <item> element into an entry dict."""
+    entry: Dict[str, Any] = {}
+
+    title = _text(item.find('title'))
+    if title:
+        entry['title'] = title
+
+    link = _text(item.find('link'))
+    if link:
+        entry['link'] = link
+
+    guid = _text(item.find('guid'))
+    if guid:
+        entry['id'] = guid
+
+    summary = _text(item.find('description'))
+    if not summary:
+        summary = _text(item.find(f'{CONTENT_NS}encoded'))
+    if summary:
+        entry['summary'] = summary
+
+    _set_date(entry, 'published', _text(item.find('pubDate')), parse_rfc822_date)
+    _set_date(entry, 'updated', _text(item.find(f'{DC_NS}date')), parse_iso8601_date)
+
+    return entry
+
+
+def _atom_entry(item: ET.Element) -> Dict[str, Any]:
+    """Convert an Atom <entry> element into an entry dict."""
+    entry: Dict[str, Any] = {}
+
+    title = _text(item.find(f'{ATOM_NS}title'))
+    if title:
+        entry['title'] = title
+
+    # Prefer rel="alternate" (the default when rel is absent)
+    for link in item.findall(f'{ATOM_NS}link'):
+        if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+            entry['link'] = link.get('href').strip()
+            break
+
+    entry_id = _text(item.find(f'{ATOM_NS}id'))
+    if entry_id:
+        entry['id'] = entry_id
+
+    summary = _text(item.find(f'{ATOM_NS}summary'))
+    if not summary:
+        summary = _text(item.find(f'{ATOM_NS}content'))
+    if summary:
+        entry['summary'] = summary
+
+    _set_date(entry, 'published', _text(item.find(f'{ATOM_NS}published')), parse_iso8601_date)
+    _set_date(entry, 'updated', _text(item.find(f'{ATOM_NS}updated')), parse_iso8601_date)
+
+    return entry
+
+
+def iter_entries(body: bytes) -> Iterator[Dict[str, Any]]:
+    """
+    Stream entries from an RSS 2.0 or Atom document.
+
+    Each entry is yielded as soon as its closing tag is parsed and its
+    element is then dropped from the tree, so memory stays flat for large
+    feeds.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: document is not well-formed
+        UnsupportedFeedError: document is not RSS 2.0 or Atom
+    """
+    converter = None
+    stack = []
+
+    for event, element in ET.iterparse(io.BytesIO(body), events=('start', 'end')):
+        if event == 'start':
+            if converter is None:
+                if element.tag == 'rss':
+                    converter = ('item', _rss_item)
+                elif element.tag == f'{ATOM_NS}feed':
+                    converter = (f'{ATOM_NS}entry', _atom_entry)
+                else:
+                    raise UnsupportedFeedError(f"Unsupported feed root element: {element.tag}")
+            stack.append(element)
+            continue
+
+        stack.pop()
+        if element.tag == converter[0]:
+            yield converter[1](element)
+            # Drop the parsed entry from the tree
+            if stack:
+                stack[-1].remove(element)
+
+
+def parse_entries(body: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse all entries from an RSS 2.0 or Atom document.
+
+    Parsing is all-or-nothing: if the document turns out to be malformed
+    part-way through, the error is raised and no entries are returned.
+    """
+    return list(iter_entries(body))
@@ -0,0 +1,165 @@
+"""Feed health tracking with a per-source circuit breaker.
+
+A source that fails `failure_threshold` times in a row has its circuit
+opened: it is skipped until `next_probe_at`, then fetched once as a probe.
+A successful probe closes the circuit; a failed one doubles the wait
+(up to `max_backoff_hours`).
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import FeedHealth, Source
+from .store import NewsDatabase
+from .utils import load_yaml, get_config_path
+
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency average
+LATENCY_SMOOTHING = 0.3
+
+
+def load_health_config() -> Dict[str, Any]:
+    """Load feed health configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    health = config.get('feed_health') or {}
+
+    return {
+        'failure_threshold': health.get('failure_threshold', 3),
+        'base_backoff_minutes': health.get('base_backoff_minutes', 60),
+        'max_backoff_hours': health.get('max_backoff_hours', 48),
+    }
+
+
+class HealthRecorder:
+    """Collects fetch outcomes during a run."""
+
+    def __init__(self):
+        """Start with no recorded outcomes."""
+        self.outcomes: Dict[str, Tuple[bool, float, Optional[str]]] = {}
+
+    def record_success(self, source: Source, latency_ms: float) -> None:
+        """Record a successful fetch and parse."""
+        self.outcomes[source.id] = (True, latency_ms, None)
+
+    def record_failure(self, source: Source, error: Exception, latency_ms: float) -> None:
+        """Record a failed fetch or parse."""
+        self.outcomes[source.id] = (False, latency_ms, f'{type(error).__name__}: {error}')
+
+
+def backoff(consecutive_failures: int, config: Dict[str, Any]) -> timedelta:
+    """
+    Wait before probing a source again.
+
+    Doubles with each failure beyond the threshold, capped at
+    `max_backoff_hours`.
+    """
+    exponent = max(consecutive_failures - config['failure_threshold'], 0)
+    minutes = config['base_backoff_minutes'] * (2 ** min(exponent, 16))
+    return min(timedelta(minutes=minutes), timedelta(hours=config['max_backoff_hours']))
+
+
+def is_circuit_open(health: Optional[FeedHealth], now: datetime) -> bool:
+    """True if the source should be skipped this run."""
+    return (
+        health is not None
+        and health.next_probe_at is not None
+        and health.next_probe_at > now
+    )
+
+
+def filter_healthy_sources(sources: List[Source], health: Dict[str, FeedHealth],
+                           now: datetime) -> Tuple[List[Source], List[Source]]:
+    """
+    Split sources into those to fetch and those with an open circuit.
+
+    Returns:
+        Tuple of (sources_to_fetch, skipped_sources)
+    """
+    fetch, skipped = [], []
+    for source in sources:
+        if is_circuit_open(health.get(source.id), now):
+            skipped.append(source)
+        else:
+            fetch.append(source)
+    return fetch, skipped
+
+
+def apply_outcomes(db: NewsDatabase, recorder: HealthRecorder,
+                   now: Optional[datetime] = None,
+                   config: Optional[Dict[str, Any]] = None) -> Dict[str, FeedHealth]:
+    """
+    Update and persist source health from this run's fetch outcomes.
+
+    Args:
+        db: Connected database
+        recorder: Outcomes collected while fetching
+        now: Time of this run (default: current UTC time)
+        config: Feed health configuration (loaded if None)
+
+    Returns:
+        Map of source_id -> FeedHealth for every known source
+    """
+    if config is None:
+        config = load_health_config()
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    all_health = db.get_feed_health()
+
+    for source_id, (ok, latency_ms, error) in recorder.outcomes.items():
+        health = all_health.get(source_id) or FeedHealth(source_id=source_id)
+
+        if health.avg_latency_ms is None:
+            health.avg_latency_ms = latency_ms
+        else:
+            health.avg_latency_ms += LATENCY_SMOOTHING * (latency_ms - health.avg_latency_ms)
+
+        if ok:
+            if health.next_probe_at is not None:
+                logger.info(f"  {source_id}: recovered after {health.consecutive_failures} failures")
+            health.consecutive_failures = 0
+            health.last_success_at = now
+            health.next_probe_at = None
+        else:
+            health.consecutive_failures += 1
+            health.last_failure_at = now
+            health.last_error = error
+            if health.consecutive_failures >= config['failure_threshold']:
+                health.next_probe_at = now + backoff(health.consecutive_failures, config)
+
+        db.upsert_feed_health(health)
+        all_health[source_id] = health
+
+    return all_health
+
+
+def format_health_report(health: Dict[str, FeedHealth], now: datetime) -> List[str]:
+    """
+    Describe every source that is failing or has its circuit open.
+
+    Returns:
+        Report lines (empty when every feed is healthy)
+    """
+    lines = []
+
+    for source_id in sorted(health):
+        h = health[source_id]
+        if h.consecutive_failures == 0:
+            continue
+
+        if is_circuit_open(h, now):
+            state = f"circuit open, next probe {h.next_probe_at:%Y-%m-%d %H:%M}"
+        else:
+            state = "failing"
+
+        last_ok = f"{h.last_success_at:%Y-%m-%d %H:%M}" if h.last_success_at else "never"
+        latency = f"{h.avg_latency_ms:.0f} ms" if h.avg_latency_ms is not None else "n/a"
+        lines.append(
+            f"{source_id}: {state}; {h.consecutive_failures} consecutive failures, "
+            f"last success {last_ok}, avg latency {latency}, last error: {h.last_error}"
+        )
+
+    return lines
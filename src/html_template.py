@@ -0,0 +1,151 @@
+"""Compiled HTML templates and the content-hashed stylesheet asset."""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Tuple
+
+
+ASSETS_DIR = Path(__file__).parent / 'assets'
+
+
+def minify_css(css: str) -> str:
+    """
+    Minify a stylesheet by stripping comments and redundant whitespace.
+
+    Conservative on purpose: only whitespace next to structural punctuation
+    is removed, so values like `0 1px 3px` are left intact.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,])\s*', r'\1', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet() -> Tuple[str, str]:
+    """
+    Load and minify the brief stylesheet (once per process).
+
+    Returns:
+        Tuple of (content-hashed filename, minified CSS)
+    """
+    css = minify_css((ASSETS_DIR / 'brief.css').read_text(encoding='utf-8'))
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    return f'brief.{digest}.css', css
+
+
+SOURCE_LINK_TEMPLATE = Template('''
+            <a href="$link" target="_blank" class="source-link" rel="noopener noreferrer">
+                <span class="source-badge $badge_class">$source_name</span>
+            </a>
+        ''')
+
+
+EVENT_TEMPLATE = Template('''
+    <div class="event-card">
+        <div class="event-header">
+            <span class="event-number">#$index</span>
+            <span class="event-score" title="Importance score based on sources, credibility, and recency">
+                Score: $score
+            </span>
+        </div>
+        <h2 class="event-title">$title</h2>
+        <div class="event-meta">
+            <span class="source-count">$source_count_label</span>
+            <span class="article-count">$item_count_label</span>
+        </div>
+        <div class="event-sources">
+            $sources
+        </div>
+    </div>
+    ''')
+
+
+PAGE_TEMPLATE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Morning Brief — $today</title>
+    <link rel="stylesheet" href="$stylesheet">
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>📰 Morning Brief</h1>
+            <div>$today</div>
+            <div class="header-meta">
+                <div class="header-meta-item">
+                    <span>🕐</span>
+                    <span>Generated at $time_generated</span>
+                </div>
+                <div class="header-meta-item">
+                    <span>📊</span>
+                    <span>$event_count_label</span>
+                </div>
+            </div>
+        </div>
+
+        <div class="legend">
+            <div class="legend-title">Source Credibility</div>
+            <div class="legend-items">
+                <div class="legend-item">
+                    <div class="legend-badge" style="background: linear-gradient(135deg, #27ae60 0%, #229954 100%);"></div>
+                    <span>Wire Services (Reuters, AP) — Highest credibility</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-badge" style="background: linear-gradient(135deg, #3498db 0%, #2980b9 100%);"></div>
+                    <span>News Organizations (BBC, NPR, NYT, Guardian)</span>
+                </div>
+                <div class="legend-item">
+                    <div class="legend-badge" style="background: linear-gradient(135deg, #9b59b6 0%, #8e44ad 100%);"></div>
+                    <span>Magazines (The Economist)</span>
+                </div>
+            </div>
+        </div>
+
+        <!-- General World News Section -->
+        <div class="section-header">
+            <h2 class="section-title">🌍 General World News</h2>
+            <span class="section-count">$general_count events</span>
+        </div>
+        <div class="events-container">
+            $general_content
+        </div>
+
+        <!-- Financial & Economics Section -->
+        <div class="section-header">
+            <h2 class="section-title">💼 Finance & Economics</h2>
+            <span class="section-count">$financial_count events</span>
+        </div>
+        <div class="events-container">
+            $financial_content
+        </div>
+
+        <div class="footer">
+            <div class="footer-stats">
+                <div class="stat">
+                    <span class="stat-value">$event_count</span>
+                    <span class="stat-label">Events</span>
+                </div>
+                <div class="stat">
+                    <span class="stat-value">$total_items</span>
+                    <span class="stat-label">Articles</span>
+                </div>
+                <div class="stat">
+                    <span class="stat-value">$total_sources</span>
+                    <span class="stat-label">Source Mentions</span>
+                </div>
+            </div>
+            <div class="footer-note">
+                All events verified by multiple independent sources • Click any source to read the full article
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+''')
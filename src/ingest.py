@@ -1,82 +1,179 @@
 """RSS feed ingestion module."""
 
+import gzip
 import logging
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-from typing import Any, List
-
-import feedparser
-from dateutil import parser as date_parser
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlparse
 
+from . import __version__
+from .dates import DateFormatCache
+from .feed_parser import parse_entries
 from .models import Source, NewsItem
-from .utils import make_guid_hash, load_yaml, get_config_path
+from .health import HealthRecorder
+from .snapshot import SnapshotReader, SnapshotWriter
+from .sources import load_sources
+from .store import NewsDatabase
+from .utils import make_guid_hash, make_url_hash
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a feed server before giving up
+FETCH_TIMEOUT = 20
+
+USER_AGENT = f'DailyBriefer/{__version__}'
+
+# Date formats learned per source, shared across feeds and persisted per run
+date_formats = DateFormatCache()
 
-def load_sources() -> List[Source]:
-    """Load source configurations from feeds.yaml."""
-    config = load_yaml(str(get_config_path('feeds.yaml')))
 
-    sources = []
-    for feed_config in config.get('feeds', []):
-        sources.append(Source(
-            id=feed_config['id'],
-            name=feed_config['name'],
-            rss_url=feed_config['rss_url'],
-            tier=feed_config['tier'],
-            region=feed_config['region']
-        ))
+def download_feed(url: str) -> bytes:
+    """
+    Download a raw feed document.
 
-    return sources
+    Local file paths are read directly, which is handy for fixtures.
 
+    Args:
+        url: Feed URL or local file path
 
-def fetch_feed(source: Source) -> List[NewsItem]:
+    Returns:
+        Response body (decompressed if the server gzipped it)
     """
-    Fetch and parse RSS feed for a single source.
+    if not urlparse(url).scheme:
+        return Path(url).read_bytes()
+
+    request = urllib.request.Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': 'gzip',
+    })
+
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        body = response.read()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+    return body
+
+
+def parse_feed_body(body: bytes, source_name: str = '') -> List[Any]:
+    """
+    Parse feed entries, using the fast streaming parser when possible.
+
+    Well-formed RSS 2.0 and Atom documents go through feed_parser; anything
+    else (malformed XML, RSS 1.0/RDF, unknown encodings) falls back to
+    feedparser, which is slower but far more forgiving.
 
     Args:
-        source: Source to fetch from
+        body: Raw feed document
+        source_name: Source name for log messages
+
+    Returns:
+        List of entries (dicts or feedparser entries)
+    """
+    try:
+        return parse_entries(body)
+    except (ET.ParseError, ValueError) as e:
+        logger.info(f"Fast parser declined {source_name} ({e}), falling back to feedparser")
+
+    # Imported on first use: most feeds never need it and it is slow to load
+    import feedparser
+
+    feed = feedparser.parse(body)
+
+    if feed.bozo:
+        # Feed has parsing errors
+        logger.warning(f"Feed parsing issues for {source_name}: {feed.bozo_exception}")
+
+    return feed.entries
+
+
+def parse_feed(source: Source, body: bytes, fetched_at: datetime) -> List[NewsItem]:
+    """
+    Parse a downloaded feed document into NewsItems.
+
+    Args:
+        source: Source the feed belongs to
+        body: Raw feed document
+        fetched_at: Timestamp when the feed was fetched
 
     Returns:
         List of NewsItem objects
     """
-    logger.info(f"Fetching feed: {source.name} ({source.rss_url})")
+    entries = parse_feed_body(body, source.name)
 
-    try:
-        feed = feedparser.parse(source.rss_url)
+    items = []
+    for entry in entries:
+        try:
+            item = _parse_entry(entry, source, fetched_at)
+            if item:
+                items.append(item)
+        except Exception as e:
+            logger.error(f"Error parsing entry from {source.name}: {e}")
+            continue
 
-        if feed.bozo:
-            # Feed has parsing errors
-            logger.warning(f"Feed parsing issues for {source.name}: {feed.bozo_exception}")
+    return items
 
-        items = []
-        # Use replace to make timezone-naive for database storage
-        fetched_at = datetime.now(timezone.utc).replace(tzinfo=None)
 
-        for entry in feed.entries:
-            try:
-                item = _parse_entry(entry, source, fetched_at)
-                if item:
-                    items.append(item)
-            except Exception as e:
-                logger.error(f"Error parsing entry from {source.name}: {e}")
-                continue
+def fetch_feed(source: Source, snapshots: Optional[SnapshotWriter] = None,
+               health: Optional[HealthRecorder] = None) -> List[NewsItem]:
+    """
+    Fetch and parse RSS feed for a single source.
 
-        logger.info(f"Fetched {len(items)} items from {source.name}")
-        return items
+    Args:
+        source: Source to fetch from
+        snapshots: Records the raw body and fetch metadata if given
+        health: Records whether the fetch succeeded and how long it took
+
+    Returns:
+        List of NewsItem objects
+    """
+    logger.info(f"Fetching feed: {source.name} ({source.rss_url})")
+
+    # Use replace to make timezone-naive for database storage
+    fetched_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = time.perf_counter()
 
+    try:
+        body = download_feed(source.rss_url)
     except Exception as e:
+        elapsed_ms = (time.perf_counter() - start) * 1000
         logger.error(f"Failed to fetch feed {source.name}: {e}")
+        if snapshots is not None:
+            snapshots.record_error(source, e, fetched_at, elapsed_ms)
+        if health is not None:
+            health.record_failure(source, e, elapsed_ms)
+        return []
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if snapshots is not None:
+        snapshots.record(source, body, fetched_at, elapsed_ms)
+
+    try:
+        items = parse_feed(source, body, fetched_at)
+    except Exception as e:
+        logger.error(f"Failed to parse feed {source.name}: {e}")
+        if health is not None:
+            health.record_failure(source, e, elapsed_ms)
         return []
 
+    if health is not None:
+        health.record_success(source, elapsed_ms)
+
+    logger.info(f"Fetched {len(items)} items from {source.name}")
+    return items
+
 
 def _parse_entry(entry: Any, source: Source, fetched_at: datetime) -> NewsItem:
     """
     Parse a single feed entry into a NewsItem.
 
     Args:
-        entry: feedparser entry object
+        entry: Feed entry (feed_parser dict or feedparser entry)
         source: Source this entry came from
         fetched_at: Timestamp when feed was fetched
 
@@ -96,7 +193,7 @@ def _parse_entry(entry: Any, source: Source, fetched_at: datetime) -> NewsItem:
         return None
 
     # Extract published date
-    published_at = _parse_published_date(entry, fetched_at)
+    published_at = _parse_published_date(entry, fetched_at, source.id)
 
     # Extract summary/description
     summary = entry.get('summary', entry.get('description', '')).strip()
@@ -114,20 +211,26 @@ def _parse_entry(entry: Any, source: Source, fetched_at: datetime) -> NewsItem:
         published_at=published_at,
         summary=summary if summary else None,
         fetched_at=fetched_at,
-        guid_hash=guid_hash
+        guid_hash=guid_hash,
+        canonical_url_hash=make_url_hash(link)
     )
 
 
-def _parse_published_date(entry: Any, fallback: datetime) -> datetime:
+def _parse_published_date(entry: Any, fallback: datetime, source_id: str = '') -> datetime:
     """
     Extract and parse published date from feed entry.
 
+    Machine-parsed dates are used when present; otherwise date strings go
+    through the per-source format cache, which only falls back to dateutil
+    when no known format matches.
+
     Args:
-        entry: feedparser entry object
+        entry: Feed entry (feed_parser dict or feedparser entry)
         fallback: Fallback datetime if parsing fails
+        source_id: Source the entry came from (keys the format cache)
 
     Returns:
-        datetime object
+        datetime object (naive UTC)
     """
     # Try multiple date fields in order of preference
     date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
@@ -145,31 +248,122 @@ def _parse_published_date(entry: Any, fallback: datetime) -> datetime:
     string_fields = ['published', 'updated', 'created']
     for field in string_fields:
         if field in entry and entry[field]:
-            try:
-                return date_parser.parse(entry[field])
-            except Exception:
-                pass
+            parsed = date_formats.parse(source_id, entry[field])
+            if parsed is not None:
+                return parsed
 
     # Fall back to fetched time
     logger.warning(f"Could not parse date for entry, using fallback: {entry.get('title', '')}")
     return fallback
 
 
-def fetch_all_feeds() -> List[NewsItem]:
+def fetch_all_feeds(snapshots: Optional[SnapshotWriter] = None,
+                    sources: Optional[List[Source]] = None,
+                    health: Optional[HealthRecorder] = None) -> List[NewsItem]:
     """
     Fetch items from all configured feeds.
 
+    Args:
+        snapshots: Records every raw feed body if given
+        sources: Sources to fetch (default: all configured sources)
+        health: Records every fetch outcome if given
+
     Returns:
         List of all NewsItem objects from all sources
     """
-    sources = load_sources()
+    if sources is None:
+        sources = load_sources()
     all_items = []
 
+    date_formats.load()
+    date_formats.reset_stats()
+
     logger.info(f"Fetching {len(sources)} feeds...")
 
     for source in sources:
-        items = fetch_feed(source)
+        items = fetch_feed(source, snapshots, health)
         all_items.extend(items)
 
     logger.info(f"Total items fetched: {len(all_items)}")
+    logger.info(f"Date strings parsed: {date_formats.summary()}")
+
+    try:
+        date_formats.save()
+    except OSError as e:
+        logger.warning(f"Could not save date format cache: {e}")
+
     return all_items
+
+
+def replay_feeds(snapshot: SnapshotReader) -> List[NewsItem]:
+    """
+    Parse items from a recorded snapshot instead of the network.
+
+    Each feed keeps the fetch time it was recorded with, so replays are
+    deterministic.
+
+    Args:
+        snapshot: Recorded run to replay
+
+    Returns:
+        List of all NewsItem objects from all recorded feeds
+    """
+    all_items = []
+
+    date_formats.reset_stats()
+
+    logger.info(f"Replaying {len(snapshot.feeds)} feeds from {snapshot.run_dir}")
+
+    for source, feed in zip(snapshot.sources(), snapshot.feeds):
+        body = snapshot.body(feed)
+        if body is None:
+            logger.info(f"Skipping {source.name}: recorded fetch failed ({feed.get('error')})")
+            continue
+
+        fetched_at = datetime.fromisoformat(feed['fetched_at'])
+        items = parse_feed(source, body, fetched_at)
+        logger.info(f"Replayed {len(items)} items from {source.name}")
+        all_items.extend(items)
+
+    logger.info(f"Total items replayed: {len(all_items)}")
+    logger.info(f"Date strings parsed: {date_formats.summary()}")
+
+    return all_items
+
+
+def filter_new_items(db: NewsDatabase, items: List[NewsItem]) -> Tuple[List[NewsItem], int, int]:
+    """
+    Drop fetched items that are already stored or repeated in this batch.
+
+    An item is a duplicate if its GUID or its canonical URL was seen
+    before, so one article reached through several section feeds,
+    tracking links or AMP pages is stored once. Stored keys are looked up
+    in bulk before inserting anything.
+
+    Args:
+        db: Connected database
+        items: Freshly fetched items
+
+    Returns:
+        Tuple of (new_items, guid_duplicates, url_duplicates)
+    """
+    for item in items:
+        if item.canonical_url_hash is None:
+            item.canonical_url_hash = make_url_hash(item.link)
+
+    seen_guids = db.existing_guid_hashes(item.guid_hash for item in items)
+    seen_urls = db.existing_url_hashes(item.canonical_url_hash for item in items)
+
+    new_items = []
+    guid_duplicates = url_duplicates = 0
+    for item in items:
+        if item.guid_hash in seen_guids:
+            guid_duplicates += 1
+        elif item.canonical_url_hash in seen_urls:
+            url_duplicates += 1
+        else:
+            new_items.append(item)
+        seen_guids.add(item.guid_hash)
+        seen_urls.add(item.canonical_url_hash)
+
+    return new_items, guid_duplicates, url_duplicates
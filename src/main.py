@@ -1,16 +1,18 @@
-"""Main CLI entrypoint for Daily Briefer."""
+"""Main CLI entrypoint for Daily Briefer.
 
+Startup cost matters for frequent cron runs, so this module imports only
+the standard library at load time. Each command imports the pipeline
+modules it needs when it runs: `render` never loads feedparser or the
+network stack, and `stats` never loads PyYAML.
+"""
+
+import argparse
 import logging
 import sys
+import time
 from datetime import datetime
-
-from .ingest import fetch_all_feeds, load_sources
-from .store import NewsDatabase
-from .cluster import cluster_items, refine_canonical_title
-from .rank import select_top_events
-from .render import render_brief, archive_brief
-from .render_html import render_html_brief
-from .utils import load_yaml, get_config_path
+from pathlib import Path
+from typing import List, Optional
 
 
 # Configure logging
@@ -25,106 +27,283 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main pipeline execution."""
-    logger.info("=" * 60)
-    logger.info("Daily Briefer - Starting")
-    logger.info("=" * 60)
+def run_full(args: argparse.Namespace) -> int:
+    """Run the whole pipeline (the default when no command is given)."""
+    from .pipeline import run_pipeline
+
+    return run_pipeline(replay_dir=args.replay, fetch_all=args.all_feeds,
+                        profile_memory=args.profile_memory)
+
+
+def run_fetch(args: argparse.Namespace) -> int:
+    """Fetch feeds and store new items."""
+    from .pipeline import ingest
+    from .store import NewsDatabase
+
+    db = NewsDatabase()
+    db.connect()
 
     try:
-        # Load configuration
+        ingest(db, fetch_all=args.all_feeds)
+    finally:
+        db.close()
+
+    return 0
+
+
+def run_cluster(args: argparse.Namespace) -> int:
+    """Cluster and rank stored items, storing the top events."""
+    from .pipeline import cluster_and_rank
+    from .store import NewsDatabase
+    from .utils import load_yaml, get_config_path
+
+    lookback_hours = args.hours
+    if lookback_hours is None:
         settings = load_yaml(str(get_config_path('settings.yaml')))
         lookback_hours = settings.get('lookback_hours', 24)
 
-        # Initialize database
-        db = NewsDatabase()
-        db.connect()
-
-        # Step 1: Upsert sources
-        logger.info("Step 1: Loading source configurations")
-        sources = load_sources()
-        for source in sources:
-            db.upsert_source(source)
-        logger.info(f"  Loaded {len(sources)} sources")
-
-        # Step 2: Ingest RSS feeds
-        logger.info("Step 2: Fetching RSS feeds")
-        new_items = fetch_all_feeds()
-
-        # Step 3: Store items (with deduplication)
-        logger.info("Step 3: Storing items in database")
-        stored_count = 0
-        duplicate_count = 0
-
-        for item in new_items:
-            item_id = db.insert_item(item)
-            if item_id is not None:
-                stored_count += 1
-            else:
-                duplicate_count += 1
-
-        logger.info(f"  Stored {stored_count} new items, skipped {duplicate_count} duplicates")
-
-        # Step 4: Retrieve recent items for clustering
-        logger.info(f"Step 4: Retrieving items from last {lookback_hours} hours")
-        recent_items = db.get_recent_items(hours=lookback_hours)
-        logger.info(f"  Found {len(recent_items)} recent items")
-
-        if not recent_items:
-            logger.warning("No recent items to cluster. Exiting.")
-            render_brief([])  # Generate empty brief
-            db.close()
-            return 0
-
-        # Step 5: Cluster items into events
-        logger.info("Step 5: Clustering items into events")
-        events = cluster_items(recent_items)
-
-        # Refine canonical titles
-        for event in events:
-            event.canonical_title = refine_canonical_title(event)
-
-        # Step 6: Rank and select top events
-        logger.info("Step 6: Ranking events")
-        top_events = select_top_events(events)
-
-        # Step 7: Store events in database
-        logger.info("Step 7: Storing events in database")
-        for event in top_events:
-            item_ids = [item.id for item in event.items]
-            event_id = db.create_event(
-                item_ids=item_ids,
-                score=event.score,
-                canonical_title=event.canonical_title
-            )
-            event.id = event_id
-
-        # Step 8: Render briefs (Markdown and HTML)
-        logger.info("Step 8: Rendering morning brief")
-        render_brief(top_events)
-        render_html_brief(top_events)
-
-        # Step 9: Archive (optional)
-        logger.info("Step 9: Archiving brief")
-        archive_brief()
-
-        # Clean up old events (keep 7 days)
-        logger.info("Step 10: Cleaning up old events")
-        db.clear_old_events(keep_days=7)
-
-        # Close database
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        if args.linkage_report:
+            from .cluster import compare_linkages, format_linkage_report
+            from .dedup import collapse_near_duplicates
+
+            items = collapse_near_duplicates(db.get_recent_items(hours=lookback_hours))
+            print(f"{len(items)} items from the last {lookback_hours} hours\n")
+            for line in format_linkage_report(compare_linkages(items)):
+                print(line)
+        else:
+            cluster_and_rank(db, lookback_hours)
+    finally:
+        db.close()
+
+    return 0
+
+
+def run_rerank(args: argparse.Namespace) -> int:
+    """Rank the stored clusters again and render the brief."""
+    from .pipeline import rerank
+    from .render import render_all
+    from .store import NewsDatabase
+    from .utils import get_project_root
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        top_events = rerank(db, max_count=args.max_events)
+        delta = db.get_brief_delta()
+    finally:
         db.close()
 
-        logger.info("=" * 60)
-        logger.info("Daily Briefer - Completed Successfully")
-        logger.info("=" * 60)
+    if top_events is None:
+        return 1
+
+    render_all(top_events, get_project_root() / 'output', delta=delta)
+    return 0
+
+
+def run_render(args: argparse.Namespace) -> int:
+    """Render the brief from the events of the last ranking run."""
+    from .dedup import collapse_event_duplicates
+    from .render import render_all
+    from .store import NewsDatabase
+    from .utils import get_project_root
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        events = db.get_latest_events()
+        delta = db.get_brief_delta()
+    finally:
+        db.close()
 
-        return 0
+    collapse_event_duplicates(events)
 
-    except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+    render_all(events, get_project_root() / 'output', delta=delta)
+    logger.info(f"Rendered {len(events)} stored events")
+    return 0
+
+
+def run_profiles(args: argparse.Namespace) -> int:
+    """Rank and render profile briefs from the stored clusters."""
+    from .dedup import collapse_event_duplicates
+    from .profiles import render_profiles
+    from .store import NewsDatabase
+    from .utils import get_project_root
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        events = db.get_clusters()
+    finally:
+        db.close()
+
+    if not events:
+        logger.warning("No stored clusters to rank; run the cluster step first.")
         return 1
 
+    collapse_event_duplicates(events)
+
+    render_profiles(events, get_project_root() / 'output', names=args.names or None)
+    return 0
+
+
+def run_archive(args: argparse.Namespace) -> int:
+    """Archive the current brief and delete old events."""
+    from .pipeline import archive_and_cleanup
+    from .store import NewsDatabase
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        archive_and_cleanup(db, keep_days=args.keep_days)
+    finally:
+        db.close()
+
+    return 0
+
+
+def run_stats(args: argparse.Namespace) -> int:
+    """Print a summary of the database contents."""
+    from .store import NewsDatabase
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        stats = db.get_stats()
+    finally:
+        db.close()
+
+    print(f"Database:      {db.db_path}")
+    print(f"Sources:       {stats['sources']}")
+    print(f"Items:         {stats['items']}")
+    print(f"Events:        {stats['events']}")
+    print(f"Failing feeds: {stats['failing_feeds']}")
+    if stats['items']:
+        print(f"Items span:    {stats['oldest_item']} .. {stats['newest_item']}")
+    return 0
+
+
+def run_search(args: argparse.Namespace) -> int:
+    """Search stored headlines and summaries and print ranked results."""
+    from .store import NewsDatabase
+
+    db = NewsDatabase()
+    db.connect()
+
+    try:
+        start = time.perf_counter()
+        results = db.search_items(
+            ' '.join(args.query),
+            limit=args.limit,
+            hours=args.hours,
+            since=args.since,
+            until=args.until,
+            source_id=args.source
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+
+    for i, result in enumerate(results, 1):
+        item = result.item
+        print(f"{i:>3}. [{item.published_at:%Y-%m-%d %H:%M}] {item.source_id}: {item.title}")
+        print(f"     {item.link}")
+        if result.snippet and result.snippet != item.title:
+            print(f"     {result.snippet}")
+
+    print(f"\n{len(results)} result{'s' if len(results) != 1 else ''} in {elapsed_ms:.1f} ms")
+    return 0
+
+
+def iso_date(value: str) -> datetime:
+    """Parse an ISO date argument, reporting bad values as usage errors."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO date: {value!r}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main',
+        description='Daily Briefer - objective morning news brief generator. '
+                    'Runs the whole pipeline unless a command is given.'
+    )
+    parser.add_argument('--all-feeds', action='store_true',
+                        help='Poll every source now, ignoring the adaptive schedule')
+    parser.add_argument('--replay', type=Path, metavar='SNAPSHOT_DIR',
+                        help='Run the pipeline from a recorded feed snapshot (no network)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Report memory usage per stage (output/memory_profile.json)')
+    parser.set_defaults(handler=run_full)
+    subparsers = parser.add_subparsers(dest='command')
+
+    fetch = subparsers.add_parser('fetch', help='Fetch feeds and store new items')
+    fetch.add_argument('--all-feeds', action='store_true', default=argparse.SUPPRESS,
+                       help='Poll every source now, ignoring the adaptive schedule')
+    fetch.set_defaults(handler=run_fetch)
+
+    cluster = subparsers.add_parser('cluster', help='Cluster and rank stored items into events')
+    cluster.add_argument('--hours', type=int,
+                         help='Cluster items from the last N hours (default: lookback_hours)')
+    cluster.add_argument('--linkage-report', action='store_true',
+                         help='Compare cluster linkage modes against single-link and exit')
+    cluster.set_defaults(handler=run_cluster)
+
+    rerank = subparsers.add_parser('rerank',
+                                   help='Rank the stored clusters again and render the brief')
+    rerank.add_argument('--max-events', type=int,
+                        help='Events in the brief (default: max_events_in_brief)')
+    rerank.set_defaults(handler=run_rerank)
+
+    render = subparsers.add_parser('render',
+                                   help='Render the brief from the last stored events')
+    render.set_defaults(handler=run_render)
+
+    profiles = subparsers.add_parser('profiles',
+                                     help='Render profile briefs from the stored clusters')
+    profiles.add_argument('names', nargs='*', metavar='NAME',
+                          help='Profiles to render (default: all in settings.yaml)')
+    profiles.set_defaults(handler=run_profiles)
+
+    archive = subparsers.add_parser('archive', help='Archive the brief and delete old events')
+    archive.add_argument('--keep-days', type=int, default=7,
+                         help='Days of events to keep (default: 7)')
+    archive.set_defaults(handler=run_archive)
+
+    stats = subparsers.add_parser('stats', help='Summarize the database contents')
+    stats.set_defaults(handler=run_stats)
+
+    search = subparsers.add_parser('search', help='Full-text search over stored items')
+    search.add_argument('query', nargs='+', help='Search terms (all must match; term* for prefix)')
+    search.add_argument('--limit', type=int, default=20, help='Maximum results (default: 20)')
+    # --hours is itself a start time, so it can't be combined with --since
+    start = search.add_mutually_exclusive_group()
+    start.add_argument('--hours', type=int, help='Only items from the last N hours')
+    start.add_argument('--since', type=iso_date,
+                       help='Only items published at or after this ISO date')
+    search.add_argument('--until', type=iso_date,
+                        help='Only items published before this ISO date')
+    search.add_argument('--source', help='Only items from this source id')
+    search.set_defaults(handler=run_search)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entrypoint: run the pipeline, or a single command if given."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
 
 if __name__ == '__main__':
     sys.exit(main())
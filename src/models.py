@@ -1,8 +1,8 @@
 """Data models for the news brief system."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 
 
 @dataclass
@@ -25,7 +25,11 @@ class NewsItem:
     published_at: datetime
     summary: Optional[str]
     fetched_at: datetime
-    guid_hash: str
+    guid_hash: int  # 64-bit key of the entry id (or link)
+    canonical_url_hash: Optional[int] = None  # 64-bit key of the normalized link
+    simhash: Optional[int] = None  # 64-bit fingerprint of title + summary
+    # Near-identical copies collapsed into this item (see dedup)
+    duplicates: List['NewsItem'] = field(default_factory=list, repr=False, compare=False)
 
     def __post_init__(self):
         """Ensure datetime objects are properly typed."""
@@ -36,10 +40,21 @@ class NewsItem:
             from dateutil import parser
             self.fetched_at = parser.parse(self.fetched_at)
 
+    @property
+    def duplicate_count(self) -> int:
+        """Number of near-identical copies collapsed into this item."""
+        return len(self.duplicates)
+
 
 @dataclass
 class Event:
-    """Represents a clustered news event (multiple articles about same story)."""
+    """Represents a clustered news event (multiple articles about same story).
+
+    Aggregates over items (distinct sources, most recent time, shortest
+    title) are computed once and kept up to date by add_item, so reading
+    them is O(1). Add items through add_item rather than appending to
+    `items` directly; reassigning `items` recomputes them.
+    """
     id: Optional[int]
     items: List[NewsItem]
     created_at: datetime
@@ -50,22 +65,109 @@ class Event:
         """Initialize computed fields."""
         if not self.canonical_title and self.items:
             # Use shortest title as canonical (often clearer)
-            self.canonical_title = min(
-                (item.title for item in self.items),
-                key=len
-            )
+            self.canonical_title = self.shortest_title
+
+    def __setattr__(self, name, value):
+        """Recompute aggregates whenever the item list is replaced."""
+        object.__setattr__(self, name, value)
+        if name == 'items':
+            self._recompute_aggregates()
+
+    def _recompute_aggregates(self) -> None:
+        """Rebuild cached aggregates from scratch."""
+        self._source_set: Set[str] = set()
+        self._source_ids: List[str] = []
+        self._most_recent_time: Optional[datetime] = None
+        self._shortest_title: str = ""
+        for item in self.items:
+            self._update_aggregates(item)
+
+    def _update_aggregates(self, item: NewsItem) -> None:
+        """Fold a single item into the cached aggregates."""
+        if item.source_id not in self._source_set:
+            self._source_set.add(item.source_id)
+            self._source_ids.append(item.source_id)
+
+        # Collapsed copies from other sources still count as reporting it
+        for duplicate in item.duplicates:
+            if duplicate.source_id not in self._source_set:
+                self._source_set.add(duplicate.source_id)
+                self._source_ids.append(duplicate.source_id)
+
+        if self._most_recent_time is None or item.published_at > self._most_recent_time:
+            self._most_recent_time = item.published_at
+
+        # Strictly shorter only, so ties keep the first title (as min() would)
+        if not self._shortest_title or len(item.title) < len(self._shortest_title):
+            self._shortest_title = item.title
+
+    def add_item(self, item: NewsItem) -> None:
+        """Add an item to the event, updating aggregates incrementally."""
+        self.items.append(item)
+        self._update_aggregates(item)
 
     @property
     def source_count(self) -> int:
         """Number of distinct sources reporting this event."""
-        return len(set(item.source_id for item in self.items))
+        return len(self._source_set)
 
     @property
     def source_ids(self) -> List[str]:
-        """List of distinct source IDs."""
-        return list(set(item.source_id for item in self.items))
+        """List of distinct source IDs, in order of first appearance (a copy)."""
+        return list(self._source_ids)
 
     @property
-    def most_recent_time(self) -> datetime:
+    def most_recent_time(self) -> Optional[datetime]:
         """Most recent publication time among all items."""
-        return max(item.published_at for item in self.items)
+        return self._most_recent_time
+
+    @property
+    def shortest_title(self) -> str:
+        """Shortest item title (first one on ties)."""
+        return self._shortest_title
+
+    @property
+    def signature(self) -> Optional[int]:
+        """
+        Stable identity of the story across runs.
+
+        The guid key of the earliest published member (collapsed copies
+        included). Later reports join the story without changing it; it
+        only changes once that first item ages out of the lookback window.
+        """
+        members = [member for item in self.items for member in (item, *item.duplicates)]
+        if not members:
+            return None
+        return min(members, key=lambda m: (m.published_at, m.guid_hash)).guid_hash
+
+
+@dataclass
+class BriefDelta:
+    """What changed between the last two stored briefs."""
+    ranked_at: datetime
+    previous_ranked_at: Optional[datetime]  # None for the first brief
+    new_event_ids: List[int] = field(default_factory=list)
+    # Events also in the previous brief -> ids of items added since then
+    updated_item_ids: Dict[int, List[int]] = field(default_factory=dict)
+    unchanged_event_ids: List[int] = field(default_factory=list)
+    dropped: List[Tuple[int, str]] = field(default_factory=list)  # (event id, title)
+
+
+@dataclass
+class SearchResult:
+    """A single full-text search hit over stored items."""
+    item: NewsItem
+    rank: float  # BM25 score (lower = better match)
+    snippet: str = ""
+
+
+@dataclass
+class FeedHealth:
+    """Fetch health of a single source, used by the circuit breaker."""
+    source_id: str
+    consecutive_failures: int = 0
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    avg_latency_ms: Optional[float] = None  # Exponentially weighted
+    next_probe_at: Optional[datetime] = None  # Set while the circuit is open
@@ -0,0 +1,571 @@
+"""The full news brief pipeline, split into reusable stages.
+
+`run_pipeline` runs every stage as a dependency graph (see stage_graph),
+so stages that don't depend on each other overlap; the `fetch` and
+`cluster` subcommands run a single stage against news.db.
+"""
+
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .health import HealthRecorder, apply_outcomes, filter_healthy_sources, format_health_report
+from .schedule import load_polling_config, plan_next_polls, select_due_sources
+from .snapshot import SnapshotReader, SnapshotWriter, load_snapshot_config, prune_snapshots
+from .store import NewsDatabase
+from .cluster import cluster_items, refine_canonical_title
+from .dedup import collapse_event_duplicates, collapse_near_duplicates
+from .rank import select_top_events
+from .render import render_brief, archive_brief
+from .render_html import render_html_brief
+from .render_json import render_json_brief
+from .view import build_brief_view
+from .models import Event, NewsItem, Source
+from .sources import load_sources
+from .profiling import MemoryProfiler
+from .profiles import load_profiles_config, render_profiles
+from .stage_graph import Stage, StageGraph
+from .utils import load_yaml, get_config_path, get_project_root
+
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_sources(db: NewsDatabase, sources: List[Source]) -> None:
+    """Store the configured sources (Step 1)."""
+    logger.info("Step 1: Loading source configurations")
+    for source in sources:
+        db.upsert_source(source)
+    logger.info(f"  Loaded {len(sources)} sources")
+
+
+def plan_polls(db: NewsDatabase, sources: List[Source], polled_at: datetime,
+               fetch_all: bool = False) -> List[Source]:
+    """
+    Choose the sources to poll in this run.
+
+    Args:
+        db: Connected database
+        sources: Configured sources
+        polled_at: Time of this poll
+        fetch_all: Poll every source, ignoring the adaptive schedule
+
+    Returns:
+        Sources that are due and whose feeds are not failing
+    """
+    logger.info("Step 2: Fetching RSS feeds")
+    polling = load_polling_config()
+    polled_sources = sources
+    if polling['enabled'] and not fetch_all:
+        polled_sources, skipped = select_due_sources(
+            sources, db.get_poll_schedule(), polled_at, polling
+        )
+        logger.info(f"  {len(polled_sources)} sources due, {len(skipped)} not due yet")
+
+    # Skip persistently failing feeds until their next probe
+    polled_sources, open_circuits = filter_healthy_sources(
+        polled_sources, db.get_feed_health(), polled_at
+    )
+    if open_circuits:
+        logger.info(
+            f"  Skipping {len(open_circuits)} failing feeds: "
+            f"{', '.join(s.id for s in open_circuits)}"
+        )
+    return polled_sources
+
+
+def fetch_feeds(polled_sources: List[Source]) -> Tuple[List[NewsItem], HealthRecorder]:
+    """
+    Fetch the polled feeds, recording snapshots if enabled.
+
+    Does not touch the database, so it can overlap with database stages.
+
+    Returns:
+        Fetched items and the per-feed fetch outcomes
+    """
+    # The fetch stack (urllib, XML parsing) is imported by the stages that
+    # use it, so cluster, rerank and archive commands never load it
+    from .ingest import fetch_all_feeds
+
+    snapshot_config = load_snapshot_config()
+    snapshots = SnapshotWriter() if snapshot_config['enabled'] else None
+    health = HealthRecorder()
+    new_items = fetch_all_feeds(snapshots, sources=polled_sources, health=health)
+    if snapshots:
+        snapshots.finish()
+        prune_snapshots(keep_days=snapshot_config['keep_days'])
+    return new_items, health
+
+
+def record_health(db: NewsDatabase, health: HealthRecorder, polled_at: datetime) -> None:
+    """Apply this run's fetch outcomes to the feed health and log failing feeds."""
+    feed_health = apply_outcomes(db, health, now=polled_at)
+    report = format_health_report(feed_health, polled_at)
+    logger.info(f"  Feed health: {len(report)} of {len(feed_health)} tracked feeds failing")
+    for line in report:
+        logger.warning(f"    {line}")
+
+
+def store_items(db: NewsDatabase, new_items: List[NewsItem]) -> int:
+    """
+    Store fetched items, deduplicated by GUID and canonical URL (Step 3).
+
+    Returns:
+        Number of new items stored
+    """
+    from .ingest import filter_new_items
+
+    logger.info("Step 3: Storing items in database")
+    unseen_items, guid_duplicates, url_duplicates = filter_new_items(db, new_items)
+    stored_count = 0
+
+    for item in unseen_items:
+        item_id = db.insert_item(item)
+        if item_id is not None:
+            stored_count += 1
+        else:
+            guid_duplicates += 1
+
+    logger.info(
+        f"  Stored {stored_count} new items, skipped {guid_duplicates} duplicates "
+        f"and {url_duplicates} copies of stored articles (same canonical URL)"
+    )
+    return stored_count
+
+
+def schedule_polls(db: NewsDatabase, polled_sources: List[Source], polled_at: datetime) -> None:
+    """Learn publication rates from the stored items and plan the next polls."""
+    polling = load_polling_config()
+    if polling['enabled']:
+        plan_next_polls(db, polled_sources, now=polled_at, config=polling)
+
+
+def ingest(db: NewsDatabase, snapshot: Optional[SnapshotReader] = None,
+           fetch_all: bool = False, profiler: Optional[MemoryProfiler] = None) -> int:
+    """
+    Load sources, fetch (or replay) their feeds and store the new items.
+
+    Args:
+        db: Connected database
+        snapshot: Recorded run to replay instead of fetching
+        fetch_all: Poll every source, ignoring the adaptive schedule
+        profiler: Records memory at stage boundaries if given
+
+    Returns:
+        Number of new items stored
+    """
+    if profiler is None:
+        profiler = MemoryProfiler()
+
+    # Step 1: Upsert sources
+    sources = snapshot.sources() if snapshot else load_sources()
+    upsert_sources(db, sources)
+    profiler.checkpoint('sources')
+
+    # Step 2: Ingest RSS feeds
+    if snapshot:
+        from .ingest import replay_feeds
+
+        logger.info("Step 2: Replaying RSS feeds from snapshot")
+        new_items = replay_feeds(snapshot)
+    else:
+        # Use replace to make timezone-naive for comparison with database datetimes
+        polled_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        polled_sources = plan_polls(db, sources, polled_at, fetch_all=fetch_all)
+        new_items, health = fetch_feeds(polled_sources)
+        record_health(db, health, polled_at)
+    profiler.checkpoint('fetch')
+
+    # Step 3: Store items
+    stored_count = store_items(db, new_items)
+    if not snapshot:
+        # Learn publication rates now that this run's items are stored
+        schedule_polls(db, polled_sources, polled_at)
+    profiler.checkpoint('store')
+
+    return stored_count
+
+
+def cluster_and_rank(db: NewsDatabase, lookback_hours: int, now: Optional[datetime] = None,
+                     profiler: Optional[MemoryProfiler] = None) -> Optional[List[Event]]:
+    """
+    Cluster recent items into events, rank them and store the top events.
+
+    Args:
+        db: Connected database
+        lookback_hours: Cluster items published in this many past hours
+        now: Reference time (default: current UTC time)
+        profiler: Records memory at stage boundaries if given
+
+    Returns:
+        Top events in rank order, or None if there were no recent items
+    """
+    events = cluster_recent(db, lookback_hours, now=now, profiler=profiler)
+    if events is None:
+        return None
+    return rank_and_store(db, events, now=now, profiler=profiler)
+
+
+def cluster_recent(db: NewsDatabase, lookback_hours: int, now: Optional[datetime] = None,
+                   profiler: Optional[MemoryProfiler] = None) -> Optional[List[Event]]:
+    """
+    Cluster recent items into events and store every cluster.
+
+    Args:
+        db: Connected database
+        lookback_hours: Cluster items published in this many past hours
+        now: Reference time (default: current UTC time)
+        profiler: Records memory at stage boundaries if given
+
+    Returns:
+        Every cluster, or None if there were no recent items
+    """
+    if profiler is None:
+        profiler = MemoryProfiler()
+
+    # Step 4: Retrieve recent items for clustering
+    logger.info(f"Step 4: Retrieving items from last {lookback_hours} hours")
+    recent_items = db.get_recent_items(hours=lookback_hours, now=now)
+    logger.info(f"  Found {len(recent_items)} recent items")
+    profiler.checkpoint('load_recent')
+
+    if not recent_items:
+        logger.warning("No recent items to cluster.")
+        return None
+
+    # Collapse near-identical copies so clustering sees each story once
+    unique_items = collapse_near_duplicates(recent_items)
+    logger.info(f"  Collapsed {len(recent_items) - len(unique_items)} near-duplicates")
+    profiler.checkpoint('dedup')
+
+    # Step 5: Cluster items into events
+    logger.info("Step 5: Clustering items into events")
+    events = cluster_items(unique_items)
+
+    # Refine canonical titles
+    for event in events:
+        event.canonical_title = refine_canonical_title(event)
+
+    # Keep every cluster so the brief can be re-ranked later (see rerank)
+    db.save_clusters(events, created_at=now)
+    profiler.checkpoint('cluster')
+
+    return events
+
+
+def rank_and_store(db: NewsDatabase, events: List[Event], now: Optional[datetime] = None,
+                   profiler: Optional[MemoryProfiler] = None) -> List[Event]:
+    """
+    Rank clusters and store the top events as the brief.
+
+    Args:
+        db: Connected database
+        events: Clusters to rank
+        now: Reference time (default: current UTC time)
+        profiler: Records memory at stage boundaries if given
+
+    Returns:
+        Top events in rank order
+    """
+    if profiler is None:
+        profiler = MemoryProfiler()
+
+    # Step 6: Rank and select top events
+    logger.info("Step 6: Ranking events")
+    top_events = select_top_events(events, now=now)
+    profiler.checkpoint('rank')
+
+    # Step 7: Store events in database
+    store_top_events(db, top_events, now=now)
+    profiler.checkpoint('store_events')
+
+    return top_events
+
+
+def store_top_events(db: NewsDatabase, top_events: List[Event],
+                     now: Optional[datetime] = None) -> None:
+    """
+    Store the ranked events of one brief, assigning their ids.
+
+    Stories already stored by an earlier run are updated in place and
+    keep their id.
+
+    Args:
+        db: Connected database
+        top_events: Events selected for the brief
+        now: Time of this ranking run (default: current UTC time)
+    """
+    logger.info("Step 7: Storing events in database")
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Collapsed duplicates are stored as members too; readers collapse them again
+    inserted = db.upsert_events(top_events, ranked_at=now)
+    logger.info(f"  {inserted} new events, {len(top_events) - inserted} continuing stories")
+
+
+def rerank(db: NewsDatabase, max_count: Optional[int] = None,
+           now: Optional[datetime] = None) -> Optional[List[Event]]:
+    """
+    Rank the stored clusters of the last clustering run again.
+
+    Skips fetching and clustering, so changes to ranking settings can be
+    tried in well under a second.
+
+    Args:
+        db: Connected database
+        max_count: Maximum number of events (uses config if None)
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Top events in rank order, or None if no clusters are stored
+    """
+    events = db.get_clusters()
+    if not events:
+        logger.warning("No stored clusters to rank; run the cluster step first.")
+        return None
+
+    collapse_event_duplicates(events)
+
+    logger.info(f"Re-ranking {len(events)} stored clusters")
+    top_events = select_top_events(events, max_count=max_count, now=now)
+    store_top_events(db, top_events, now=now)
+
+    return top_events
+
+
+def archive_and_cleanup(db: NewsDatabase, keep_days: int = 7) -> None:
+    """
+    Archive the current brief and delete old events.
+
+    Args:
+        db: Connected database
+        keep_days: Number of days of events to keep
+    """
+    # Step 9: Archive (optional)
+    logger.info("Step 9: Archiving brief")
+    archive_brief()
+
+    # Clean up old events
+    logger.info("Step 10: Cleaning up old events")
+    db.clear_old_events(keep_days=keep_days)
+
+
+def load_pipeline_config() -> Dict[str, Any]:
+    """Load pipeline execution settings from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    pipeline = config.get('pipeline') or {}
+
+    return {
+        'workers': max(1, int(pipeline.get('workers', 4))),
+    }
+
+
+def build_pipeline_graph(db: NewsDatabase, output_dir: Path,
+                         snapshot: Optional[SnapshotReader] = None,
+                         fetch_all: bool = False, lookback_hours: int = 24,
+                         now: Optional[datetime] = None) -> StageGraph:
+    """
+    Describe a full run as stages with declared inputs and outputs.
+
+    Every stage that uses the database holds the 'db' resource, so they
+    run one at a time on the shared connection, in an order that matches
+    the sequential pipeline. Fetching overlaps with storing sources, the
+    three output formats render in parallel, and profile briefs are
+    built while the main brief is ranked and rendered.
+
+    If there are no recent items, `clusters` is None: the brief renders
+    empty and the stages after it do nothing.
+
+    Args:
+        db: Connected database
+        output_dir: Directory for the brief outputs
+        snapshot: Recorded run to replay instead of fetching
+        fetch_all: Poll every source, ignoring the adaptive schedule
+        lookback_hours: Cluster items published in this many past hours
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        The stage graph, in sequential order
+    """
+    db_lock = ('db',)
+    stages = [
+        Stage('sources', lambda: snapshot.sources() if snapshot else load_sources(),
+              outputs=('sources',)),
+    ]
+
+    # Steps 1-3: Sources, feeds, items
+    if snapshot:
+        from .ingest import replay_feeds
+
+        stages += [
+            Stage('upsert_sources', lambda sources: upsert_sources(db, sources),
+                  inputs=('sources',), outputs=('sources_stored',), resources=db_lock),
+            Stage('fetch', lambda: replay_feeds(snapshot), outputs=('items',)),
+        ]
+    else:
+        # Use replace to make timezone-naive for comparison with database datetimes
+        polled_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        stages += [
+            Stage('plan_polls', lambda sources: plan_polls(db, sources, polled_at, fetch_all),
+                  inputs=('sources',), outputs=('polled_sources',), resources=db_lock),
+            Stage('upsert_sources', lambda sources: upsert_sources(db, sources),
+                  inputs=('sources',), outputs=('sources_stored',), resources=db_lock),
+            Stage('fetch', fetch_feeds,
+                  inputs=('polled_sources',), outputs=('items', 'health')),
+            Stage('record_health', lambda health: record_health(db, health, polled_at),
+                  inputs=('health',), outputs=('health_recorded',), resources=db_lock),
+        ]
+
+    stages.append(
+        Stage('store', lambda items, sources_stored: store_items(db, items),
+              inputs=('items', 'sources_stored'), outputs=('stored_count',), resources=db_lock)
+    )
+    if not snapshot:
+        stages.append(
+            Stage('schedule',
+                  lambda polled_sources, stored_count: schedule_polls(db, polled_sources, polled_at),
+                  inputs=('polled_sources', 'stored_count'), outputs=('polls_planned',),
+                  resources=db_lock)
+        )
+
+    # Steps 4-7: Cluster, rank, store events
+    def rank(clusters):
+        if clusters is None:
+            logger.warning("Rendering an empty brief.")
+            # Record the empty brief so `render` and the next delta don't reuse the last one
+            store_top_events(db, [], now=now)
+            return []
+        return rank_and_store(db, clusters, now=now)
+
+    def delta(clusters, top_events):
+        return None if clusters is None else db.get_brief_delta()
+
+    stages += [
+        Stage('cluster', lambda stored_count: cluster_recent(db, lookback_hours, now=now),
+              inputs=('stored_count',), outputs=('clusters',), resources=db_lock),
+        Stage('rank', rank, inputs=('clusters',), outputs=('top_events',), resources=db_lock),
+        Stage('delta', delta, inputs=('clusters', 'top_events'), outputs=('delta',),
+              resources=db_lock),
+    ]
+
+    # Step 8: Render briefs (Markdown, HTML, JSON, changes since the last brief)
+    def view(top_events):
+        logger.info("Step 8: Rendering morning brief (Markdown, HTML, JSON)")
+        return build_brief_view(top_events, generated_at=now)
+
+    def render_html(clusters, top_events, view):
+        if clusters is not None:
+            render_html_brief(top_events, output_dir / 'brief.html', view=view)
+
+    def render_json(clusters, top_events, view, delta):
+        if clusters is not None:
+            render_json_brief(top_events, output_dir / 'brief.json', view=view, delta=delta)
+
+    stages += [
+        Stage('view', view, inputs=('top_events',), outputs=('view',)),
+        Stage('render_md',
+              lambda top_events, view: render_brief(top_events, output_dir / 'brief.md', view=view),
+              inputs=('top_events', 'view'), outputs=('brief_md',)),
+        Stage('render_html', render_html,
+              inputs=('clusters', 'top_events', 'view'), outputs=('brief_html',)),
+        Stage('render_json', render_json,
+              inputs=('clusters', 'top_events', 'view', 'delta'), outputs=('brief_json',)),
+    ]
+
+    # Extra profile briefs from the same clusters
+    profiles = load_profiles_config()
+    if profiles:
+        def render_profile_briefs(clusters):
+            if clusters is not None:
+                logger.info(f"Step 8b: Rendering {len(profiles)} profile briefs")
+                render_profiles(clusters, output_dir, now=now, profiles=profiles)
+
+        stages.append(
+            Stage('profiles', render_profile_briefs, inputs=('clusters',), outputs=('profile_briefs',))
+        )
+
+    if not snapshot:
+        def archive(clusters, brief_md):
+            if clusters is not None:
+                logger.info("Step 9: Archiving brief")
+                archive_brief()
+
+        def cleanup(clusters, delta):
+            # Runs after the delta, which compares against the older events
+            if clusters is not None:
+                logger.info("Step 10: Cleaning up old events")
+                db.clear_old_events()
+
+        stages += [
+            Stage('archive', archive, inputs=('clusters', 'brief_md'), outputs=('archived',)),
+            Stage('cleanup', cleanup, inputs=('clusters', 'delta'), outputs=('cleaned',),
+                  resources=db_lock),
+        ]
+
+    return StageGraph(stages)
+
+
+def run_pipeline(replay_dir: Optional[Path] = None, fetch_all: bool = False,
+                 profile_memory: bool = False) -> int:
+    """
+    Main pipeline execution.
+
+    Stages overlap on `pipeline.workers` threads; per-stage timings and
+    the critical path are logged at the end.
+
+    Args:
+        replay_dir: Snapshot run directory to replay instead of fetching.
+            Replays use an in-memory database, treat the snapshot time as
+            "now", and write their brief into <replay_dir>/output.
+        fetch_all: Poll every source, ignoring the adaptive schedule
+        profile_memory: Record memory usage at each stage boundary and
+            write it to <output dir>/memory_profile.json. Stages then run
+            one at a time so each measurement belongs to one stage.
+    """
+    logger.info("=" * 60)
+    logger.info("Daily Briefer - Starting" + (f" (replaying {replay_dir})" if replay_dir else ""))
+    logger.info("=" * 60)
+
+    profiler = MemoryProfiler(enabled=profile_memory)
+    profiler.start()
+
+    try:
+        # Load configuration
+        settings = load_yaml(str(get_config_path('settings.yaml')))
+        lookback_hours = settings.get('lookback_hours', 24)
+        workers = 1 if profile_memory else load_pipeline_config()['workers']
+
+        snapshot = SnapshotReader(replay_dir) if replay_dir else None
+        now = snapshot.started_at if snapshot else None
+        output_dir = replay_dir / 'output' if replay_dir else get_project_root() / 'output'
+
+        # Initialize database
+        db = NewsDatabase(Path(':memory:')) if snapshot else NewsDatabase()
+        db.connect()
+
+        graph = build_pipeline_graph(db, output_dir, snapshot=snapshot, fetch_all=fetch_all,
+                                     lookback_hours=lookback_hours, now=now)
+        graph.run(max_workers=workers, on_stage_done=profiler.checkpoint)
+
+        # Close database
+        db.close()
+        profiler.write_report(output_dir / 'memory_profile.json')
+
+        logger.info(f"Stage timings (workers: {workers}):")
+        for line in graph.report_lines():
+            logger.info(f"  {line}")
+
+        logger.info("=" * 60)
+        logger.info("Daily Briefer - Completed Successfully")
+        logger.info("=" * 60)
+
+        return 0
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        return 1
+
+    finally:
+        profiler.stop()
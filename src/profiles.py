@@ -0,0 +1,174 @@
+"""Brief profiles: several differently filtered briefs from one run.
+
+A profile is a named brief (e.g. regional, finance-only, wire-only) that
+reuses the shared fetch and clustering. Each profile keeps only the items
+from its sources, drops events that no longer have enough sources, and
+is ranked and rendered on its own into output/profiles/<name>/.
+"""
+
+import logging
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .models import Event, NewsItem, Source
+from .cluster import categorize_events, load_clustering_config, refine_canonical_title
+from .rank import select_top_events
+from .render import render_all
+from .sources import load_sources
+from .utils import load_yaml, get_config_path
+
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ('general', 'financial')
+
+
+def load_profiles_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load brief profiles from settings.yaml.
+
+    Returns:
+        Map of profile name -> profile with `regions`, `tiers` and
+        `sections` (sets, None = no restriction) and `max_events`
+        (None = max_events_in_brief)
+    """
+    config = load_yaml(str(get_config_path('settings.yaml')))
+
+    profiles = {}
+    for name, profile in (config.get('profiles') or {}).items():
+        profile = profile or {}
+        sections = profile.get('sections')
+        if sections is not None:
+            unknown = set(sections) - set(SECTIONS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown sections {sorted(unknown)} in profile {name!r} "
+                    f"(expected some of {SECTIONS})"
+                )
+
+        profiles[name] = {
+            'regions': set(profile['regions']) if profile.get('regions') else None,
+            'tiers': set(profile['tiers']) if profile.get('tiers') else None,
+            'sections': set(sections) if sections else None,
+            'max_events': profile.get('max_events'),
+        }
+
+    return profiles
+
+
+def source_matches(source: Source, profile: Dict[str, Any]) -> bool:
+    """True if a profile includes items from this source."""
+    return (
+        (profile['regions'] is None or source.region in profile['regions'])
+        and (profile['tiers'] is None or source.tier in profile['tiers'])
+    )
+
+
+def _restrict_item(item: NewsItem, allowed: Set[str]) -> Optional[NewsItem]:
+    """
+    An item limited to the allowed sources, counting its collapsed copies.
+
+    Returns the item itself if nothing is removed, a copy if some copies
+    are, and None if no member is from an allowed source.
+    """
+    members = [m for m in (item, *item.duplicates) if m.source_id in allowed]
+    if not members:
+        return None
+    if len(members) == 1 + len(item.duplicates):
+        return item
+    return replace(members[0], duplicates=members[1:])
+
+
+def events_for_profile(events: List[Event], profile: Dict[str, Any],
+                       sources: List[Source],
+                       clustering: Optional[Dict[str, Any]] = None) -> List[Event]:
+    """
+    Restrict shared clusters to a profile.
+
+    Returns new Event objects, so ranking one profile never changes the
+    scores of the shared clusters or of another profile.
+
+    Args:
+        events: Every cluster of the shared clustering run
+        profile: Profile to build events for
+        sources: Configured sources
+        clustering: Clustering configuration (loaded if None)
+
+    Returns:
+        Events with only the profile's items, each with at least
+        min_sources_per_event sources and in one of the profile's sections
+    """
+    if clustering is None:
+        clustering = load_clustering_config()
+
+    allowed = {source.id for source in sources if source_matches(source, profile)}
+    min_sources = clustering['min_sources_per_event']
+
+    profile_events = []
+    for event in events:
+        items = [_restrict_item(item, allowed) for item in event.items]
+        items = [item for item in items if item is not None]
+        if not items:
+            continue
+
+        profile_event = Event(id=None, items=items, created_at=event.created_at)
+        if profile_event.source_count < min_sources:
+            continue
+
+        unchanged = (len(items) == len(event.items)
+                     and all(a is b for a, b in zip(items, event.items)))
+        profile_event.canonical_title = (
+            event.canonical_title if unchanged else refine_canonical_title(profile_event)
+        )
+        profile_events.append(profile_event)
+
+    if profile['sections'] is not None:
+        general, financial = categorize_events(profile_events, clustering['financial_sources'])
+        by_section = {'general': general, 'financial': financial}
+        kept = {id(e) for section in profile['sections'] for e in by_section[section]}
+        profile_events = [e for e in profile_events if id(e) in kept]
+
+    return profile_events
+
+
+def render_profiles(events: List[Event], output_root: Path,
+                    now: Optional[datetime] = None,
+                    names: Optional[List[str]] = None,
+                    profiles: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, List[Event]]:
+    """
+    Rank and render every profile against the shared clusters.
+
+    Args:
+        events: Every cluster of the shared clustering run
+        output_root: Output directory; profile `name` goes to output_root/profiles/name
+        now: Reference time for ranking and the brief timestamp (default: now)
+        names: Profiles to render (default: all configured profiles)
+        profiles: Profile configuration (loaded if None)
+
+    Returns:
+        Map of profile name -> its top events in rank order
+    """
+    if profiles is None:
+        profiles = load_profiles_config()
+    if names is None:
+        names = list(profiles)
+
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise ValueError(f"Unknown profiles {unknown} (configured: {sorted(profiles)})")
+
+    sources = load_sources()
+    clustering = load_clustering_config()
+
+    briefs = {}
+    for name in names:
+        profile = profiles[name]
+        profile_events = events_for_profile(events, profile, sources, clustering)
+        top_events = select_top_events(profile_events, max_count=profile['max_events'], now=now)
+        render_all(top_events, output_root / 'profiles' / name, generated_at=now)
+        logger.info(f"  Profile {name}: {len(top_events)} of {len(profile_events)} events")
+        briefs[name] = top_events
+
+    return briefs
@@ -0,0 +1,186 @@
+"""Optional memory instrumentation for pipeline runs.
+
+Enabled with `python -m src.main --profile-memory`. At every stage
+boundary the profiler records Python heap usage (current and per-stage
+peak via tracemalloc), process RSS, the allocation sites that grew most
+during the stage, and live NewsItem/Event counts. The report is logged
+and written to output/memory_profile.json.
+
+RSS fields per stage in the report:
+    rss_bytes                     RSS when the stage finished
+    rss_growth_bytes              change in RSS over the stage (can be negative)
+    process_rss_high_water_bytes  highest RSS of the whole process so far; it
+                                  never goes down, so it only marks the stage
+                                  where the process peak was reached
+"""
+
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .models import NewsItem, Event
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per traceback; 1 groups allocations by the line that made them
+TRACEBACK_DEPTH = 1
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process right now (Linux only)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far (never decreases)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _count_objects() -> Dict[str, int]:
+    """Count live pipeline objects by type."""
+    counts = {'NewsItem': 0, 'Event': 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, NewsItem):
+            counts['NewsItem'] += 1
+        elif isinstance(obj, Event):
+            counts['Event'] += 1
+    return counts
+
+
+def _mb(value: Optional[int]) -> str:
+    """Format a byte count as megabytes."""
+    return f"{value / 1_048_576:.1f} MB" if value is not None else "n/a"
+
+
+def _signed_mb(value: Optional[int]) -> str:
+    """Format a byte count change as signed megabytes."""
+    return f"{value / 1_048_576:+.1f} MB" if value is not None else "n/a"
+
+
+class MemoryProfiler:
+    """Takes memory measurements at pipeline stage boundaries."""
+
+    def __init__(self, enabled: bool = False, top_n: int = 10):
+        """Create a profiler (a no-op unless enabled)."""
+        self.enabled = enabled
+        self.top_n = top_n
+        self.stages: List[Dict[str, Any]] = []
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stage_started = 0.0
+        self._stage_rss: Optional[int] = None
+
+    def start(self) -> None:
+        """Begin tracing allocations."""
+        if not self.enabled:
+            return
+        tracemalloc.start(TRACEBACK_DEPTH)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._stage_rss = _current_rss_bytes()
+        self._stage_started = time.perf_counter()
+
+    def checkpoint(self, stage: str) -> None:
+        """
+        Record measurements for the stage that just finished.
+
+        Args:
+            stage: Name of the completed stage
+        """
+        if not self.enabled:
+            return
+
+        elapsed = time.perf_counter() - self._stage_started
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        growth = snapshot.compare_to(self._snapshot, 'lineno')[:self.top_n]
+        self._snapshot = snapshot
+
+        rss = _current_rss_bytes()
+        rss_growth = rss - self._stage_rss if None not in (rss, self._stage_rss) else None
+        self._stage_rss = rss
+
+        self.stages.append({
+            'stage': stage,
+            'seconds': round(elapsed, 3),
+            'heap_current_bytes': current,
+            'heap_peak_bytes': peak,
+            'rss_bytes': rss,
+            'rss_growth_bytes': rss_growth,
+            'process_rss_high_water_bytes': _peak_rss_bytes(),
+            'objects': _count_objects(),
+            'top_allocations': [
+                {
+                    'site': str(stat.traceback[0]),
+                    'size_bytes': stat.size,
+                    'size_diff_bytes': stat.size_diff,
+                    'count_diff': stat.count_diff,
+                }
+                for stat in growth
+            ],
+        })
+
+        self._stage_started = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop tracing allocations."""
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def report_lines(self) -> List[str]:
+        """Human-readable summary of every recorded stage."""
+        lines = []
+        for s in self.stages:
+            lines.append(
+                f"{s['stage']}: heap {_mb(s['heap_current_bytes'])} "
+                f"(stage peak {_mb(s['heap_peak_bytes'])}), "
+                f"RSS {_mb(s['rss_bytes'])} ({_signed_mb(s['rss_growth_bytes'])} in stage, "
+                f"process high-water {_mb(s['process_rss_high_water_bytes'])}), "
+                f"{s['objects']['NewsItem']} NewsItem / {s['objects']['Event']} Event, "
+                f"{s['seconds']:.2f}s"
+            )
+            for alloc in s['top_allocations'][:3]:
+                lines.append(
+                    f"    {alloc['size_diff_bytes'] / 1024:+.0f} KiB "
+                    f"({alloc['count_diff']:+d} blocks) {alloc['site']}"
+                )
+        return lines
+
+    def write_report(self, path: Path) -> None:
+        """Log the summary and write the full report as JSON."""
+        if not self.enabled:
+            return
+
+        logger.info("Memory profile:")
+        for line in self.report_lines():
+            logger.info(f"  {line}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.stages}, f, indent=2)
+
+        logger.info(f"Memory profile written to {path}")
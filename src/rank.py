@@ -1,5 +1,6 @@
 """Event ranking and scoring to prioritize most important news."""
 
+import heapq
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
@@ -7,7 +8,7 @@ import math
 
 from .models import Event, Source
 from .utils import load_yaml, get_config_path
-from .ingest import load_sources
+from .sources import load_sources
 
 
 logger = logging.getLogger(__name__)
@@ -34,8 +35,34 @@ def get_source_tier_map() -> Dict[str, str]:
     return {source.id: source.tier for source in sources}
 
 
+def build_source_weights(config: Dict[str, Any],
+                         source_tiers: Dict[str, str]) -> Dict[str, float]:
+    """
+    Precompute the tier weight for every known source.
+
+    Args:
+        config: Ranking configuration
+        source_tiers: Map of source_id -> tier
+
+    Returns:
+        Map of source_id -> tier weight
+    """
+    tier_weights = config['source_tier_weights']
+    return {
+        source_id: tier_weights.get(tier, 1.0)
+        for source_id, tier in source_tiers.items()
+    }
+
+
+def _current_time() -> datetime:
+    """Reference time for recency scoring (timezone-naive UTC)."""
+    # Use replace to make timezone-naive for comparison with database datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def calculate_event_score(event: Event, config: Dict[str, Any],
-                          source_tiers: Dict[str, str]) -> float:
+                          source_tiers: Dict[str, str],
+                          now: Optional[datetime] = None) -> float:
     """
     Calculate importance score for an event.
 
@@ -48,35 +75,93 @@ def calculate_event_score(event: Event, config: Dict[str, Any],
         event: Event to score
         config: Ranking configuration
         source_tiers: Map of source_id -> tier
+        now: Reference time for recency (default: current UTC time)
 
     Returns:
         Score (higher = more important)
     """
-    # Base score: number of distinct sources
-    base_score = float(event.source_count)
+    source_weights = build_source_weights(config, source_tiers)
+    if now is None:
+        now = _current_time()
+
+    return _score(event, source_weights, _default_weight(config),
+                  config['recency_weight'], now)
 
-    # Tier weighting: sum weights of all sources
-    tier_weights = config['source_tier_weights']
-    tier_bonus = 0.0
 
-    for source_id in event.source_ids:
-        tier = source_tiers.get(source_id, 'news')  # Default to 'news'
-        tier_bonus += tier_weights.get(tier, 1.0)
+def _default_weight(config: Dict[str, Any]) -> float:
+    """Weight for sources missing from the tier map (treated as 'news')."""
+    return config['source_tier_weights'].get('news', 1.0)
+
+
+def _score(event: Event, source_weights: Dict[str, float], default_weight: float,
+           recency_weight: float, now: datetime) -> float:
+    """Score a single event against precomputed weights and reference time."""
+    source_ids = event.source_ids
+    source_count = event.source_count
+
+    # Base score: number of distinct sources
+    base_score = float(source_count)
 
     # Average tier weight as multiplier
-    avg_tier_weight = tier_bonus / event.source_count if event.source_count > 0 else 1.0
+    if source_count > 0:
+        tier_bonus = sum(source_weights.get(s, default_weight) for s in source_ids)
+        avg_tier_weight = tier_bonus / source_count
+    else:
+        avg_tier_weight = 1.0
 
     # Recency bonus: exponential decay
-    recency_weight = config['recency_weight']
-    # Use replace to make timezone-naive for comparison with database datetimes
-    current_time = datetime.now(timezone.utc).replace(tzinfo=None)
-    hours_old = (current_time - event.most_recent_time).total_seconds() / 3600
+    hours_old = (now - event.most_recent_time).total_seconds() / 3600
     recency_factor = math.exp(-recency_weight * hours_old)
 
     # Combined score
-    score = base_score * avg_tier_weight * (1 + recency_factor)
+    return base_score * avg_tier_weight * (1 + recency_factor)
+
+
+def score_events(events: List[Event], config: Dict[str, Any],
+                 source_tiers: Dict[str, str],
+                 now: Optional[datetime] = None) -> None:
+    """
+    Score all events in one batch, setting event.score in place.
+
+    Tier weights are resolved once per source and a single reference time
+    is used for every event; per-event aggregates are read from the Event.
+
+    Args:
+        events: Events to score
+        config: Ranking configuration
+        source_tiers: Map of source_id -> tier
+        now: Reference time for recency (default: current UTC time)
+    """
+    source_weights = build_source_weights(config, source_tiers)
+    default_weight = _default_weight(config)
+    recency_weight = config['recency_weight']
+    if now is None:
+        now = _current_time()
+
+    for event in events:
+        event.score = _score(event, source_weights, default_weight,
+                             recency_weight, now)
+
 
-    return score
+def top_events_by_score(events: List[Event], k: int) -> List[Event]:
+    """
+    Return the k highest-scoring events, highest first.
+
+    Uses a bounded heap (O(n log k)) instead of sorting every event. Ties
+    keep their input order, matching a stable descending sort.
+    """
+    if k >= len(events):
+        return sorted(events, key=lambda e: e.score, reverse=True)
+    return heapq.nlargest(k, events, key=lambda e: e.score)
+
+
+def _log_top_events(top_events: List[Event]) -> None:
+    """Log the leading events for debugging."""
+    for i, event in enumerate(top_events[:5], 1):
+        logger.info(
+            f"  {i}. Score={event.score:.2f}, Sources={event.source_count}, "
+            f"Title={event.canonical_title[:60]}..."
+        )
 
 
 def rank_events(events: List[Event]) -> List[Event]:
@@ -98,29 +183,26 @@ def rank_events(events: List[Event]) -> List[Event]:
     logger.info(f"Ranking {len(events)} events")
 
     # Calculate scores
-    for event in events:
-        event.score = calculate_event_score(event, config, source_tiers)
+    score_events(events, config, source_tiers)
 
     # Sort by score (descending)
     ranked_events = sorted(events, key=lambda e: e.score, reverse=True)
 
     # Log top events for debugging
-    for i, event in enumerate(ranked_events[:5], 1):
-        logger.info(
-            f"  {i}. Score={event.score:.2f}, Sources={event.source_count}, "
-            f"Title={event.canonical_title[:60]}..."
-        )
+    _log_top_events(ranked_events)
 
     return ranked_events
 
 
-def select_top_events(events: List[Event], max_count: Optional[int] = None) -> List[Event]:
+def select_top_events(events: List[Event], max_count: Optional[int] = None,
+                      now: Optional[datetime] = None) -> List[Event]:
     """
     Select top N events for the brief.
 
     Args:
-        events: List of ranked Event objects
+        events: List of Event objects to rank
         max_count: Maximum number of events (uses config if None)
+        now: Reference time for recency (default: current UTC time)
 
     Returns:
         List of top Event objects
@@ -130,11 +212,18 @@ def select_top_events(events: List[Event], max_count: Optional[int] = None) -> L
     if max_count is None:
         max_count = config['max_events_in_brief']
 
-    # Rank events first
-    ranked = rank_events(events)
+    if not events:
+        return []
+
+    source_tiers = get_source_tier_map()
+
+    logger.info(f"Ranking {len(events)} events")
+
+    # Score everything in one batch, then keep only the top N
+    score_events(events, config, source_tiers, now=now)
+    top_events = top_events_by_score(events, max_count)
 
-    # Select top N
-    top_events = ranked[:max_count]
+    _log_top_events(top_events)
 
     logger.info(f"Selected top {len(top_events)} events for brief")
 
@@ -1,35 +1,26 @@
 """Markdown brief rendering."""
 
 import logging
+import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 from pathlib import Path
 
-from .models import Event, NewsItem
-from .utils import load_yaml, get_config_path, get_output_path, ensure_directory
-from .ingest import load_sources
+from .models import BriefDelta, Event
+from .utils import get_output_path
+from .compress import publish_output, archive_file
+from .view import BriefView, EventView, build_brief_view
+from .render_html import render_html_brief
+from .render_json import render_json_brief
 
 
 logger = logging.getLogger(__name__)
 
+# The generation time alone doesn't make the brief new (see write_if_changed)
+GENERATED_LINE = re.compile(r'^\*Generated: [^*\n]*\*$', re.MULTILINE)
 
-def load_render_config() -> Dict[str, Any]:
-    """Load rendering configuration from settings.yaml."""
-    config = load_yaml(str(get_config_path('settings.yaml')))
 
-    return {
-        'max_sources_per_event': config.get('max_sources_per_event', 5),
-    }
-
-
-def get_source_name_map() -> Dict[str, str]:
-    """Build a map of source_id -> name."""
-    sources = load_sources()
-    return {source.id: source.name for source in sources}
-
-
-def render_event(event: Event, source_names: Dict[str, str],
-                config: Dict[str, Any]) -> str:
+def render_event(event: EventView) -> str:
     """
     Render a single event as Markdown.
 
@@ -38,71 +29,38 @@ def render_event(event: Event, source_names: Dict[str, str],
       - [Source1](url1), [Source2](url2), [Source3](url3)
 
     Args:
-        event: Event to render
-        source_names: Map of source_id -> display name
-        config: Rendering configuration
+        event: Prepared event to render
 
     Returns:
         Markdown string
     """
-    max_sources = config['max_sources_per_event']
-
-    # Build the headline
-    headline = event.canonical_title
-
-    # Sort items by source tier (wire first) and then by published date
-    sorted_items = sorted(
-        event.items,
-        key=lambda x: (
-            _get_source_tier_priority(x.source_id),
-            x.published_at
-        ),
-        reverse=True
-    )
-
-    # Limit sources displayed
-    display_items = sorted_items[:max_sources]
-    remaining_count = len(event.items) - len(display_items)
-
     # Build source links
-    source_links = []
-    for item in display_items:
-        source_name = source_names.get(item.source_id, item.source_id)
-        source_links.append(f"[{source_name}]({item.link})")
+    source_links = [
+        f"[{item.source_name}]({item.link})"
+        for item in event.display_items
+    ]
 
     source_line = ", ".join(source_links)
 
-    if remaining_count > 0:
-        source_line += f" (+{remaining_count} more)"
+    if event.remaining_count > 0:
+        source_line += f" (+{event.remaining_count} more)"
 
     # Format as Markdown
-    md = f"- **{headline}**\n"
+    md = f"- **{event.title}**\n"
     md += f"  - {source_line}\n"
 
     return md
 
 
-def _get_source_tier_priority(source_id: str) -> int:
-    """
-    Get sort priority for source tier (higher = better).
-
-    Wire services first, then news, then magazine.
-    """
-    if source_id.startswith('reuters') or source_id.startswith('ap'):
-        return 3
-    elif 'magazine' in source_id or 'economist' in source_id:
-        return 1
-    else:
-        return 2
-
-
-def render_brief(events: List[Event], output_path: Optional[Path] = None) -> str:
+def render_brief(events: List[Event], output_path: Optional[Path] = None,
+                 view: Optional[BriefView] = None) -> str:
     """
     Render complete morning brief as Markdown.
 
     Args:
         events: List of Event objects to include (should already be ranked/filtered)
         output_path: Path to write output file (default: output/brief.md)
+        view: Prepared view of `events` (built if None)
 
     Returns:
         Markdown string
@@ -110,58 +68,79 @@ def render_brief(events: List[Event], output_path: Optional[Path] = None) -> str
     if output_path is None:
         output_path = get_output_path('brief.md')
 
-    config = load_render_config()
-    source_names = get_source_name_map()
+    if view is None:
+        view = build_brief_view(events)
 
     # Build header
-    today = datetime.now().strftime('%Y-%m-%d')
+    today = view.generated_at.strftime('%Y-%m-%d')
     md_lines = [
         f"# Morning Brief — {today}",
         "",
-        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
+        f"*Generated: {view.generated_at.strftime('%Y-%m-%d %H:%M:%S')}*",
         "",
     ]
 
     # Render each event
-    if events:
-        for event in events:
-            event_md = render_event(event, source_names, config)
-            md_lines.append(event_md)
+    if view.events:
+        for event in view.events:
+            md_lines.append(render_event(event))
     else:
         md_lines.append("*No events to report.*")
         md_lines.append("")
 
     # Footer with stats
+    stats = view.stats
     md_lines.append("")
     md_lines.append("---")
     md_lines.append("")
-    md_lines.append(f"**Stats**: {len(events)} events")
+    md_lines.append(f"**Stats**: {stats.event_count} events")
 
-    if events:
-        total_sources = sum(e.source_count for e in events)
-        total_items = sum(len(e.items) for e in events)
-        md_lines.append(f" | {total_items} articles | {total_sources} distinct source mentions")
+    if view.events:
+        md_lines.append(f" | {stats.item_count} articles | {stats.source_mentions} distinct source mentions")
 
     md_lines.append("")
 
     # Join into final markdown
     markdown = "\n".join(md_lines)
 
-    # Write to file
-    ensure_directory(str(output_path.parent))
+    # Write to file plus compressed variants (atomically, only if changed)
+    if publish_output(output_path, markdown, ignore=GENERATED_LINE):
+        logger.info(f"Brief written to {output_path}")
+    else:
+        logger.info(f"Brief unchanged at {output_path}")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    return markdown
 
-    logger.info(f"Brief written to {output_path}")
 
-    return markdown
+def render_all(events: List[Event], output_dir: Path,
+               generated_at: Optional[datetime] = None,
+               delta: Optional[BriefDelta] = None) -> BriefView:
+    """
+    Render the brief in every output format from one shared view.
+
+    Args:
+        events: Ranked events to include
+        output_dir: Directory for brief.md, brief.html and brief.json
+        generated_at: Brief timestamp (default: now)
+        delta: Changes since the previous brief, written to brief.delta.json
+
+    Returns:
+        The view the outputs were rendered from
+    """
+    view = build_brief_view(events, generated_at=generated_at)
+    render_brief(events, output_dir / 'brief.md', view=view)
+    render_html_brief(events, output_dir / 'brief.html', view=view)
+    render_json_brief(events, output_dir / 'brief.json', view=view, delta=delta)
+    return view
 
 
 def archive_brief(date: Optional[datetime] = None) -> None:
     """
     Copy current brief to archive with date stamp.
 
+    The archive copy is gzip-compressed unless `compression.archive_format`
+    is set to `plain` in settings.yaml.
+
     Args:
         date: Date to use in archive filename (default: today)
     """
@@ -178,11 +157,6 @@ def archive_brief(date: Optional[datetime] = None) -> None:
         logger.warning("No brief to archive")
         return
 
-    # Ensure archive directory exists
-    ensure_directory(str(archive_path.parent))
-
-    # Copy file
-    import shutil
-    shutil.copy2(source_path, archive_path)
+    archive_path = archive_file(source_path, archive_path)
 
     logger.info(f"Archived brief to {archive_path}")
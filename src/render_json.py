@@ -0,0 +1,219 @@
+"""Machine-readable brief rendering (JSON, NDJSON, optional msgpack)."""
+
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+from pathlib import Path
+
+from .models import BriefDelta, Event
+from .utils import load_yaml, get_config_path, get_output_path, write_if_changed
+from .compress import load_compression_config, publish_output
+from .view import BriefView, EventView, DisplayItem, build_brief_view
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when fields are removed or change meaning; adding fields is compatible
+SCHEMA_VERSION = 1
+
+
+def load_json_config() -> Dict[str, Any]:
+    """Load machine-readable output configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    json_output = config.get('json_output') or {}
+
+    return {
+        'ndjson': json_output.get('ndjson', True),
+        'msgpack': json_output.get('msgpack', False),
+        'delta': json_output.get('delta', True),
+    }
+
+
+def item_to_dict(item: DisplayItem) -> Dict[str, Any]:
+    """Serialize a display item."""
+    return {
+        'id': item.item_id,
+        'source_id': item.source_id,
+        'source_name': item.source_name,
+        'tier': item.tier,
+        'title': item.title,
+        'link': item.link,
+        'published_at': item.published_at.isoformat(),
+        'duplicate_count': item.duplicate_count,
+    }
+
+
+def event_to_dict(event: EventView, rank: int) -> Dict[str, Any]:
+    """
+    Serialize an event.
+
+    Args:
+        event: Prepared event
+        rank: 1-based position in the brief
+
+    Returns:
+        JSON-serializable dict
+    """
+    return {
+        'rank': rank,
+        'id': event.event_id,
+        'title': event.title,
+        'score': round(event.score, 4),
+        'section': event.section,
+        'source_count': event.source_count,
+        'item_count': event.item_count,
+        'sources': list(event.source_ids),
+        'items': [item_to_dict(item) for item in event.items],
+    }
+
+
+def _header_dict(view: BriefView) -> Dict[str, Any]:
+    """Brief-level metadata shared by all machine-readable formats."""
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'generated_at': view.generated_at.isoformat(),
+        'stats': {
+            'events': view.stats.event_count,
+            'articles': view.stats.item_count,
+            'source_mentions': view.stats.source_mentions,
+        },
+    }
+
+
+def brief_to_dict(view: BriefView) -> Dict[str, Any]:
+    """Serialize a whole brief as a single document."""
+    doc = _header_dict(view)
+    doc['events'] = [
+        event_to_dict(event, rank)
+        for rank, event in enumerate(view.events, 1)
+    ]
+    return doc
+
+
+def delta_to_dict(delta: BriefDelta, view: BriefView) -> Dict[str, Any]:
+    """
+    Serialize the changes since the previous brief.
+
+    New events are serialized in full. Updated events carry only their
+    position and counts plus the items added since the previous brief;
+    dropped events only their id and title. Unchanged events are listed
+    by id.
+
+    Args:
+        delta: Changes computed from the stored events
+        view: Prepared view of the current brief
+
+    Returns:
+        JSON-serializable dict
+    """
+    ranks = {event.event_id: (rank, event) for rank, event in enumerate(view.events, 1)}
+    new_ids = set(delta.new_event_ids)
+
+    updated = []
+    for rank, event in ranks.values():
+        added = set(delta.updated_item_ids.get(event.event_id, ()))
+        if not added:
+            continue
+        updated.append({
+            'rank': rank,
+            'id': event.event_id,
+            'title': event.title,
+            'score': round(event.score, 4),
+            'source_count': event.source_count,
+            'item_count': event.item_count,
+            'new_item_count': len(added),
+            # Added copies collapsed into an older item only show in the count
+            'new_items': [item_to_dict(item) for item in event.items if item.item_id in added],
+        })
+
+    doc = _header_dict(view)
+    doc.update({
+        'since': delta.previous_ranked_at.isoformat() if delta.previous_ranked_at else None,
+        'new': [event_to_dict(event, rank) for rank, event in ranks.values()
+                if event.event_id in new_ids],
+        'updated': updated,
+        'dropped': [{'id': event_id, 'title': title} for event_id, title in delta.dropped],
+        'unchanged': [event_id for event_id in delta.unchanged_event_ids if event_id in ranks],
+    })
+    return doc
+
+
+def iter_ndjson(view: BriefView) -> Iterator[str]:
+    """
+    Stream a brief as NDJSON lines.
+
+    The first line is the brief header (`"type": "brief"`); each following
+    line is one event (`"type": "event"`), in rank order.
+    """
+    header = _header_dict(view)
+    header['type'] = 'brief'
+    yield _dumps(header)
+
+    for rank, event in enumerate(view.events, 1):
+        record = event_to_dict(event, rank)
+        record['type'] = 'event'
+        yield _dumps(record)
+
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON encoding."""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def render_json_brief(events: List[Event], output_path: Optional[Path] = None,
+                      view: Optional[BriefView] = None,
+                      delta: Optional[BriefDelta] = None) -> str:
+    """
+    Render the brief as JSON, plus NDJSON, msgpack and the delta if configured.
+
+    Files are written next to output_path with the same stem:
+    `brief.json`, `brief.ndjson`, `brief.msgpack` and `brief.delta.json`.
+    msgpack output requires the `msgpack` package; the delta needs the
+    stored events' changes.
+
+    Args:
+        events: List of Event objects to include (should already be ranked/filtered)
+        output_path: Path to write the JSON file (default: output/brief.json)
+        view: Prepared view of `events` (built if None)
+        delta: Changes since the previous brief (no delta file if None)
+
+    Returns:
+        JSON string
+    """
+    if output_path is None:
+        output_path = get_output_path('brief.json')
+
+    if view is None:
+        view = build_brief_view(events)
+
+    config = load_json_config()
+    compression = load_compression_config()
+    doc = brief_to_dict(view)
+
+    output = _dumps(doc)
+    if publish_output(output_path, output, compression):
+        logger.info(f"JSON brief written to {output_path}")
+
+    if config['ndjson']:
+        ndjson_path = output_path.with_suffix('.ndjson')
+        publish_output(ndjson_path, ''.join(line + '\n' for line in iter_ndjson(view)),
+                       compression)
+
+    if config['msgpack']:
+        # Imported here so renders without msgpack output never load it
+        try:
+            import msgpack
+        except ImportError:  # Optional dependency
+            logger.warning("msgpack output requested but the msgpack package is not installed")
+        else:
+            write_if_changed(output_path.with_suffix('.msgpack'), msgpack.packb(doc))
+
+    if config['delta'] and delta is not None:
+        delta_path = output_path.with_suffix('.delta.json')
+        publish_output(delta_path, _dumps(delta_to_dict(delta, view)), compression)
+        logger.info(
+            f"Delta written to {delta_path}: {len(delta.new_event_ids)} new, "
+            f"{len(delta.updated_item_ids)} updated, {len(delta.dropped)} dropped"
+        )
+
+    return output
@@ -0,0 +1,111 @@
+"""Adaptive per-source polling based on each source's publication rate."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Source
+from .store import NewsDatabase
+from .utils import load_yaml, get_config_path
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_polling_config() -> Dict[str, Any]:
+    """Load polling configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    polling = config.get('polling') or {}
+
+    return {
+        'enabled': polling.get('enabled', True),
+        'min_interval_minutes': polling.get('min_interval_minutes', 30),
+        'max_interval_minutes': polling.get('max_interval_minutes', 360),
+        'target_items_per_poll': polling.get('target_items_per_poll', 5),
+        'history_hours': polling.get('history_hours', 72),
+        'slack_minutes': polling.get('slack_minutes', 10),
+    }
+
+
+def poll_interval(items_per_hour: float, config: Dict[str, Any]) -> timedelta:
+    """
+    Time until a source should next be polled.
+
+    Aims for roughly `target_items_per_poll` new items per poll, clamped to
+    the configured bounds. Silent sources get the maximum interval.
+
+    Args:
+        items_per_hour: Observed publication rate
+        config: Polling configuration
+
+    Returns:
+        Interval until the next poll
+    """
+    min_minutes = config['min_interval_minutes']
+    max_minutes = config['max_interval_minutes']
+
+    if items_per_hour <= 0:
+        minutes = max_minutes
+    else:
+        minutes = 60.0 * config['target_items_per_poll'] / items_per_hour
+        minutes = min(max(minutes, min_minutes), max_minutes)
+
+    return timedelta(minutes=minutes)
+
+
+def select_due_sources(sources: List[Source], schedule: Dict[str, datetime],
+                       now: datetime, config: Dict[str, Any]
+                       ) -> Tuple[List[Source], List[Source]]:
+    """
+    Split sources into those due for polling and those that can wait.
+
+    Sources never polled before are always due. `slack_minutes` lets a
+    source that is due shortly after this run be polled now rather than
+    skipped until the next run.
+
+    Returns:
+        Tuple of (due_sources, skipped_sources)
+    """
+    horizon = now + timedelta(minutes=config['slack_minutes'])
+    due, skipped = [], []
+
+    for source in sources:
+        next_poll = schedule.get(source.id)
+        if next_poll is None or next_poll <= horizon:
+            due.append(source)
+        else:
+            skipped.append(source)
+
+    return due, skipped
+
+
+def plan_next_polls(db: NewsDatabase, polled: List[Source],
+                    now: Optional[datetime] = None,
+                    config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Learn each polled source's publication rate and persist its next poll.
+
+    Rates come from items stored over the last `history_hours`, so this
+    should run after the fetched items have been stored.
+
+    Args:
+        db: Connected database
+        polled: Sources fetched in this run
+        now: Time of this run (default: current UTC time)
+        config: Polling configuration (loaded if None)
+    """
+    if config is None:
+        config = load_polling_config()
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    history_hours = config['history_hours']
+    counts = db.get_source_item_counts(now - timedelta(hours=history_hours))
+
+    for source in polled:
+        items_per_hour = counts.get(source.id, 0) / history_hours
+        next_poll = now + poll_interval(items_per_hour, config)
+        db.update_poll_schedule(source.id, now, next_poll, items_per_hour)
+        logger.debug(
+            f"  {source.id}: {items_per_hour:.2f} items/h, next poll {next_poll:%Y-%m-%d %H:%M}"
+        )
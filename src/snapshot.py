@@ -0,0 +1,233 @@
+"""Raw feed snapshots: content-addressed storage of fetched feed bodies.
+
+Layout under the snapshot root (default: data/snapshots):
+
+    objects/<sha256[:2]>/<sha256>.gz    gzipped feed bodies, shared by runs
+    <run_id>/manifest.json              one run's fetch metadata
+
+A run directory can be replayed (`python -m src.main --replay <run dir>`)
+to re-run the whole pipeline without touching the network.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .models import Source
+from .utils import load_yaml, get_config_path, get_data_path
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+OBJECTS_DIR = 'objects'
+
+
+def load_snapshot_config() -> Dict[str, Any]:
+    """Load snapshot configuration from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+    snapshots = config.get('snapshots') or {}
+
+    return {
+        'enabled': snapshots.get('enabled', True),
+        'keep_days': snapshots.get('keep_days', 14),
+    }
+
+
+def _utcnow() -> datetime:
+    """Current time as naive UTC."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class SnapshotWriter:
+    """Records the raw feed bodies and fetch metadata of one run."""
+
+    def __init__(self, root: Optional[Path] = None, started_at: Optional[datetime] = None):
+        """Start a new run under `root` (default: data/snapshots)."""
+        if root is None:
+            root = get_data_path('snapshots')
+        if started_at is None:
+            started_at = _utcnow()
+
+        self.root = Path(root)
+        self.started_at = started_at
+        # Microseconds keep runs started in the same second apart; finish()
+        # still refuses to reuse a directory if two ids do collide
+        self.run_id = started_at.strftime('%Y%m%dT%H%M%S_%f')
+        self.run_dir = self.root / self.run_id
+        self.feeds: List[Dict[str, Any]] = []
+
+    def _store_object(self, body: bytes) -> Dict[str, Any]:
+        """Store a body by content hash (once) and describe it."""
+        digest = hashlib.sha256(body).hexdigest()
+        relative = Path(OBJECTS_DIR) / digest[:2] / f'{digest}.gz'
+        path = self.root / relative
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_bytes(gzip.compress(body, mtime=0))
+            tmp_path.replace(path)
+
+        return {'sha256': digest, 'bytes': len(body), 'object': relative.as_posix()}
+
+    def _source_record(self, source: Source, fetched_at: datetime,
+                       elapsed_ms: float) -> Dict[str, Any]:
+        """Metadata common to successful and failed fetches."""
+        return {
+            'source_id': source.id,
+            'name': source.name,
+            'url': source.rss_url,
+            'tier': source.tier,
+            'region': source.region,
+            'fetched_at': fetched_at.isoformat(),
+            'elapsed_ms': round(elapsed_ms, 1),
+        }
+
+    def record(self, source: Source, body: bytes, fetched_at: datetime,
+               elapsed_ms: float) -> None:
+        """Record a successful fetch."""
+        entry = self._source_record(source, fetched_at, elapsed_ms)
+        entry['status'] = 'ok'
+        entry.update(self._store_object(body))
+        self.feeds.append(entry)
+
+    def record_error(self, source: Source, error: Exception, fetched_at: datetime,
+                     elapsed_ms: float) -> None:
+        """Record a failed fetch."""
+        entry = self._source_record(source, fetched_at, elapsed_ms)
+        entry['status'] = 'error'
+        entry['error'] = f'{type(error).__name__}: {error}'
+        self.feeds.append(entry)
+
+    def _claim_run_dir(self) -> None:
+        """Create a run directory no other run is using, adjusting run_id."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        base_id = self.run_id
+        attempt = 1
+        while True:
+            try:
+                self.run_dir.mkdir()
+                return
+            except FileExistsError:
+                attempt += 1
+                self.run_id = f'{base_id}-{attempt}'
+                self.run_dir = self.root / self.run_id
+
+    def finish(self) -> Path:
+        """
+        Write the run manifest.
+
+        The run directory is created here and never shared: if another run
+        already claimed the id, a numeric suffix is added rather than
+        overwriting that run's manifest.
+
+        Returns:
+            Path of the run directory (the argument for --replay)
+        """
+        self._claim_run_dir()
+        manifest = {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(),
+            'feeds': self.feeds,
+        }
+
+        path = self.run_dir / MANIFEST
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        tmp_path.replace(path)
+
+        total = sum(f.get('bytes', 0) for f in self.feeds)
+        logger.info(f"Snapshot of {len(self.feeds)} feeds ({total:,} bytes) saved to {self.run_dir}")
+
+        return self.run_dir
+
+
+class SnapshotReader:
+    """Reads a recorded run for offline replay."""
+
+    def __init__(self, run_dir: Path):
+        """Load the manifest of a recorded run."""
+        self.run_dir = Path(run_dir)
+        manifest_path = self.run_dir / MANIFEST
+
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No snapshot manifest in {self.run_dir}")
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        self.run_id: str = manifest['run_id']
+        self.started_at = datetime.fromisoformat(manifest['started_at'])
+        self.feeds: List[Dict[str, Any]] = manifest['feeds']
+
+    @property
+    def root(self) -> Path:
+        """Snapshot root holding the shared object store."""
+        return self.run_dir.parent
+
+    def sources(self) -> List[Source]:
+        """Sources as configured when the snapshot was taken."""
+        return [
+            Source(
+                id=feed['source_id'],
+                name=feed['name'],
+                rss_url=feed['url'],
+                tier=feed['tier'],
+                region=feed['region']
+            )
+            for feed in self.feeds
+        ]
+
+    def body(self, feed: Dict[str, Any]) -> Optional[bytes]:
+        """Raw body of a recorded fetch (None if the fetch failed)."""
+        if feed['status'] != 'ok':
+            return None
+        return gzip.decompress((self.root / feed['object']).read_bytes())
+
+
+def prune_snapshots(root: Optional[Path] = None, keep_days: int = 14) -> int:
+    """
+    Delete runs older than keep_days and objects no remaining run uses.
+
+    Returns:
+        Number of runs deleted
+    """
+    if root is None:
+        root = get_data_path('snapshots')
+    root = Path(root)
+
+    if not root.exists():
+        return 0
+
+    cutoff = _utcnow() - timedelta(days=keep_days)
+    deleted = 0
+    referenced = set()
+
+    for run_dir in root.iterdir():
+        manifest_path = run_dir / MANIFEST
+        if run_dir.name == OBJECTS_DIR or not manifest_path.exists():
+            continue
+
+        reader = SnapshotReader(run_dir)
+        if reader.started_at < cutoff:
+            shutil.rmtree(run_dir)
+            deleted += 1
+        else:
+            referenced.update(f['object'] for f in reader.feeds if 'object' in f)
+
+    objects_dir = root / OBJECTS_DIR
+    if objects_dir.exists():
+        for path in objects_dir.glob('*/*.gz'):
+            if path.relative_to(root).as_posix() not in referenced:
+                path.unlink()
+
+    if deleted:
+        logger.info(f"Pruned {deleted} snapshot runs older than {keep_days} days")
+
+    return deleted
@@ -0,0 +1,23 @@
+"""Source configuration loading."""
+
+from typing import List
+
+from .models import Source
+from .utils import load_yaml, get_config_path
+
+
+def load_sources() -> List[Source]:
+    """Load source configurations from feeds.yaml."""
+    config = load_yaml(str(get_config_path('feeds.yaml')))
+
+    sources = []
+    for feed_config in config.get('feeds', []):
+        sources.append(Source(
+            id=feed_config['id'],
+            name=feed_config['name'],
+            rss_url=feed_config['rss_url'],
+            tier=feed_config['tier'],
+            region=feed_config['region']
+        ))
+
+    return sources
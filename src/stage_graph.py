@@ -0,0 +1,233 @@
+"""A small dependency graph of pipeline stages, run with overlap.
+
+Each stage declares the named values it reads (`inputs`) and produces
+(`outputs`). A stage starts as soon as all of its inputs exist, on a
+thread pool, so independent stages (fetching feeds while sources are
+stored, rendering Markdown, HTML and JSON) overlap. Stages that share an
+exclusive resource, such as the database connection, never run at the
+same time.
+
+Every stage is timed; the critical path is the chain of dependent stages
+with the largest total time, i.e. what bounds the wall time no matter
+how many workers run.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """One unit of pipeline work."""
+    name: str
+    func: Callable[..., Any]  # Called with inputs as keyword arguments
+    inputs: Tuple[str, ...] = ()
+    # With one output the return value is that output; with several, a tuple
+    outputs: Tuple[str, ...] = ()
+    resources: Tuple[str, ...] = ()  # Held exclusively while running
+
+
+@dataclass
+class StageTiming:
+    """When a stage ran, in seconds since the graph started."""
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def seconds(self) -> float:
+        """Time the stage took."""
+        return self.finished - self.started
+
+
+class StageGraph:
+    """Stages wired together by the values they produce and consume."""
+
+    def __init__(self, stages: List[Stage], provided: Iterable[str] = ()):
+        """
+        Build and validate a graph.
+
+        Args:
+            stages: Stages in a valid sequential order (used for
+                tie-breaking and by single-worker runs)
+            provided: Values passed to run() rather than produced by a stage
+
+        Raises:
+            ValueError: On duplicate stages or outputs, inputs nobody
+                produces, or dependency cycles
+        """
+        self.stages = stages
+        self.provided = set(provided)
+        self.timings: Dict[str, StageTiming] = {}
+        self.wall_seconds = 0.0
+
+        self.producers: Dict[str, str] = {}
+        names: Set[str] = set()
+        for stage in stages:
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            names.add(stage.name)
+            for output in stage.outputs:
+                if output in self.producers or output in self.provided:
+                    raise ValueError(f"Value {output!r} is produced twice")
+                self.producers[output] = stage.name
+
+        for stage in stages:
+            for value in stage.inputs:
+                if value not in self.producers and value not in self.provided:
+                    raise ValueError(f"Stage {stage.name!r} needs {value!r}, which nothing produces")
+
+        self._check_acyclic()
+
+    def dependencies(self, stage: Stage) -> List[str]:
+        """Names of the stages whose outputs a stage reads."""
+        return list(dict.fromkeys(
+            self.producers[value] for value in stage.inputs if value in self.producers
+        ))
+
+    def _check_acyclic(self) -> None:
+        """Raise ValueError if the stages depend on each other in a cycle."""
+        by_name = {stage.name: stage for stage in self.stages}
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Stage dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dependency in self.dependencies(by_name[name]):
+                visit(dependency, path + [name])
+            state[name] = 2
+
+        for stage in self.stages:
+            visit(stage.name, [])
+
+    def run(self, values: Optional[Dict[str, Any]] = None, max_workers: int = 4,
+            on_stage_done: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Run every stage, overlapping those that don't depend on each other.
+
+        With max_workers=1 the stages run one at a time in list order.
+        If a stage raises, no further stages start; running ones finish
+        and the first error is re-raised.
+
+        Args:
+            values: The provided values
+            max_workers: Stages allowed to run at once
+            on_stage_done: Called with each stage name as it finishes
+                (from the calling thread)
+
+        Returns:
+            Every provided and produced value
+        """
+        values = dict(values or {})
+        missing = self.provided - set(values)
+        if missing:
+            raise ValueError(f"Missing provided values: {sorted(missing)}")
+
+        pending = list(self.stages)
+        running: Dict[Future, Stage] = {}
+        held: Set[str] = set()
+        self.timings = {}
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+
+        def timed(stage: Stage) -> Tuple[Any, float, float]:
+            started = time.perf_counter() - start
+            result = stage.func(**{name: values[name] for name in stage.inputs})
+            return result, started, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage') as pool:
+            while pending or running:
+                if error is None:
+                    for stage in list(pending):
+                        if len(running) >= max_workers:
+                            break
+                        ready = all(name in values for name in stage.inputs)
+                        if ready and not held.intersection(stage.resources):
+                            pending.remove(stage)
+                            held.update(stage.resources)
+                            running[pool.submit(timed, stage)] = stage
+
+                if not running:
+                    if error is None and pending:
+                        # Unreachable for a validated graph
+                        raise RuntimeError(f"Stages cannot start: {[s.name for s in pending]}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    held.difference_update(stage.resources)
+                    try:
+                        result, started, finished = future.result()
+                    except BaseException as e:
+                        logger.error(f"Stage {stage.name} failed: {e}")
+                        if error is None:
+                            error = e
+                        continue
+
+                    self.timings[stage.name] = StageTiming(stage.name, started, finished)
+                    if len(stage.outputs) == 1:
+                        values[stage.outputs[0]] = result
+                    elif stage.outputs:
+                        values.update(zip(stage.outputs, result))
+                    if on_stage_done is not None:
+                        on_stage_done(stage.name)
+
+        self.wall_seconds = time.perf_counter() - start
+        if error is not None:
+            raise error
+        return values
+
+    def critical_path(self) -> List[str]:
+        """
+        The chain of dependent stages with the largest total run time.
+
+        Returns:
+            Stage names from first to last (empty before a run)
+        """
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for stage in self.stages:  # List order is a valid topological order
+            timing = self.timings.get(stage.name)
+            if timing is None:
+                continue
+            before = max(
+                (best[name] for name in self.dependencies(stage) if name in best),
+                key=lambda entry: entry[0],
+                default=(0.0, [])
+            )
+            best[stage.name] = (before[0] + timing.seconds, before[1] + [stage.name])
+
+        if not best:
+            return []
+        return max(best.values(), key=lambda entry: entry[0])[1]
+
+    def report_lines(self) -> List[str]:
+        """Per-stage timings, overlap achieved and the critical path."""
+        lines = []
+        for stage in self.stages:
+            timing = self.timings.get(stage.name)
+            if timing is None:
+                continue
+            lines.append(
+                f"{stage.name:<16} {timing.seconds * 1000:8.1f} ms "
+                f"(at {timing.started * 1000:.0f}-{timing.finished * 1000:.0f} ms)"
+            )
+
+        busy = sum(t.seconds for t in self.timings.values())
+        path = self.critical_path()
+        path_seconds = sum(self.timings[name].seconds for name in path)
+        lines.append(
+            f"wall {self.wall_seconds * 1000:.1f} ms for {busy * 1000:.1f} ms of stage work "
+            f"(overlap {busy / self.wall_seconds if self.wall_seconds else 0:.2f}x)"
+        )
+        lines.append(f"critical path {path_seconds * 1000:.1f} ms: {' -> '.join(path)}")
+        return lines
@@ -1,12 +1,68 @@
 """Database storage and retrieval for news items and events."""
 
+import logging
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from .models import Source, NewsItem, Event
-from .utils import get_data_path
+from .models import BriefDelta, Source, NewsItem, Event, SearchResult, FeedHealth
+from .dedup import item_simhash
+from .utils import get_data_path, make_guid_hash, make_url_hash, to_signed64, from_signed64
+
+
+logger = logging.getLogger(__name__)
+
+
+def _to_fts_query(query: str) -> str:
+    """
+    Convert free text into a safe FTS5 MATCH expression.
+
+    Each whitespace-separated term is quoted so punctuation in headlines
+    (colons, hyphens, apostrophes) is never parsed as FTS5 syntax. Terms
+    are implicitly ANDed; a trailing '*' on a term keeps prefix matching.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*').replace('"', '""')
+        if not term:
+            continue
+        terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return ' '.join(terms)
+
+
+# Column definitions of the items table (shared with the guid migration)
+ITEMS_COLUMNS = '''
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    summary TEXT,
+    fetched_at TEXT NOT NULL,
+    guid_hash INTEGER UNIQUE NOT NULL,
+    canonical_url_hash INTEGER,
+    simhash INTEGER,
+    FOREIGN KEY (source_id) REFERENCES sources(id)
+'''
+
+# Values bound per IN (...) query; old SQLite builds allow only 999 variables
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _legacy_guid_key(value: str) -> int:
+    """Integer key for a guid hash stored as hex text by older versions."""
+    try:
+        return to_signed64(int(value, 16))
+    except ValueError:
+        # Not one of our hex hashes (e.g. hand-edited rows); key the text itself
+        return make_guid_hash(value)
+
+
+def _member_ids(event: Event) -> List[int]:
+    """Ids of an event's items, followed by each item's collapsed duplicates."""
+    return [member.id for item in event.items for member in (item, *item.duplicates)]
 
 
 class NewsDatabase:
@@ -19,13 +75,15 @@ class NewsDatabase:
 
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
+        self.fts_enabled = False
 
     def connect(self) -> None:
         """Connect to the database and create tables if needed."""
         # Ensure data directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self.conn = sqlite3.connect(str(self.db_path))
+        # Pipeline stages may run on worker threads; they take turns on the connection
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
         self._create_tables()
 
@@ -51,19 +109,10 @@ class NewsDatabase:
         ''')
 
         # Items table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                link TEXT NOT NULL,
-                published_at TEXT NOT NULL,
-                summary TEXT,
-                fetched_at TEXT NOT NULL,
-                guid_hash TEXT UNIQUE NOT NULL,
-                FOREIGN KEY (source_id) REFERENCES sources(id)
-            )
-        ''')
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS items ({ITEMS_COLUMNS})')
+        self._add_missing_column('items', 'simhash', 'INTEGER')
+        self._add_missing_column('items', 'canonical_url_hash', 'INTEGER')
+        self._migrate_integer_guids()
 
         # Events table
         cursor.execute('''
@@ -71,21 +120,84 @@ class NewsDatabase:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 created_at TEXT NOT NULL,
                 score REAL DEFAULT 0.0,
-                canonical_title TEXT
+                canonical_title TEXT,
+                signature INTEGER,
+                ranked_at TEXT,
+                previous_ranked_at TEXT
             )
         ''')
+        self._add_missing_column('events', 'signature', 'INTEGER')
+        self._add_missing_column('events', 'ranked_at', 'TEXT')
+        self._add_missing_column('events', 'previous_ranked_at', 'TEXT')
 
         # Event-Item junction table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS event_items (
                 event_id INTEGER NOT NULL,
                 item_id INTEGER NOT NULL,
+                added_at TEXT,
                 PRIMARY KEY (event_id, item_id),
                 FOREIGN KEY (event_id) REFERENCES events(id),
                 FOREIGN KEY (item_id) REFERENCES items(id)
             )
         ''')
 
+        self._add_missing_column('event_items', 'added_at', 'TEXT')
+
+        # One row per ranking run, even a run that ranked no events, so the
+        # latest brief is known when it is empty
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ranking_runs (
+                ranked_at TEXT PRIMARY KEY
+            )
+        ''')
+
+        # Every cluster of the latest clustering run (not just the top
+        # events), so the brief can be re-ranked without re-clustering
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS clusters (
+                id INTEGER PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                canonical_title TEXT
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cluster_items (
+                cluster_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                item_id INTEGER NOT NULL,
+                PRIMARY KEY (cluster_id, position),
+                FOREIGN KEY (cluster_id) REFERENCES clusters(id),
+                FOREIGN KEY (item_id) REFERENCES items(id)
+            )
+        ''')
+
+        # Per-source polling schedule
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS source_schedule (
+                source_id TEXT PRIMARY KEY,
+                last_polled_at TEXT NOT NULL,
+                next_poll_at TEXT NOT NULL,
+                items_per_hour REAL NOT NULL DEFAULT 0.0,
+                FOREIGN KEY (source_id) REFERENCES sources(id)
+            )
+        ''')
+
+        # Per-source fetch health (circuit breaker state)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_health (
+                source_id TEXT PRIMARY KEY,
+                consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                last_success_at TEXT,
+                last_failure_at TEXT,
+                last_error TEXT,
+                avg_latency_ms REAL,
+                next_probe_at TEXT,
+                FOREIGN KEY (source_id) REFERENCES sources(id)
+            )
+        ''')
+
         # Create indices for common queries
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_items_published
@@ -97,13 +209,195 @@ class NewsDatabase:
             ON items(source_id)
         ''')
 
+        # Not unique: rows stored before canonicalization may share one
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_items_canonical_url
+            ON items(canonical_url_hash)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_signature
+            ON events(signature)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_ranked
+            ON events(ranked_at)
+        ''')
+
+        # Finds the stored events an item already belongs to
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_items_guid
-            ON items(guid_hash)
+            CREATE INDEX IF NOT EXISTS idx_event_items_item
+            ON event_items(item_id)
         ''')
 
         self.conn.commit()
 
+        self._backfill_event_identity()
+        self._backfill_ranking_runs()
+
+        self._backfill_simhashes()
+        self._backfill_url_hashes()
+        self._create_search_index()
+
+    def _add_missing_column(self, table: str, column: str, definition: str) -> bool:
+        """
+        Add a column to a table created by an older version.
+
+        Returns:
+            True if the column was added
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f'PRAGMA table_info({table})')
+        if any(row['name'] == column for row in cursor.fetchall()):
+            return False
+
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        logger.info(f"Migrated database: added {table}.{column}")
+        return True
+
+    def _migrate_integer_guids(self) -> None:
+        """
+        Rebuild an items table that still stores guid hashes as hex text.
+
+        SQLite cannot change a column's type in place, so the rows are
+        copied into a table with the current schema, keeping their ids
+        (events, clusters and the search index refer to them). Old hex
+        hashes are the first 64 bits of a sha256 and become the same bits
+        as an integer; they keep stored rows unique but won't match the
+        new blake2b keys, so re-fetched entries are caught by their
+        canonical URL hash, which is recomputed from the link here.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('PRAGMA table_info(items)')
+        types = {row['name']: row['type'].upper() for row in cursor.fetchall()}
+        if types.get('guid_hash') == 'INTEGER':
+            return
+
+        self.conn.create_function('legacy_guid_key', 1, _legacy_guid_key, deterministic=True)
+        self.conn.create_function('url_hash', 1, make_url_hash, deterministic=True)
+
+        cursor.execute('DROP TABLE IF EXISTS items_migrating')
+        cursor.execute(f'CREATE TABLE items_migrating ({ITEMS_COLUMNS})')
+        cursor.execute('''
+            INSERT INTO items_migrating
+            (id, source_id, title, link, published_at, summary, fetched_at, guid_hash,
+             canonical_url_hash, simhash)
+            SELECT id, source_id, title, link, published_at, summary, fetched_at,
+                   legacy_guid_key(guid_hash), url_hash(link), simhash
+            FROM items
+        ''')
+        migrated = cursor.rowcount
+        cursor.execute('DROP TABLE items')
+        cursor.execute('ALTER TABLE items_migrating RENAME TO items')
+        self.conn.commit()
+
+        # Reclaim the space of the old text keys and their second index
+        cursor.execute('VACUUM')
+        logger.info(f"Migrated database: {migrated} items now keyed by 64-bit integer guids")
+
+    def _backfill_simhashes(self) -> None:
+        """Fingerprint items stored before fingerprints were recorded."""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT id, title, summary FROM items WHERE simhash IS NULL')
+        rows = cursor.fetchall()
+        if not rows:
+            return
+
+        cursor.executemany('UPDATE items SET simhash = ? WHERE id = ?', [
+            (to_signed64(item_simhash(row['title'], row['summary'])), row['id'])
+            for row in rows
+        ])
+        self.conn.commit()
+        logger.info(f"Fingerprinted {len(rows)} existing items")
+
+    def _backfill_event_identity(self) -> None:
+        """Give events stored before upserts a signature and ranking time."""
+        cursor = self.conn.cursor()
+        cursor.execute('UPDATE events SET ranked_at = created_at WHERE ranked_at IS NULL')
+        cursor.execute('''
+            UPDATE events SET signature = (
+                SELECT i.guid_hash FROM event_items ei
+                JOIN items i ON i.id = ei.item_id
+                WHERE ei.event_id = events.id
+                ORDER BY i.published_at, i.guid_hash
+                LIMIT 1
+            )
+            WHERE signature IS NULL
+        ''')
+        self.conn.commit()
+
+    def _backfill_ranking_runs(self) -> None:
+        """Record the ranking runs of events stored before runs were tracked."""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT 1 FROM ranking_runs LIMIT 1')
+        if cursor.fetchone():
+            return
+        cursor.execute('''
+            INSERT OR IGNORE INTO ranking_runs (ranked_at)
+            SELECT DISTINCT ranked_at FROM events WHERE ranked_at IS NOT NULL
+        ''')
+        self.conn.commit()
+
+    def _record_ranking_run(self, ranked_at: datetime) -> None:
+        """Record a ranking run (committed by the caller)."""
+        self.conn.execute(
+            'INSERT OR IGNORE INTO ranking_runs (ranked_at) VALUES (?)', (ranked_at.isoformat(),)
+        )
+
+    def _backfill_url_hashes(self) -> None:
+        """Hash the canonical links of items stored before they were recorded."""
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT id, link FROM items WHERE canonical_url_hash IS NULL')
+        rows = cursor.fetchall()
+        if not rows:
+            return
+
+        cursor.executemany('UPDATE items SET canonical_url_hash = ? WHERE id = ?', [
+            (make_url_hash(row['link']), row['id']) for row in rows
+        ])
+        self.conn.commit()
+        logger.info(f"Hashed canonical URLs of {len(rows)} existing items")
+
+    def _create_search_index(self) -> None:
+        """
+        Create the FTS5 full-text index over item titles and summaries.
+
+        The index is an external-content table backed by `items`, so text is
+        not stored twice. It is populated from existing rows the first time
+        it is created and kept in sync by insert_item afterwards.
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name = 'items_fts'
+        ''')
+        exists = cursor.fetchone() is not None
+
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                    title,
+                    summary,
+                    content='items',
+                    content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5
+            logger.warning(f"Full-text search unavailable: {e}")
+            self.fts_enabled = False
+            return
+
+        if not exists:
+            # Backfill index from items stored before the index existed
+            cursor.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+        self.conn.commit()
+        self.fts_enabled = True
+
     def upsert_source(self, source: Source) -> None:
         """Insert or update a source."""
         cursor = self.conn.cursor()
@@ -138,10 +432,16 @@ class NewsDatabase:
         cursor = self.conn.cursor()
 
         try:
+            if item.simhash is None:
+                item.simhash = item_simhash(item.title, item.summary)
+            if item.canonical_url_hash is None:
+                item.canonical_url_hash = make_url_hash(item.link)
+
             cursor.execute('''
                 INSERT INTO items
-                (source_id, title, link, published_at, summary, fetched_at, guid_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (source_id, title, link, published_at, summary, fetched_at, guid_hash,
+                 canonical_url_hash, simhash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 item.source_id,
                 item.title,
@@ -149,21 +449,149 @@ class NewsDatabase:
                 item.published_at.isoformat(),
                 item.summary,
                 item.fetched_at.isoformat(),
-                item.guid_hash
+                item.guid_hash,
+                item.canonical_url_hash,
+                to_signed64(item.simhash)
             ))
+            item_id = cursor.lastrowid
+
+            if self.fts_enabled:
+                cursor.execute('''
+                    INSERT INTO items_fts (rowid, title, summary)
+                    VALUES (?, ?, ?)
+                ''', (item_id, item.title, item.summary))
+
             self.conn.commit()
-            return cursor.lastrowid
+            return item_id
 
         except sqlite3.IntegrityError:
             # Duplicate guid_hash
             return None
 
-    def get_recent_items(self, hours: int = 24) -> List[NewsItem]:
+    def _existing_values(self, column: str, values: Iterable[int]) -> Set[int]:
+        """Which of the given values already appear in an indexed items column."""
+        values = list(set(values))
+        found: Set[int] = set()
+        cursor = self.conn.cursor()
+
+        for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+            chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(
+                f'SELECT DISTINCT {column} FROM items WHERE {column} IN ({placeholders})',
+                chunk
+            )
+            found.update(row[0] for row in cursor.fetchall())
+
+        return found
+
+    def existing_guid_hashes(self, guid_hashes: Iterable[int]) -> Set[int]:
+        """Which of the given GUID hashes are already stored."""
+        return self._existing_values('guid_hash', guid_hashes)
+
+    def existing_url_hashes(self, url_hashes: Iterable[int]) -> Set[int]:
+        """Which of the given canonical URL hashes are already stored."""
+        return self._existing_values('canonical_url_hash', url_hashes)
+
+    @staticmethod
+    def _row_to_item(row: sqlite3.Row) -> NewsItem:
+        """Build a NewsItem from an `items` row."""
+        return NewsItem(
+            id=row['id'],
+            source_id=row['source_id'],
+            title=row['title'],
+            link=row['link'],
+            published_at=datetime.fromisoformat(row['published_at']),
+            summary=row['summary'],
+            fetched_at=datetime.fromisoformat(row['fetched_at']),
+            guid_hash=row['guid_hash'],
+            canonical_url_hash=row['canonical_url_hash'],
+            simhash=from_signed64(row['simhash']) if row['simhash'] is not None else None
+        )
+
+    def search_items(self, query: str, limit: int = 20,
+                     hours: Optional[int] = None,
+                     since: Optional[datetime] = None,
+                     until: Optional[datetime] = None,
+                     source_id: Optional[str] = None) -> List[SearchResult]:
+        """
+        Full-text search over stored item titles and summaries.
+
+        Results are ranked by BM25 with title matches weighted above summary
+        matches, so the best hits come first.
+
+        Args:
+            query: Free-text search terms (all terms must match)
+            limit: Maximum number of results to return
+            hours: Only include items published within the last N hours
+            since: Only include items published at or after this time
+                (not together with `hours`)
+            until: Only include items published before this time
+            source_id: Only include items from this source
+
+        Returns:
+            List of SearchResult objects, best match first
+
+        Raises:
+            ValueError: If both `hours` and `since` are given
+        """
+        if hours is not None and since is not None:
+            raise ValueError("Pass either hours or since, not both")
+        if not self.fts_enabled:
+            raise RuntimeError("Full-text search requires SQLite with FTS5")
+
+        match = _to_fts_query(query)
+        if not match:
+            return []
+
+        if hours is not None:
+            from datetime import timedelta
+            # Use replace to make timezone-naive for database comparison
+            since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+
+        sql = '''
+            SELECT i.*,
+                   bm25(items_fts, 10.0, 1.0) AS rank,
+                   snippet(items_fts, -1, '[', ']', '…', 12) AS snippet
+            FROM items_fts
+            JOIN items i ON i.id = items_fts.rowid
+            WHERE items_fts MATCH ?
+        '''
+        params: List[Any] = [match]
+
+        if since is not None:
+            sql += ' AND i.published_at >= ?'
+            params.append(since.isoformat())
+        if until is not None:
+            sql += ' AND i.published_at < ?'
+            params.append(until.isoformat())
+        if source_id is not None:
+            sql += ' AND i.source_id = ?'
+            params.append(source_id)
+
+        sql += ' ORDER BY rank LIMIT ?'
+        params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+
+        return [
+            SearchResult(
+                item=self._row_to_item(row),
+                rank=row['rank'],
+                snippet=row['snippet'] or ''
+            )
+            for row in cursor.fetchall()
+        ]
+
+    def get_recent_items(self, hours: int = 24,
+                         now: Optional[datetime] = None) -> List[NewsItem]:
         """
         Retrieve items published within the last N hours.
 
         Args:
             hours: Number of hours to look back
+            now: End of the window (default: current UTC time)
 
         Returns:
             List of NewsItem objects
@@ -173,7 +601,9 @@ class NewsDatabase:
         # Calculate cutoff time
         from datetime import timedelta
         # Use replace to make timezone-naive for database comparison
-        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+        if now is None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = now - timedelta(hours=hours)
 
         cursor.execute('''
             SELECT * FROM items
@@ -183,46 +613,153 @@ class NewsDatabase:
 
         items = []
         for row in cursor.fetchall():
-            items.append(NewsItem(
-                id=row['id'],
-                source_id=row['source_id'],
-                title=row['title'],
-                link=row['link'],
-                published_at=row['published_at'],
-                summary=row['summary'],
-                fetched_at=row['fetched_at'],
-                guid_hash=row['guid_hash']
-            ))
+            items.append(self._row_to_item(row))
 
         return items
 
     def create_event(self, item_ids: List[int], score: float = 0.0,
-                    canonical_title: str = "") -> int:
+                    canonical_title: str = "",
+                    created_at: Optional[datetime] = None,
+                    signature: Optional[int] = None) -> int:
         """
         Create a new event and associate items with it.
 
+        The event counts as ranked at `created_at`; events ranked by one
+        run share that time, which is how get_latest_events finds the
+        last brief.
+
         Returns the event ID.
         """
         cursor = self.conn.cursor()
 
+        if created_at is None:
+            created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
         # Create event
         cursor.execute('''
-            INSERT INTO events (created_at, score, canonical_title)
-            VALUES (?, ?, ?)
-        ''', (datetime.now(timezone.utc).replace(tzinfo=None).isoformat(), score, canonical_title))
+            INSERT INTO events (created_at, score, canonical_title, signature, ranked_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (created_at.isoformat(), score, canonical_title, signature, created_at.isoformat()))
 
         event_id = cursor.lastrowid
+        self._record_ranking_run(created_at)
 
         # Associate items
         for item_id in item_ids:
             cursor.execute('''
-                INSERT INTO event_items (event_id, item_id)
-                VALUES (?, ?)
-            ''', (event_id, item_id))
+                INSERT INTO event_items (event_id, item_id, added_at)
+                VALUES (?, ?, ?)
+            ''', (event_id, item_id, created_at.isoformat()))
 
         self.conn.commit()
         return event_id
 
+    def _find_continued_event(self, signature: Optional[int], item_ids: List[int],
+                              claimed: Set[int]) -> Optional[int]:
+        """
+        Find the stored event a freshly ranked event continues.
+
+        Matches on signature first, then (once the story's first item has
+        aged out) on the stored event sharing the most member items.
+        Events already matched in this run are skipped.
+        """
+        cursor = self.conn.cursor()
+        # Event ids are integers, so they can be inlined; -1 is never an id
+        # and stands in for an empty list, which SQLite rejects
+        excluded = ', '.join(str(event_id) for event_id in claimed) or '-1'
+
+        if signature is not None:
+            cursor.execute(f'''
+                SELECT id FROM events
+                WHERE signature = ? AND id NOT IN ({excluded})
+                ORDER BY ranked_at DESC, id DESC
+                LIMIT 1
+            ''', (signature,))
+            row = cursor.fetchone()
+            if row:
+                return row['id']
+
+        best: Optional[Tuple[int, int]] = None  # (shared items, event id)
+        for start in range(0, len(item_ids), LOOKUP_CHUNK_SIZE):
+            chunk = item_ids[start:start + LOOKUP_CHUNK_SIZE]
+            cursor.execute(f'''
+                SELECT event_id, COUNT(*) AS shared FROM event_items
+                WHERE item_id IN ({', '.join('?' * len(chunk))})
+                  AND event_id NOT IN ({excluded})
+                GROUP BY event_id
+            ''', chunk)
+            for row in cursor.fetchall():
+                candidate = (row['shared'], row['event_id'])
+                if best is None or candidate > best:
+                    best = candidate
+
+        return best[1] if best else None
+
+    def upsert_events(self, events: List[Event], ranked_at: Optional[datetime] = None) -> int:
+        """
+        Store the ranked events of one brief, updating continuing stories in place.
+
+        An event that continues a stored one (same signature, or sharing
+        member items) keeps that row and id: its score, title and members
+        are replaced and it is marked as ranked now, remembering when it
+        was last ranked before. Members keep the time they joined. Other
+        events are inserted. Assigns `id` on every event. The run itself is
+        recorded even if `events` is empty, so an empty brief replaces the
+        previous one.
+
+        Args:
+            events: Events selected for the brief
+            ranked_at: Time of this ranking run (default: now)
+
+        Returns:
+            Number of newly inserted events
+        """
+        if ranked_at is None:
+            ranked_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        cursor = self.conn.cursor()
+        claimed: Set[int] = set()
+        inserted = 0
+        self._record_ranking_run(ranked_at)
+
+        for event in events:
+            item_ids = _member_ids(event)
+            signature = event.signature
+            event_id = self._find_continued_event(signature, item_ids, claimed)
+
+            if event_id is None:
+                cursor.execute('''
+                    INSERT INTO events (created_at, score, canonical_title, signature, ranked_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (ranked_at.isoformat(), event.score, event.canonical_title,
+                      signature, ranked_at.isoformat()))
+                event_id = cursor.lastrowid
+                inserted += 1
+            else:
+                cursor.execute('''
+                    UPDATE events
+                    SET score = ?, canonical_title = ?, signature = ?,
+                        previous_ranked_at = ranked_at, ranked_at = ?
+                    WHERE id = ?
+                ''', (event.score, event.canonical_title, signature,
+                      ranked_at.isoformat(), event_id))
+                cursor.execute('SELECT item_id FROM event_items WHERE event_id = ?', (event_id,))
+                removed = {row['item_id'] for row in cursor.fetchall()} - set(item_ids)
+                cursor.executemany(
+                    'DELETE FROM event_items WHERE event_id = ? AND item_id = ?',
+                    [(event_id, item_id) for item_id in removed]
+                )
+
+            cursor.executemany('''
+                INSERT OR IGNORE INTO event_items (event_id, item_id, added_at)
+                VALUES (?, ?, ?)
+            ''', [(event_id, item_id, ranked_at.isoformat()) for item_id in item_ids])
+            claimed.add(event_id)
+            event.id = event_id
+
+        self.conn.commit()
+        return inserted
+
     def get_event(self, event_id: int) -> Optional[Event]:
         """Retrieve an event with all its items."""
         cursor = self.conn.cursor()
@@ -243,21 +780,12 @@ class NewsDatabase:
 
         items = []
         for row in cursor.fetchall():
-            items.append(NewsItem(
-                id=row['id'],
-                source_id=row['source_id'],
-                title=row['title'],
-                link=row['link'],
-                published_at=row['published_at'],
-                summary=row['summary'],
-                fetched_at=row['fetched_at'],
-                guid_hash=row['guid_hash']
-            ))
+            items.append(self._row_to_item(row))
 
         return Event(
             id=event_row['id'],
             items=items,
-            created_at=event_row['created_at'],
+            created_at=datetime.fromisoformat(event_row['created_at']),
             score=event_row['score'],
             canonical_title=event_row['canonical_title']
         )
@@ -288,9 +816,174 @@ class NewsDatabase:
 
         return events
 
+    def get_latest_events(self) -> List[Event]:
+        """
+        Retrieve the events ranked by the most recent ranking run.
+
+        Loads every event and its items with two queries.
+
+        Returns:
+            List of Event objects ordered by score (highest first); empty
+            if the last run ranked no events
+        """
+        cursor = self.conn.cursor()
+        latest = 'SELECT MAX(ranked_at) FROM ranking_runs'
+
+        cursor.execute(f'''
+            SELECT * FROM events WHERE ranked_at = ({latest})
+            ORDER BY score DESC, id
+        ''')
+        event_rows = cursor.fetchall()
+
+        cursor.execute(f'''
+            SELECT ei.event_id, i.* FROM event_items ei
+            JOIN items i ON i.id = ei.item_id
+            JOIN events e ON e.id = ei.event_id
+            WHERE e.ranked_at = ({latest})
+            ORDER BY i.published_at DESC, i.id
+        ''')
+        items_by_event: Dict[int, List[NewsItem]] = {}
+        for row in cursor.fetchall():
+            items_by_event.setdefault(row['event_id'], []).append(self._row_to_item(row))
+
+        return [
+            Event(
+                id=row['id'],
+                items=items_by_event.get(row['id'], []),
+                created_at=datetime.fromisoformat(row['created_at']),
+                score=row['score'],
+                canonical_title=row['canonical_title']
+            )
+            for row in event_rows
+        ]
+
+    def get_brief_delta(self) -> Optional[BriefDelta]:
+        """
+        Compare the events of the last ranking run with the run before it.
+
+        Events of the previous run that were not ranked again still carry
+        its ranking time, which is how dropped events are found.
+
+        Returns:
+            BriefDelta, or None if no ranking run is recorded
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT MAX(ranked_at) FROM ranking_runs')
+        latest = cursor.fetchone()[0]
+        if latest is None:
+            return None
+
+        cursor.execute('SELECT MAX(ranked_at) FROM ranking_runs WHERE ranked_at < ?', (latest,))
+        previous = cursor.fetchone()[0]
+
+        delta = BriefDelta(
+            ranked_at=datetime.fromisoformat(latest),
+            previous_ranked_at=datetime.fromisoformat(previous) if previous else None
+        )
+
+        cursor.execute('''
+            SELECT id, previous_ranked_at FROM events
+            WHERE ranked_at = ?
+            ORDER BY score DESC, id
+        ''', (latest,))
+        continuing = []
+        for row in cursor.fetchall():
+            if previous is not None and row['previous_ranked_at'] == previous:
+                continuing.append(row['id'])
+            else:
+                delta.new_event_ids.append(row['id'])
+
+        cursor.execute('''
+            SELECT ei.event_id, ei.item_id FROM event_items ei
+            JOIN events e ON e.id = ei.event_id
+            WHERE e.ranked_at = ? AND ei.added_at = ?
+            ORDER BY ei.item_id
+        ''', (latest, latest))
+        added: Dict[int, List[int]] = {}
+        for row in cursor.fetchall():
+            added.setdefault(row['event_id'], []).append(row['item_id'])
+
+        for event_id in continuing:
+            if event_id in added:
+                delta.updated_item_ids[event_id] = added[event_id]
+            else:
+                delta.unchanged_event_ids.append(event_id)
+
+        if previous is not None:
+            cursor.execute('''
+                SELECT id, canonical_title FROM events
+                WHERE ranked_at = ?
+                ORDER BY score DESC, id
+            ''', (previous,))
+            delta.dropped = [(row['id'], row['canonical_title']) for row in cursor.fetchall()]
+
+        return delta
+
+    def save_clusters(self, events: List[Event], created_at: Optional[datetime] = None) -> None:
+        """
+        Replace the stored clusters with the result of a clustering run.
+
+        Args:
+            events: Every cluster (ranked or not), in clustering order
+            created_at: Time of the clustering run (default: now)
+        """
+        if created_at is None:
+            created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        cursor = self.conn.cursor()
+        cursor.execute('DELETE FROM cluster_items')
+        cursor.execute('DELETE FROM clusters')
+
+        cursor.executemany(
+            'INSERT INTO clusters (id, created_at, canonical_title) VALUES (?, ?, ?)',
+            [(cluster_id, created_at.isoformat(), event.canonical_title)
+             for cluster_id, event in enumerate(events)]
+        )
+        cursor.executemany(
+            'INSERT INTO cluster_items (cluster_id, position, item_id) VALUES (?, ?, ?)',
+            [(cluster_id, position, item_id)
+             for cluster_id, event in enumerate(events)
+             for position, item_id in enumerate(_member_ids(event))]
+        )
+
+        self.conn.commit()
+
+    def get_clusters(self) -> List[Event]:
+        """
+        Retrieve the clusters of the latest clustering run.
+
+        Returns:
+            Unscored Event objects in clustering order, items in their
+            original order (collapsed near-duplicates are plain members;
+            see dedup.collapse_near_duplicates)
+        """
+        cursor = self.conn.cursor()
+
+        cursor.execute('SELECT * FROM clusters ORDER BY id')
+        cluster_rows = cursor.fetchall()
+
+        cursor.execute('''
+            SELECT ci.cluster_id, i.* FROM cluster_items ci
+            JOIN items i ON i.id = ci.item_id
+            ORDER BY ci.cluster_id, ci.position
+        ''')
+        items_by_cluster: Dict[int, List[NewsItem]] = {}
+        for row in cursor.fetchall():
+            items_by_cluster.setdefault(row['cluster_id'], []).append(self._row_to_item(row))
+
+        return [
+            Event(
+                id=None,
+                items=items_by_cluster.get(row['id'], []),
+                created_at=datetime.fromisoformat(row['created_at']),
+                canonical_title=row['canonical_title']
+            )
+            for row in cluster_rows
+        ]
+
     def clear_old_events(self, keep_days: int = 7) -> None:
         """
-        Delete events older than specified days.
+        Delete events that have not been in a brief for the specified days.
 
         Args:
             keep_days: Number of days of events to keep
@@ -305,13 +998,135 @@ class NewsDatabase:
         cursor.execute('''
             DELETE FROM event_items
             WHERE event_id IN (
-                SELECT id FROM events WHERE created_at < ?
+                SELECT id FROM events WHERE ranked_at < ?
             )
         ''', (cutoff.isoformat(),))
 
         # Delete old events
         cursor.execute('''
-            DELETE FROM events WHERE created_at < ?
+            DELETE FROM events WHERE ranked_at < ?
+        ''', (cutoff.isoformat(),))
+
+        # Forget old runs, but keep the latest so it still defines the brief
+        cursor.execute('''
+            DELETE FROM ranking_runs
+            WHERE ranked_at < ? AND ranked_at < (SELECT MAX(ranked_at) FROM ranking_runs)
         ''', (cutoff.isoformat(),))
 
         self.conn.commit()
+
+    def get_source_item_counts(self, since: datetime) -> Dict[str, int]:
+        """
+        Count items published per source since a given time.
+
+        Args:
+            since: Start of the window (naive UTC)
+
+        Returns:
+            Map of source_id -> item count (sources with no items omitted)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT source_id, COUNT(*) AS n FROM items
+            WHERE published_at >= ?
+            GROUP BY source_id
+        ''', (since.isoformat(),))
+
+        return {row['source_id']: row['n'] for row in cursor.fetchall()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Summarize what the database holds.
+
+        Returns:
+            Dict with row counts (sources, items, events, failing_feeds)
+            and the oldest/newest item publication times
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM sources) AS sources,
+                (SELECT COUNT(*) FROM items) AS items,
+                (SELECT COUNT(*) FROM events) AS events,
+                (SELECT COUNT(*) FROM feed_health
+                 WHERE consecutive_failures > 0) AS failing_feeds,
+                (SELECT MIN(published_at) FROM items) AS oldest_item,
+                (SELECT MAX(published_at) FROM items) AS newest_item
+        ''')
+        row = cursor.fetchone()
+
+        return {key: row[key] for key in row.keys()}
+
+    def get_poll_schedule(self) -> Dict[str, datetime]:
+        """
+        Retrieve the next scheduled poll time of every source.
+
+        Returns:
+            Map of source_id -> next poll time
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT source_id, next_poll_at FROM source_schedule')
+
+        return {
+            row['source_id']: datetime.fromisoformat(row['next_poll_at'])
+            for row in cursor.fetchall()
+        }
+
+    def update_poll_schedule(self, source_id: str, polled_at: datetime,
+                             next_poll_at: datetime, items_per_hour: float) -> None:
+        """Record a poll and when the source is next due."""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO source_schedule
+            (source_id, last_polled_at, next_poll_at, items_per_hour)
+            VALUES (?, ?, ?, ?)
+        ''', (source_id, polled_at.isoformat(), next_poll_at.isoformat(), items_per_hour))
+        self.conn.commit()
+
+    def get_feed_health(self) -> Dict[str, FeedHealth]:
+        """
+        Retrieve the fetch health of every source seen so far.
+
+        Returns:
+            Map of source_id -> FeedHealth
+        """
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT * FROM feed_health')
+
+        return {
+            row['source_id']: FeedHealth(
+                source_id=row['source_id'],
+                consecutive_failures=row['consecutive_failures'],
+                last_success_at=parse(row['last_success_at']),
+                last_failure_at=parse(row['last_failure_at']),
+                last_error=row['last_error'],
+                avg_latency_ms=row['avg_latency_ms'],
+                next_probe_at=parse(row['next_probe_at'])
+            )
+            for row in cursor.fetchall()
+        }
+
+    def upsert_feed_health(self, health: FeedHealth) -> None:
+        """Insert or update the fetch health of a source."""
+        def fmt(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO feed_health
+            (source_id, consecutive_failures, last_success_at, last_failure_at,
+             last_error, avg_latency_ms, next_probe_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            health.source_id,
+            health.consecutive_failures,
+            fmt(health.last_success_at),
+            fmt(health.last_failure_at),
+            health.last_error,
+            health.avg_latency_ms,
+            fmt(health.next_probe_at)
+        ))
+        self.conn.commit()
@@ -1,11 +1,15 @@
 """Utility functions for the news brief system."""
 
 import hashlib
+import os
 import re
+import tempfile
 import string
+from array import array
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Set
-import yaml
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 
 # Common English stopwords for title similarity
@@ -22,13 +26,89 @@ def load_yaml(file_path: str) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {file_path}")
 
+    # Imported here so commands that never read config don't load PyYAML
+    import yaml
+
     with open(path, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
 
-def make_guid_hash(text: str) -> str:
-    """Create a deterministic hash for deduplication."""
-    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+def make_guid_hash(text: str) -> int:
+    """
+    Create a deterministic 64-bit key for deduplication.
+
+    Returned as a signed integer so it is stored inline as a SQLite
+    INTEGER rather than as hex text.
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS: Set[str] = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    'cmpid', 'cmp', 'ocid', 'smid', 'smtyp', 'taid', 'ref', 'ref_src',
+    'referrer', 'rss', 'outputtype', 'amp',
+}
+
+# Tracking parameter families matched by prefix (utm_source, at_medium, ...)
+TRACKING_PREFIXES = ('utm_', 'at_', 'itm_', 'pk_', 'mtm_')
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so copies of one article compare equal.
+
+    - http and https are treated alike, host is lowercased, `www.`,
+      `m.` and `amp.` host prefixes are dropped
+    - AMP paths (`/amp`, `/amp/...`, `.amp`, `.amp.html`) map to the article
+    - Tracking parameters and the fragment are removed; remaining query
+      parameters are sorted
+    - Trailing slashes are removed
+
+    Args:
+        url: Article link as found in the feed
+
+    Returns:
+        Canonical form (not meant to be fetched)
+    """
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or '').lower()
+    for prefix in ('www.', 'm.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    path = re.sub(r'/+', '/', parts.path)
+    path = re.sub(r'(/amp)+(?=/|$)', '', path)
+    path = re.sub(r'\.amp(?=\.html?$|$)', '', path)
+    path = path.rstrip('/')
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def make_url_hash(url: str) -> int:
+    """Hash of an article's canonical URL, for cross-feed deduplication."""
+    return make_guid_hash(canonicalize_url(url))
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    """Inverse of to_signed64."""
+    return value & 0xFFFFFFFFFFFFFFFF
 
 
 def preprocess_title(title: str) -> str:
@@ -77,6 +157,65 @@ def jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
+# Population count of an int (int.bit_count needs Python 3.10+)
+popcount: Callable[[int], int] = getattr(int, 'bit_count', lambda x: bin(x).count('1'))
+
+
+class TokenVocabulary:
+    """
+    Maps tokens to dense integer ids.
+
+    Token sets can then be held as sorted `array('I')` id lists, 4 bytes
+    per token, which are far more compact than sets of strings and
+    intersect without hashing strings again.
+    """
+
+    def __init__(self):
+        """Create an empty vocabulary."""
+        self.ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_token_sets(cls, token_sets: Iterable[Set[str]]) -> 'TokenVocabulary':
+        """
+        Build a vocabulary with ids ordered by document frequency.
+
+        The rarest token gets id 0 (ties broken alphabetically), so sorted
+        id lists list the most selective tokens first.
+        """
+        frequency = Counter(token for tokens in token_sets for token in tokens)
+        vocab = cls()
+        for token in sorted(frequency, key=lambda t: (frequency[t], t)):
+            vocab.ids[token] = len(vocab.ids)
+        return vocab
+
+    def __len__(self) -> int:
+        """Number of known tokens."""
+        return len(self.ids)
+
+    def token_ids(self, tokens: Set[str]) -> array:
+        """Sorted ids of a token set (unknown tokens are added)."""
+        ids = self.ids
+        for token in tokens:
+            if token not in ids:
+                ids[token] = len(ids)
+        return array('I', sorted(ids[token] for token in tokens))
+
+
+def ids_jaccard(id_set: AbstractSet[int], token_ids: Sequence[int]) -> float:
+    """
+    Jaccard similarity of a token id set and an id list without repeats.
+
+    The id set is built once per item being matched, so each comparison
+    with a stored id list is a single C-level intersection. Gives exactly
+    the same value as jaccard_similarity on the equivalent token sets.
+    """
+    if not id_set or not token_ids:
+        return 0.0
+
+    intersection = len(id_set.intersection(token_ids))
+    return intersection / (len(id_set) + len(token_ids) - intersection)
+
+
 def title_similarity(title1: str, title2: str) -> float:
     """
     Calculate similarity between two news titles using Jaccard similarity.
@@ -94,6 +233,61 @@ def ensure_directory(path: str) -> None:
     Path(path).mkdir(parents=True, exist_ok=True)
 
 
+# Process umask, read once at import: os.umask can only be read by setting
+# it, which would race with files created on other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_if_changed(path: Path, content: Union[str, bytes],
+                     ignore: Optional[Pattern[str]] = None) -> bool:
+    """
+    Atomically write to a file unless it already has that content.
+
+    Text is written as UTF-8; bytes are written as-is. Text matching
+    `ignore` (such as a generation timestamp) is left out of the
+    comparison, so a file differing only there keeps its old text.
+
+    The new content is written to a temporary file in the same directory
+    and renamed over the target, so readers never see a partial file.
+    The file keeps the target's permissions, or gets the usual umask-based
+    ones if it is new (mkstemp alone would leave it readable by the owner
+    only).
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    path = Path(path)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    mode = 0o666 & ~_UMASK
+    if path.exists():
+        mode = path.stat().st_mode & 0o7777
+        existing = path.read_bytes()
+        if ignore is not None and isinstance(content, str):
+            old_text = existing.decode('utf-8', errors='replace')
+            unchanged = ignore.sub('', old_text) == ignore.sub('', content)
+        else:
+            unchanged = hashlib.sha256(existing).digest() == hashlib.sha256(data).digest()
+        if unchanged:
+            return False
+
+    ensure_directory(str(path.parent))
+
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return True
+
+
 def get_project_root() -> Path:
     """Get the project root directory."""
     # Assumes this file is in src/
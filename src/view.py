@@ -0,0 +1,207 @@
+"""Render preparation: an immutable view model shared by all output formats."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from .models import Event
+from .utils import load_yaml, get_config_path
+from .sources import load_sources
+from .cluster import categorize_events
+
+
+@dataclass(frozen=True)
+class DisplayItem:
+    """A single source link as shown under an event."""
+    source_id: str
+    source_name: str
+    tier: str
+    title: str
+    link: str
+    published_at: datetime
+    duplicate_count: int = 0  # Near-identical copies collapsed into this item
+    item_id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class EventView:
+    """An event prepared for display."""
+    event_id: Optional[int]
+    title: str
+    score: float
+    source_count: int
+    item_count: int
+    items: Tuple[DisplayItem, ...]  # All items, in display order
+    display_items: Tuple[DisplayItem, ...]
+    remaining_count: int
+    section: str = 'general'
+    source_ids: Tuple[str, ...] = ()  # Distinct sources in display order, with collapsed copies
+
+
+@dataclass(frozen=True)
+class BriefSection:
+    """A titled group of events (e.g. general vs financial news)."""
+    key: str
+    events: Tuple[EventView, ...]
+
+
+@dataclass(frozen=True)
+class BriefStats:
+    """Summary counts for the brief footer."""
+    event_count: int
+    item_count: int
+    source_mentions: int
+
+
+@dataclass(frozen=True)
+class BriefView:
+    """Everything a formatter needs to render one brief."""
+    generated_at: datetime
+    events: Tuple[EventView, ...]
+    sections: Tuple[BriefSection, ...]
+    stats: BriefStats
+
+    def section(self, key: str) -> BriefSection:
+        """Look up a section by key."""
+        for section in self.sections:
+            if section.key == key:
+                return section
+        raise KeyError(key)
+
+
+def load_view_config() -> Dict[str, Any]:
+    """Load everything render preparation needs from settings.yaml."""
+    config = load_yaml(str(get_config_path('settings.yaml')))
+
+    return {
+        'max_sources_per_event': config.get('max_sources_per_event', 5),
+        'financial_sources': set(config.get('financial_sources', [])),
+    }
+
+
+def _get_source_tier_priority(source_id: str) -> int:
+    """
+    Get sort priority for source tier (higher = better).
+
+    Wire services first, then news, then magazine.
+    """
+    if source_id.startswith('reuters') or source_id.startswith('ap'):
+        return 3
+    elif 'magazine' in source_id or 'economist' in source_id:
+        return 1
+    else:
+        return 2
+
+
+def build_event_view(event: Event, source_names: Dict[str, str],
+                     source_tiers: Dict[str, str], max_sources: int,
+                     section: str = 'general') -> EventView:
+    """
+    Prepare a single event for display.
+
+    Args:
+        event: Event to prepare
+        source_names: Map of source_id -> display name
+        source_tiers: Map of source_id -> tier
+        max_sources: Maximum number of source links to show
+        section: Key of the section the event belongs to
+
+    Returns:
+        EventView object
+    """
+    # Sort items by source tier (wire first) and then by published date
+    sorted_items = sorted(
+        event.items,
+        key=lambda x: (
+            _get_source_tier_priority(x.source_id),
+            x.published_at
+        ),
+        reverse=True
+    )
+
+    items = tuple(
+        DisplayItem(
+            source_id=item.source_id,
+            source_name=source_names.get(item.source_id, item.source_id),
+            tier=source_tiers.get(item.source_id, 'news'),
+            title=item.title,
+            link=item.link,
+            published_at=item.published_at,
+            duplicate_count=item.duplicate_count,
+            item_id=item.id
+        )
+        for item in sorted_items
+    )
+
+    # Limit sources displayed
+    display_items = items[:max_sources]
+
+    # Articles reported, counting collapsed near-duplicates
+    item_count = sum(1 + item.duplicate_count for item in event.items)
+    source_ids = tuple(dict.fromkeys(
+        member.source_id for item in sorted_items for member in (item, *item.duplicates)
+    ))
+
+    return EventView(
+        event_id=event.id,
+        title=event.canonical_title,
+        score=event.score,
+        source_count=event.source_count,
+        item_count=item_count,
+        items=items,
+        display_items=display_items,
+        remaining_count=item_count - len(display_items),
+        section=section,
+        source_ids=source_ids
+    )
+
+
+def build_brief_view(events: List[Event],
+                     generated_at: Optional[datetime] = None) -> BriefView:
+    """
+    Build the view model for a brief in a single pass.
+
+    Config and source metadata are loaded once, and every event's items are
+    sorted once, no matter how many formatters consume the result.
+
+    Args:
+        events: List of Event objects to include (should already be ranked/filtered)
+        generated_at: Generation timestamp (default: now)
+
+    Returns:
+        BriefView object
+    """
+    if generated_at is None:
+        generated_at = datetime.now()
+
+    config = load_view_config()
+    sources = load_sources()
+    source_names = {source.id: source.name for source in sources}
+    source_tiers = {source.id: source.tier for source in sources}
+
+    general_events, financial_events = categorize_events(
+        events, financial_sources=config['financial_sources']
+    )
+
+    views: Dict[int, EventView] = {}
+    for section, section_events in (('general', general_events),
+                                    ('financial', financial_events)):
+        for event in section_events:
+            views[id(event)] = build_event_view(
+                event, source_names, source_tiers,
+                config['max_sources_per_event'], section
+            )
+
+    return BriefView(
+        generated_at=generated_at,
+        events=tuple(views[id(e)] for e in events),
+        sections=(
+            BriefSection('general', tuple(views[id(e)] for e in general_events)),
+            BriefSection('financial', tuple(views[id(e)] for e in financial_events)),
+        ),
+        stats=BriefStats(
+            event_count=len(events),
+            item_count=sum(views[id(e)].item_count for e in events),
+            source_mentions=sum(e.source_count for e in events)
+        )
+    )
@@ -0,0 +1,164 @@
+"""Tests for article clustering."""
+
+import random
+import pytest
+from datetime import datetime, timedelta
+from src.models import NewsItem
+from src.cluster import cluster_items, compare_linkages, _greedy_cluster
+from src.utils import title_similarity
+
+
+CONFIG = {
+    'similarity_threshold': 0.35,
+    'financial_similarity_threshold': 0.25,
+    'min_sources_per_event': 2,
+    'financial_sources': {'fin1', 'fin2'},
+    'linkage': 'single',
+    'max_representatives': 5,
+    'centroid_min_share': 0.5,
+}
+
+STORIES = [
+    "earthquake strikes japan coast tsunami warning issued",
+    "central bank holds interest rates steady inflation cools",
+    "wildfire forces evacuations california thousands homes",
+    "election results delayed counting disputes swing state",
+    "oil prices jump after pipeline attack supply fears",
+]
+
+FILLER = ["officials", "say", "report", "update", "latest", "live", "new", "after", "amid", "week"]
+
+
+def make_items(n, seed=0):
+    """Create n items whose titles are noisy variants of a few stories."""
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 15, 12, 0)
+    sources = ['wire1', 'news1', 'news2', 'fin1', 'fin2']
+    items = []
+    for i in range(n):
+        words = rng.choice(STORIES).split()
+        title = rng.sample(words, rng.randint(3, len(words))) + rng.sample(FILLER, rng.randint(0, 3))
+        items.append(NewsItem(
+            i, rng.choice(sources), ' '.join(title).capitalize(), f"http://x/{i}",
+            now - timedelta(minutes=rng.randint(0, 24 * 60)), None, now, f"h{i}"
+        ))
+    return items
+
+
+def reference_clusters(items, config):
+    """The original max-over-all-members greedy clustering."""
+    clusters = []
+    for item in sorted(items, key=lambda x: x.published_at, reverse=True):
+        is_financial = item.source_id in config['financial_sources']
+        threshold = (config['financial_similarity_threshold'] if is_financial
+                     else config['similarity_threshold'])
+        best_idx, best_sim = None, 0.0
+        for idx, cluster in enumerate(clusters):
+            if is_financial != any(c.source_id in config['financial_sources'] for c in cluster):
+                continue
+            sim = max(title_similarity(item.title, c.title) for c in cluster)
+            if sim > best_sim:
+                best_idx, best_sim = idx, sim
+        if best_sim >= threshold and best_idx is not None:
+            clusters[best_idx].append(item)
+        else:
+            clusters.append([item])
+    return clusters
+
+
+class TestLinkage:
+    """Test the cluster linkage modes."""
+
+    def test_single_linkage_matches_reference(self):
+        """Test that single-link reproduces the original algorithm exactly."""
+        items = make_items(300)
+
+        clusters, _ = _greedy_cluster(items, CONFIG, 'single')
+
+        assert [[i.id for i in c] for c in clusters] == \
+            [[i.id for i in c] for c in reference_clusters(items, CONFIG)]
+
+    @pytest.mark.parametrize('seed', range(3))
+    @pytest.mark.parametrize('threshold', [0.2, 0.35, 0.8, 1.0])
+    def test_filtered_join_matches_reference(self, seed, threshold):
+        """Test that size/prefix filtering never changes the clusters."""
+        items = make_items(200, seed=seed)
+        config = dict(CONFIG, similarity_threshold=threshold,
+                      financial_similarity_threshold=threshold * 0.7)
+
+        clusters, _ = _greedy_cluster(items, config, 'single')
+
+        assert [[i.id for i in c] for c in clusters] == \
+            [[i.id for i in c] for c in reference_clusters(items, config)]
+
+    def test_filtered_join_skips_impossible_pairs(self):
+        """Test that pairs that cannot reach the threshold are never compared."""
+        items = make_items(300)
+
+        _, comparisons = _greedy_cluster(items, dict(CONFIG, similarity_threshold=0.8,
+                                                     financial_similarity_threshold=0.8),
+                                         'single')
+
+        assert comparisons < len(items) * (len(items) - 1) / 2 / 10
+
+    @pytest.mark.parametrize('linkage, per_cluster', [('representatives', 5), ('centroid', 1)])
+    def test_comparisons_bounded_per_cluster(self, linkage, per_cluster):
+        """Test that big clusters cost a bounded number of comparisons per item."""
+        now = datetime(2024, 1, 15, 12, 0)
+        items = [
+            NewsItem(i, 'wire1', "Earthquake strikes Japan coast", f"http://x/{i}",
+                     now - timedelta(minutes=i), None, now, f"h{i}")
+            for i in range(40)
+        ]
+
+        clusters, comparisons = _greedy_cluster(items, CONFIG, linkage)
+        single_clusters, single_comparisons = _greedy_cluster(items, CONFIG, 'single')
+
+        assert len(clusters) == len(single_clusters) == 1
+        assert comparisons <= per_cluster * (len(items) - 1)
+        assert single_comparisons == sum(range(len(items)))
+
+    @pytest.mark.parametrize('window', [1, 2])
+    def test_small_representative_window(self, window):
+        """Test that the smallest windows keep the seed and cluster without errors."""
+        now = datetime(2024, 1, 15, 12, 0)
+        items = [
+            NewsItem(i, 'wire1', "Earthquake strikes Japan coast", f"http://x/{i}",
+                     now - timedelta(minutes=i), None, now, f"h{i}")
+            for i in range(10)
+        ]
+
+        clusters, comparisons = _greedy_cluster(
+            items, dict(CONFIG, max_representatives=window), 'representatives'
+        )
+
+        assert len(clusters) == 1
+        assert comparisons <= window * (len(items) - 1)
+
+    def test_cluster_items_uses_configured_linkage(self):
+        """Test that cluster_items honours the linkage setting."""
+        items = make_items(100)
+
+        events = cluster_items(items, dict(CONFIG, linkage='centroid'))
+
+        assert events
+        assert all(e.source_count >= 2 for e in events)
+
+    def test_unknown_linkage_rejected(self):
+        """Test that a misspelled linkage fails loudly."""
+        with pytest.raises(ValueError):
+            cluster_items(make_items(3), dict(CONFIG, linkage='average'))
+
+
+class TestLinkageReport:
+    """Test the linkage quality report."""
+
+    def test_single_is_the_baseline(self):
+        """Test that every linkage is scored against single-link."""
+        results = {r['linkage']: r for r in compare_linkages(make_items(200), CONFIG)}
+
+        assert set(results) == {'single', 'representatives', 'centroid'}
+        baseline = results['single']
+        assert baseline['precision'] == baseline['recall'] == baseline['identical_clusters'] == 1.0
+        for r in results.values():
+            assert 0.0 <= r['f1'] <= 1.0
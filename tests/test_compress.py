@@ -0,0 +1,110 @@
+"""Tests for pre-compressed output."""
+
+import gzip
+import re
+import stat
+from datetime import datetime
+
+import pytest
+from src.compress import publish_output, archive_file, gzip_bytes
+from src.render import render_brief
+from src.render_html import render_html_brief
+from src.view import build_brief_view
+
+
+CONFIG = {
+    'enabled': True,
+    'gzip_level': 9,
+    'brotli_quality': 11,
+    'archive_format': 'gzip',
+}
+
+
+class TestPublishOutput:
+    """Test writing outputs with compressed variants."""
+
+    def test_writes_gzip_variant(self, tmp_path):
+        """Test that a .gz variant with the same content is written."""
+        path = tmp_path / 'brief.md'
+
+        assert publish_output(path, "# Brief\n", CONFIG) is True
+
+        assert gzip.decompress((tmp_path / 'brief.md.gz').read_bytes()) == b"# Brief\n"
+
+    def test_variant_restored_when_missing(self, tmp_path):
+        """Test that a missing variant is rebuilt even if content is unchanged."""
+        path = tmp_path / 'brief.md'
+        publish_output(path, "# Brief\n", CONFIG)
+        (tmp_path / 'brief.md.gz').unlink()
+
+        assert publish_output(path, "# Brief\n", CONFIG) is False
+        assert (tmp_path / 'brief.md.gz').exists()
+
+    def test_variants_share_the_output_permissions(self, tmp_path, monkeypatch):
+        """Test that variants go through the same write path as the output file."""
+        monkeypatch.setattr('src.utils._UMASK', 0o022)
+        path = tmp_path / 'brief.md'
+
+        publish_output(path, "# Brief\n", CONFIG)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+        assert stat.S_IMODE((tmp_path / 'brief.md.gz').stat().st_mode) == 0o644
+        assert not list(tmp_path.glob('.*'))
+
+    def test_disabled(self, tmp_path):
+        """Test that no variants are written when compression is disabled."""
+        path = tmp_path / 'brief.md'
+        publish_output(path, "# Brief\n", dict(CONFIG, enabled=False))
+
+        assert [p.name for p in tmp_path.iterdir()] == ['brief.md']
+
+    def test_ignored_text_is_not_a_change(self, tmp_path):
+        """Test that text matching `ignore` alone doesn't trigger a rewrite."""
+        path = tmp_path / 'brief.md'
+        stamp = re.compile(r'at \d+:\d+')
+        publish_output(path, "# Brief at 06:00\n", CONFIG, ignore=stamp)
+
+        assert publish_output(path, "# Brief at 07:00\n", CONFIG, ignore=stamp) is False
+        assert path.read_text() == "# Brief at 06:00\n"
+        assert gzip.decompress((tmp_path / 'brief.md.gz').read_bytes()) == b"# Brief at 06:00\n"
+        assert publish_output(path, "# News at 07:00\n", CONFIG, ignore=stamp) is True
+
+    @pytest.mark.parametrize('render, name', [(render_brief, 'brief.md'),
+                                              (render_html_brief, 'brief.html')])
+    def test_rerendered_brief_not_rewritten(self, tmp_path, render, name):
+        """Test that a brief differing only in its generation time is kept."""
+        path = tmp_path / name
+        render([], path, view=build_brief_view([], generated_at=datetime(2024, 1, 16, 6, 0)))
+        first = path.read_bytes()
+
+        render([], path, view=build_brief_view([], generated_at=datetime(2024, 1, 16, 7, 30)))
+
+        assert path.read_bytes() == first
+
+    def test_gzip_is_deterministic(self):
+        """Test that identical input gives identical compressed bytes."""
+        assert gzip_bytes(b"same") == gzip_bytes(b"same")
+
+
+class TestArchive:
+    """Test compressed archiving."""
+
+    def test_archive_gzip(self, tmp_path):
+        """Test that archives are gzipped by default."""
+        source = tmp_path / 'brief.md'
+        source.write_text("# Brief\n")
+
+        archived = archive_file(source, tmp_path / 'archive' / 'brief_2024-01-01.md', CONFIG)
+
+        assert archived.name == 'brief_2024-01-01.md.gz'
+        assert gzip.decompress(archived.read_bytes()) == b"# Brief\n"
+
+    def test_archive_plain(self, tmp_path):
+        """Test that plain archives are exact copies."""
+        source = tmp_path / 'brief.md'
+        source.write_text("# Brief\n")
+
+        archived = archive_file(source, tmp_path / 'archive' / 'brief_2024-01-01.md',
+                                dict(CONFIG, archive_format='plain'))
+
+        assert archived.read_text() == "# Brief\n"
@@ -0,0 +1,72 @@
+"""Tests for per-source date format learning."""
+
+import pytest
+from datetime import datetime
+from src.dates import DateFormatCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide an empty date format cache."""
+    return DateFormatCache(tmp_path / 'date_formats.json')
+
+
+class TestDateFormatCache:
+    """Test learning and reusing date formats."""
+
+    def test_learns_format_on_first_success(self, cache):
+        """Test that later entries from a source reuse the learned format."""
+        assert cache.parse('src', 'Mon, 15 Jan 2024 14:30:00 +0100') == datetime(2024, 1, 15, 13, 30)
+        assert cache.parse('src', 'Tue, 16 Jan 2024 08:00:00 +0100') == datetime(2024, 1, 16, 7, 0)
+
+        assert cache.stats['searched'] == 1
+        assert cache.stats['learned'] == 1
+        assert cache.stats['slow_path'] == 0
+
+    def test_formats_are_per_source(self, cache):
+        """Test that each source learns its own format."""
+        cache.parse('rss', 'Mon, 15 Jan 2024 14:30:00 GMT')
+        cache.parse('iso', '2024-01-15T14:30:00Z')
+
+        assert cache.formats['rss'] != cache.formats['iso']
+        assert cache.parse('iso', '2024-01-15T15:00:00+02:00') == datetime(2024, 1, 15, 13, 0)
+
+    def test_zone_names_keep_their_offset(self, cache):
+        """Test that named US zones are converted to UTC, not read as UTC."""
+        assert cache.parse('src', 'Mon, 15 Jan 2024 09:30:00 EST') == datetime(2024, 1, 15, 14, 30)
+        assert cache.parse('src', 'Mon, 15 Jan 2024 14:30:00 GMT') == datetime(2024, 1, 15, 14, 30)
+        assert cache.parse('src', 'Mon, 15 Jul 2024 07:30:00 PDT') == datetime(2024, 7, 15, 14, 30)
+
+        assert cache.stats['slow_path'] == 2
+        assert '%Z' not in cache.formats['src']
+
+    def test_zone_name_formats_not_loaded(self, tmp_path):
+        """Test that '%Z' formats learned by older versions are discarded."""
+        path = tmp_path / 'date_formats.json'
+        path.write_text('{"old": "%a, %d %b %Y %H:%M:%S %Z", "iso": "%Y-%m-%d %H:%M:%S"}')
+
+        cache = DateFormatCache(path)
+        cache.load()
+
+        assert cache.formats == {'iso': '%Y-%m-%d %H:%M:%S'}
+
+    def test_slow_path_counted(self, cache):
+        """Test that unusual strings use dateutil and are reported."""
+        assert cache.parse('src', 'January 15, 2024 2:30 PM') == datetime(2024, 1, 15, 14, 30)
+        assert cache.parse('src', 'not a date') is None
+
+        assert cache.stats['slow_path'] == 1
+        assert cache.stats['failed'] == 1
+        assert 'dateutil (50.0%)' in cache.summary()
+
+    def test_persists_between_runs(self, tmp_path):
+        """Test that learned formats survive a save/load cycle."""
+        first = DateFormatCache(tmp_path / 'date_formats.json')
+        first.parse('src', '2024-01-15 14:30:00')
+        first.save()
+
+        second = DateFormatCache(tmp_path / 'date_formats.json')
+        second.load()
+        second.parse('src', '2024-01-16 09:00:00')
+
+        assert second.stats['learned'] == 1
@@ -0,0 +1,124 @@
+"""Tests for SimHash near-duplicate collapse."""
+
+from datetime import datetime, timedelta
+from src.models import NewsItem, Event
+from src.dedup import simhash, item_simhash, collapse_near_duplicates, collapse_event_duplicates
+from src.utils import popcount
+
+
+CONFIG = {'enabled': True, 'max_distance': 3, 'across_sources': False}
+
+BASE_TIME = datetime(2024, 1, 15, 12, 0)
+
+QUAKE_TITLE = "Earthquake strikes northern Japan, tsunami warning issued"
+QUAKE_SUMMARY = ("A magnitude 7.1 earthquake struck off the northern coast of Japan on "
+                 "Tuesday, prompting tsunami warnings for Hokkaido and the evacuation of "
+                 "thousands of coastal residents, officials said.")
+RATES_TITLE = "Central bank raises interest rates as inflation persists"
+RATES_SUMMARY = ("Policymakers raised the main rate by a quarter point and signalled that "
+                 "further increases remain possible while price growth stays above target.")
+
+
+def make_item(item_id, source_id, title, summary, minutes=0):
+    """Create a NewsItem published `minutes` after BASE_TIME."""
+    published = BASE_TIME + timedelta(minutes=minutes)
+    return NewsItem(item_id, source_id, title, f"http://x/{item_id}",
+                    published, summary, published, f"guid{item_id}")
+
+
+class TestSimHash:
+    """Test SimHash fingerprints."""
+
+    def test_small_edits_stay_close(self):
+        """Test that lightly edited copies differ in few bits."""
+        original = item_simhash(QUAKE_TITLE, QUAKE_SUMMARY)
+        edited = item_simhash(QUAKE_TITLE, QUAKE_SUMMARY.replace("thousands", "tens of thousands"))
+        updated = item_simhash(QUAKE_TITLE, QUAKE_SUMMARY + " Updated.")
+
+        assert popcount(original ^ edited) <= 3
+        assert popcount(original ^ updated) <= 3
+
+    def test_unrelated_texts_are_far_apart(self):
+        """Test that different stories get distant fingerprints."""
+        quake = item_simhash(QUAKE_TITLE, QUAKE_SUMMARY)
+        rates = item_simhash(RATES_TITLE, RATES_SUMMARY)
+
+        assert popcount(quake ^ rates) > 10
+
+    def test_fingerprint_is_stable_64_bit(self):
+        """Test that fingerprints are deterministic and fit in 64 bits."""
+        assert simhash(QUAKE_TITLE) == simhash(QUAKE_TITLE)
+        assert 0 <= simhash(QUAKE_TITLE) < 2 ** 64
+
+
+class TestCollapse:
+    """Test collapsing near-duplicate items."""
+
+    def test_collapses_into_newest_copy(self):
+        """Test that the newest copy represents its duplicates."""
+        items = [
+            make_item(1, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=0),
+            make_item(2, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY + " Updated.", minutes=30),
+            make_item(3, 'wire1', RATES_TITLE, RATES_SUMMARY, minutes=10),
+        ]
+
+        result = collapse_near_duplicates(items, CONFIG)
+
+        assert [item.id for item in result] == [2, 3]
+        assert [d.id for d in result[0].duplicates] == [1]
+        assert result[0].duplicate_count == 1
+        assert result[1].duplicate_count == 0
+
+    def test_other_sources_kept_by_default(self):
+        """Test that copies from different sources stay separate items."""
+        items = [
+            make_item(1, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=0),
+            make_item(2, 'wire2', QUAKE_TITLE, QUAKE_SUMMARY, minutes=5),
+        ]
+
+        assert len(collapse_near_duplicates(items, CONFIG)) == 2
+
+    def test_across_sources(self):
+        """Test that across_sources folds copies from every source."""
+        items = [
+            make_item(1, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=0),
+            make_item(2, 'wire2', QUAKE_TITLE, QUAKE_SUMMARY, minutes=5),
+        ]
+
+        result = collapse_near_duplicates(items, dict(CONFIG, across_sources=True))
+
+        assert [item.id for item in result] == [2]
+
+    def test_disabled(self):
+        """Test that a disabled config returns the items unchanged."""
+        items = [
+            make_item(1, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY),
+            make_item(2, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=5),
+        ]
+
+        assert collapse_near_duplicates(items, dict(CONFIG, enabled=False)) == items
+
+    def test_collapse_again_is_idempotent(self):
+        """Test that collapsing already-collapsed items regroups the same way."""
+        items = [
+            make_item(i, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=i) for i in range(1, 4)
+        ]
+
+        first = collapse_near_duplicates(items, CONFIG)
+        second = collapse_near_duplicates(first, CONFIG)
+
+        assert [item.id for item in second] == [3]
+        assert sorted(d.id for d in second[0].duplicates) == [1, 2]
+
+    def test_event_counts_duplicate_sources(self):
+        """Test that collapsed copies still count towards an event's sources."""
+        items = [
+            make_item(1, 'wire1', QUAKE_TITLE, QUAKE_SUMMARY, minutes=0),
+            make_item(2, 'wire2', QUAKE_TITLE, QUAKE_SUMMARY, minutes=5),
+        ]
+        event = Event(None, items, BASE_TIME)
+
+        collapse_event_duplicates([event], dict(CONFIG, across_sources=True))
+
+        assert len(event.items) == 1
+        assert event.source_count == 2
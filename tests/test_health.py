@@ -0,0 +1,90 @@
+"""Tests for feed health tracking and the circuit breaker."""
+
+import pytest
+from datetime import datetime, timedelta
+from src.models import Source
+from src.store import NewsDatabase
+from src.health import (
+    HealthRecorder, apply_outcomes, backoff, filter_healthy_sources, format_health_report
+)
+
+
+CONFIG = {
+    'failure_threshold': 3,
+    'base_backoff_minutes': 60,
+    'max_backoff_hours': 48,
+}
+
+NOW = datetime(2024, 1, 16, 6, 0)
+
+DEAD = Source("dead", "Dead Feed", "https://dead.example.com/rss", "wire", "US")
+LIVE = Source("live", "Live Feed", "https://live.example.com/rss", "news", "US")
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Provide a connected database in a temporary directory."""
+    database = NewsDatabase(tmp_path / 'news.db')
+    database.connect()
+    yield database
+    database.close()
+
+
+def run(db, now, dead_ok=False):
+    """Simulate one run where LIVE succeeds and DEAD fails (unless dead_ok)."""
+    recorder = HealthRecorder()
+    recorder.record_success(LIVE, 100.0)
+    if dead_ok:
+        recorder.record_success(DEAD, 200.0)
+    else:
+        recorder.record_failure(DEAD, OSError("connection refused"), 5000.0)
+    return apply_outcomes(db, recorder, now=now, config=CONFIG)
+
+
+class TestCircuitBreaker:
+    """Test opening, probing and closing the circuit."""
+
+    def test_backoff_doubles_and_caps(self):
+        """Test exponential backoff growth."""
+        assert backoff(3, CONFIG) == timedelta(hours=1)
+        assert backoff(4, CONFIG) == timedelta(hours=2)
+        assert backoff(5, CONFIG) == timedelta(hours=4)
+        assert backoff(50, CONFIG) == timedelta(hours=48)
+
+    def test_circuit_opens_after_threshold(self, db):
+        """Test that a feed is skipped after repeated failures."""
+        for i in range(2):
+            health = run(db, NOW + timedelta(hours=i))
+            assert filter_healthy_sources([DEAD, LIVE], health, NOW + timedelta(hours=i))[1] == []
+
+        health = run(db, NOW + timedelta(hours=2))
+        fetch, skipped = filter_healthy_sources([DEAD, LIVE], db.get_feed_health(),
+                                                NOW + timedelta(hours=2, minutes=30))
+
+        assert [s.id for s in fetch] == ['live']
+        assert [s.id for s in skipped] == ['dead']
+        assert health['dead'].consecutive_failures == 3
+        assert health['live'].last_success_at == NOW + timedelta(hours=2)
+
+    def test_probe_success_closes_circuit(self, db):
+        """Test that a successful probe resets the feed."""
+        for i in range(3):
+            run(db, NOW + timedelta(hours=i))
+
+        health = run(db, NOW + timedelta(hours=4), dead_ok=True)
+
+        assert health['dead'].consecutive_failures == 0
+        assert health['dead'].next_probe_at is None
+        assert format_health_report(health, NOW + timedelta(hours=4)) == []
+
+    def test_report_lists_failing_feeds(self, db):
+        """Test that the report explains why a feed is skipped."""
+        for i in range(3):
+            health = run(db, NOW + timedelta(hours=i))
+
+        report = format_health_report(health, NOW + timedelta(hours=2))
+
+        assert len(report) == 1
+        assert report[0].startswith("dead: circuit open")
+        assert "connection refused" in report[0]
+        assert "last success never" in report[0]
@@ -0,0 +1,108 @@
+"""Tests for feed ingestion and the fast feed parser."""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+import feedparser
+
+from src.models import Source
+from src.feed_parser import UnsupportedFeedError, parse_entries
+from src.ingest import _parse_entry, fetch_feed, filter_new_items, parse_feed_body
+from src.store import NewsDatabase
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+SOURCE = Source("example", "Example", "https://example.com/rss", "news", "Global")
+
+FETCHED_AT = datetime(2024, 1, 16, 0, 0)
+
+
+def to_items(entries):
+    """Convert entries to comparable NewsItem fields."""
+    items = [_parse_entry(entry, SOURCE, FETCHED_AT) for entry in entries]
+    return [
+        (i.title, i.link, i.guid_hash, i.published_at, i.summary)
+        for i in items
+    ]
+
+
+class TestFastParserParity:
+    """Test that the fast parser matches feedparser on fixture feeds."""
+
+    @pytest.mark.parametrize('fixture', ['rss2.xml', 'atom.xml'])
+    def test_matches_feedparser(self, fixture):
+        """Test that both parsers yield identical NewsItems."""
+        body = (FIXTURES / fixture).read_bytes()
+
+        fast = to_items(parse_entries(body))
+        slow = to_items(feedparser.parse(body).entries)
+
+        assert fast == slow
+        assert len(fast) > 0
+
+    def test_converts_dates_to_utc(self):
+        """Test that timezone offsets are normalized to UTC."""
+        body = (FIXTURES / 'rss2.xml').read_bytes()
+
+        items = to_items(parse_entries(body))
+
+        assert items[0][3] == datetime(2024, 1, 15, 13, 30)
+        assert items[3][3] == datetime(2024, 1, 14, 23, 0)
+
+
+class TestFallback:
+    """Test falling back to feedparser."""
+
+    def test_malformed_feed_falls_back(self):
+        """Test that malformed XML is still parsed via feedparser."""
+        body = (FIXTURES / 'malformed.xml').read_bytes()
+
+        with pytest.raises(Exception):
+            parse_entries(body)
+
+        entries = parse_feed_body(body, 'Broken')
+        assert [e['title'] for e in entries] == ['Trade deal signed by US & EU']
+
+    def test_unsupported_root_rejected(self):
+        """Test that non-RSS/Atom documents are left to feedparser."""
+        with pytest.raises(UnsupportedFeedError):
+            parse_entries(b'<?xml version="1.0"?><html><body/></html>')
+
+    def test_fetch_feed_from_file(self):
+        """Test fetching a feed from a local path."""
+        source = Source("example", "Example", str(FIXTURES / 'atom.xml'), "news", "Global")
+
+        items = fetch_feed(source)
+
+        assert [i.title for i in items] == ['Stocks close at record high', 'Oil prices slip']
+
+
+class TestFilterNewItems:
+    """Test bulk deduplication of fetched items before storing."""
+
+    def make_entry(self, guid, link):
+        """Parse a minimal entry into a NewsItem."""
+        return _parse_entry({'title': f"Story {guid}", 'link': link, 'id': guid},
+                            SOURCE, FETCHED_AT)
+
+    def test_drops_stored_and_repeated_articles(self, tmp_path):
+        """Test that stored GUIDs and canonical URLs, and in-batch repeats, are dropped."""
+        db = NewsDatabase(tmp_path / 'news.db')
+        db.connect()
+        db.upsert_source(SOURCE)
+        db.insert_item(self.make_entry("a", "https://example.com/a"))
+
+        items = [
+            self.make_entry("a", "https://example.com/a"),  # same GUID
+            self.make_entry("a-amp", "https://www.example.com/a/amp?utm_source=x"),  # same URL
+            self.make_entry("b", "https://example.com/b"),
+            self.make_entry("b-world", "http://example.com/b?at_medium=rss"),  # repeat in batch
+        ]
+
+        new_items, guid_duplicates, url_duplicates = filter_new_items(db, items)
+        db.close()
+
+        assert [i.guid_hash for i in new_items] == [items[2].guid_hash]
+        assert (guid_duplicates, url_duplicates) == (1, 2)
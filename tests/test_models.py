@@ -39,7 +39,7 @@ class TestNewsItem:
             published_at=now,
             summary="Test summary",
             fetched_at=now,
-            guid_hash="abc123"
+            guid_hash=123
         )
 
         assert item.id == 1
@@ -83,6 +83,18 @@ class TestEvent:
         assert "source1" in source_ids
         assert "source2" in source_ids
 
+    def test_event_source_ids_copy(self):
+        """Test that changing the returned list leaves the cached aggregates intact."""
+        now = datetime.utcnow()
+        event = Event(id=1, items=[
+            NewsItem(1, "source1", "Title1", "http://link1", now, None, now, "hash1"),
+        ], created_at=now)
+
+        event.source_ids.append("source9")
+
+        assert event.source_ids == ["source1"]
+        assert event.source_count == 1
+
     def test_event_canonical_title_auto(self):
         """Test that canonical title is automatically set to shortest."""
         now = datetime.utcnow()
@@ -114,3 +126,36 @@ class TestEvent:
         event = Event(id=1, items=items, created_at=now)
 
         assert event.most_recent_time == now
+
+    def test_event_add_item_updates_aggregates(self):
+        """Test that add_item keeps cached aggregates current."""
+        from datetime import timedelta
+
+        now = datetime.utcnow()
+        later = now + timedelta(hours=1)
+
+        event = Event(id=1, items=[
+            NewsItem(1, "source1", "A longer title", "http://link1", now, None, now, "hash1"),
+        ], created_at=now)
+
+        event.add_item(NewsItem(2, "source2", "Short", "http://link2", later, None, now, "hash2"))
+        event.add_item(NewsItem(3, "source1", "Tiny", "http://link3", now, None, now, "hash3"))
+
+        assert event.source_count == 2
+        assert event.source_ids == ["source1", "source2"]
+        assert event.most_recent_time == later
+        assert event.shortest_title == "Tiny"
+
+    def test_event_items_reassignment_recomputes(self):
+        """Test that replacing the item list refreshes aggregates."""
+        now = datetime.utcnow()
+
+        event = Event(id=1, items=[
+            NewsItem(1, "source1", "Title1", "http://link1", now, None, now, "hash1"),
+            NewsItem(2, "source2", "Title2", "http://link2", now, None, now, "hash2"),
+        ], created_at=now)
+
+        event.items = [NewsItem(3, "source3", "Title3", "http://link3", now, None, now, "hash3")]
+
+        assert event.source_count == 1
+        assert event.source_ids == ["source3"]
@@ -0,0 +1,107 @@
+"""Tests for profile briefs built from shared clusters."""
+
+import json
+from datetime import datetime, timedelta
+from src.models import NewsItem, Event, Source
+from src.profiles import events_for_profile, render_profiles
+
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+SOURCES = [
+    Source("reuters_us", "Reuters U.S.", "http://x/rss", "wire", "US"),
+    Source("ap_top", "AP", "http://x/rss", "wire", "Global"),
+    Source("npr_news", "NPR", "http://x/rss", "news", "US"),
+    Source("bloomberg", "Bloomberg", "http://x/rss", "news", "Global"),
+    Source("marketwatch", "MarketWatch", "http://x/rss", "news", "US"),
+]
+
+CLUSTERING = {'min_sources_per_event': 2, 'financial_sources': {'bloomberg', 'marketwatch'}}
+
+
+def profile(regions=None, tiers=None, sections=None, max_events=None):
+    """Build a profile configuration."""
+    return {'regions': regions, 'tiers': tiers, 'sections': sections, 'max_events': max_events}
+
+
+def make_event(title, source_ids):
+    """Create an Event with one item per source id."""
+    items = [
+        NewsItem(i, source_id, f"{title} ({source_id})", f"http://x/{title}/{i}",
+                 NOW - timedelta(minutes=i), None, NOW, i)
+        for i, source_id in enumerate(source_ids)
+    ]
+    return Event(None, items, NOW, canonical_title=title)
+
+
+class TestEventsForProfile:
+    """Test restricting shared clusters to a profile."""
+
+    def test_region_filter_drops_items_and_thin_events(self):
+        """Test that only matching sources stay and thin events are dropped."""
+        events = [
+            make_event("Election", ["reuters_us", "npr_news", "ap_top"]),
+            make_event("Summit", ["ap_top", "npr_news"]),
+        ]
+
+        result = events_for_profile(events, profile(regions={"US"}), SOURCES, CLUSTERING)
+
+        assert [e.source_ids for e in result] == [["reuters_us", "npr_news"]]
+
+    def test_shared_events_not_modified(self):
+        """Test that profile events are copies, so ranking one leaves the others alone."""
+        events = [make_event("Election", ["reuters_us", "npr_news", "ap_top"])]
+        events[0].score = 4.0
+
+        result = events_for_profile(events, profile(tiers={"wire"}), SOURCES, CLUSTERING)
+        result[0].score = 9.0
+
+        assert result[0] is not events[0]
+        assert events[0].score == 4.0
+        assert len(events[0].items) == 3
+
+    def test_section_filter(self):
+        """Test that a finance-only profile keeps financial events only."""
+        events = [
+            make_event("Election", ["reuters_us", "npr_news"]),
+            make_event("Stocks", ["bloomberg", "marketwatch", "ap_top"]),
+        ]
+
+        result = events_for_profile(events, profile(sections={"financial"}), SOURCES, CLUSTERING)
+
+        assert [e.canonical_title for e in result] == ["Stocks"]
+
+    def test_collapsed_copies_from_other_sources_removed(self):
+        """Test that copies collapsed across sources are filtered too."""
+        event = make_event("Election", ["reuters_us", "npr_news"])
+        copy = NewsItem(9, "ap_top", "Election (ap_top)", "http://x/copy", NOW, None, NOW, 9)
+        event.items[0].duplicates.append(copy)
+        event.items = list(event.items)
+
+        result = events_for_profile([event], profile(regions={"US"}), SOURCES, CLUSTERING)
+
+        assert result[0].source_ids == ["reuters_us", "npr_news"]
+        assert event.items[0].duplicates == [copy]
+
+
+class TestRenderProfiles:
+    """Test ranking and rendering every profile in one pass."""
+
+    def test_each_profile_rendered_to_own_directory(self, tmp_path):
+        """Test that every profile gets its own brief from the same clusters."""
+        events = [
+            make_event("Election", ["reuters_us", "npr_news", "ap_top"]),
+            make_event("Stocks", ["bloomberg", "marketwatch"]),
+        ]
+        profiles = {
+            'us': profile(regions={"US"}),
+            'finance': profile(sections={"financial"}, max_events=1),
+        }
+
+        briefs = render_profiles(events, tmp_path, now=NOW, profiles=profiles)
+
+        assert [e.source_ids for e in briefs['us']] == [["reuters_us", "npr_news"]]
+        assert [e.canonical_title for e in briefs['finance']] == ["Stocks"]
+        for name in profiles:
+            doc = json.loads((tmp_path / 'profiles' / name / 'brief.json').read_text())
+            assert len(doc['events']) == len(briefs[name])
@@ -0,0 +1,56 @@
+"""Tests for the optional memory profiler."""
+
+import json
+from datetime import datetime
+from src.models import NewsItem, Event
+from src.profiling import MemoryProfiler
+
+
+def make_item(i):
+    """Create a minimal news item."""
+    return NewsItem(
+        id=i, source_id="src", title=f"Story {i}", link=f"https://example.com/{i}",
+        published_at=datetime(2024, 1, 15, 12, 0), summary=None,
+        fetched_at=datetime(2024, 1, 15, 12, 5), guid_hash=i
+    )
+
+
+class TestMemoryProfiler:
+    """Tests for MemoryProfiler."""
+
+    def test_disabled_records_nothing(self, tmp_path):
+        """A disabled profiler is a no-op and writes no report."""
+        profiler = MemoryProfiler()
+        profiler.start()
+        profiler.checkpoint('fetch')
+        profiler.write_report(tmp_path / 'memory_profile.json')
+        profiler.stop()
+
+        assert profiler.stages == []
+        assert not (tmp_path / 'memory_profile.json').exists()
+
+    def test_checkpoints_record_stages_and_object_counts(self, tmp_path):
+        """Each checkpoint records heap usage and live pipeline objects."""
+        profiler = MemoryProfiler(enabled=True)
+        profiler.start()
+        try:
+            items = [make_item(i) for i in range(50)]
+            profiler.checkpoint('fetch')
+            events = [Event(id=1, items=items[:10], created_at=datetime(2024, 1, 15, 13, 0))]
+            profiler.checkpoint('cluster')
+            profiler.write_report(tmp_path / 'memory_profile.json')
+        finally:
+            profiler.stop()
+
+        assert [s['stage'] for s in profiler.stages] == ['fetch', 'cluster']
+        fetch, cluster = profiler.stages
+        assert fetch['objects']['NewsItem'] >= 50
+        assert cluster['objects']['Event'] >= len(events)
+        assert fetch['heap_peak_bytes'] >= fetch['heap_current_bytes'] > 0
+        assert fetch['top_allocations']
+        if fetch['rss_bytes'] is not None:  # /proc is Linux only
+            assert cluster['rss_growth_bytes'] == cluster['rss_bytes'] - fetch['rss_bytes']
+
+        report = json.loads((tmp_path / 'memory_profile.json').read_text())
+        assert [s['stage'] for s in report['stages']] == ['fetch', 'cluster']
+        assert len(profiler.report_lines()) >= 2
@@ -0,0 +1,71 @@
+"""Tests for event ranking."""
+
+import pytest
+from datetime import datetime, timedelta
+from src.models import NewsItem, Event
+from src.rank import calculate_event_score, score_events, top_events_by_score
+
+
+CONFIG = {
+    'source_tier_weights': {'wire': 3.0, 'news': 2.0, 'magazine': 1.0},
+    'recency_weight': 0.1,
+    'max_events_in_brief': 10,
+}
+
+SOURCE_TIERS = {'wire1': 'wire', 'news1': 'news', 'news2': 'news', 'mag1': 'magazine'}
+
+
+def make_event(source_ids, hours_old, now):
+    """Create an Event with one item per source id."""
+    published = now - timedelta(hours=hours_old)
+    items = [
+        NewsItem(i, source_id, f"Title {i}", f"http://link/{i}", published, None, now, f"h{i}")
+        for i, source_id in enumerate(source_ids)
+    ]
+    return Event(id=None, items=items, created_at=published)
+
+
+class TestScoring:
+    """Test batch scoring."""
+
+    def test_score_events_matches_single_event_score(self):
+        """Test that batch scoring agrees with per-event scoring."""
+        now = datetime.utcnow()
+        events = [
+            make_event(['wire1', 'news1'], 1, now),
+            make_event(['news1', 'news2', 'mag1'], 5, now),
+            make_event(['unknown', 'news1', 'news1'], 0, now),
+        ]
+
+        score_events(events, CONFIG, SOURCE_TIERS, now=now)
+
+        for event in events:
+            expected = calculate_event_score(event, CONFIG, SOURCE_TIERS, now=now)
+            assert event.score == pytest.approx(expected)
+
+    def test_unknown_source_weighted_as_news(self):
+        """Test that sources missing from the tier map use the news weight."""
+        now = datetime.utcnow()
+        known = make_event(['news1', 'news2'], 0, now)
+        unknown = make_event(['other1', 'other2'], 0, now)
+
+        score_events([known, unknown], CONFIG, SOURCE_TIERS, now=now)
+
+        assert known.score == pytest.approx(unknown.score)
+
+
+class TestTopK:
+    """Test top-k selection."""
+
+    def test_top_events_matches_full_sort(self):
+        """Test that heap selection equals a stable descending sort."""
+        now = datetime.utcnow()
+        events = [make_event(['news1'] * (i % 3 + 1), 0, now) for i in range(20)]
+        for i, event in enumerate(events):
+            event.score = float(i % 4)
+
+        expected = sorted(events, key=lambda e: e.score, reverse=True)
+
+        for k in (0, 1, 5, 20, 50):
+            selected = top_events_by_score(events, k)
+            assert [id(e) for e in selected] == [id(e) for e in expected[:k]]
@@ -0,0 +1,102 @@
+"""Tests for machine-readable brief output."""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+from src.models import BriefDelta, NewsItem, Event
+from src.view import build_brief_view
+from src.render_json import (
+    SCHEMA_VERSION, brief_to_dict, delta_to_dict, iter_ndjson, render_json_brief
+)
+
+
+def make_event(source_ids, now, title="Shared headline", score=5.0):
+    """Create an Event with one item per source id."""
+    items = [
+        NewsItem(i, source_id, f"{title} {i}", f"http://link/{source_id}/{i}",
+                 now - timedelta(minutes=i), None, now, f"h{source_id}{i}")
+        for i, source_id in enumerate(source_ids)
+    ]
+    return Event(id=None, items=items, created_at=now, score=score, canonical_title=title)
+
+
+class TestJsonBrief:
+    """Test JSON and NDJSON serialization."""
+
+    def test_brief_schema(self):
+        """Test that events carry all items, sources, tiers and sections."""
+        now = datetime(2024, 1, 1, 6, 0)
+        events = [
+            make_event(['bbc_world', 'reuters_world', 'npr_news', 'nyt_world',
+                        'guardian_world', 'ap_top'], now, "World story", 9.5),
+            make_event(['wsj_world', 'bloomberg'], now, "Market story", 4.0),
+        ]
+
+        doc = brief_to_dict(build_brief_view(events, generated_at=now))
+
+        assert doc['schema_version'] == SCHEMA_VERSION
+        assert doc['generated_at'] == '2024-01-01T06:00:00'
+        assert doc['stats'] == {'events': 2, 'articles': 8, 'source_mentions': 8}
+
+        first = doc['events'][0]
+        assert first['rank'] == 1
+        assert first['section'] == 'general'
+        assert first['item_count'] == 6
+        assert len(first['items']) == 6  # not truncated like the HTML view
+        assert first['items'][0]['tier'] == 'wire'
+        assert first['sources'][0] in ('reuters_world', 'ap_top')
+
+        assert doc['events'][1]['section'] == 'financial'
+
+    def test_ndjson_matches_json(self):
+        """Test that NDJSON streams the same events with a header line."""
+        now = datetime(2024, 1, 1, 6, 0)
+        view = build_brief_view([make_event(['bbc_world', 'npr_news'], now)], generated_at=now)
+
+        lines = [json.loads(line) for line in iter_ndjson(view)]
+
+        assert lines[0]['type'] == 'brief'
+        assert [l['type'] for l in lines[1:]] == ['event']
+        expected = brief_to_dict(view)['events'][0]
+        assert {k: v for k, v in lines[1].items() if k != 'type'} == expected
+
+    def test_render_writes_files(self, tmp_path):
+        """Test that JSON and NDJSON files are written."""
+        now = datetime(2024, 1, 1, 6, 0)
+        events = [make_event(['bbc_world', 'npr_news'], now)]
+
+        output = render_json_brief(events, tmp_path / 'brief.json')
+
+        assert json.loads((tmp_path / 'brief.json').read_text()) == json.loads(output)
+        assert (tmp_path / 'brief.ndjson').exists()
+
+    def test_delta_document(self, tmp_path):
+        """Test that the delta lists new events in full and only additions for updates."""
+        now = datetime(2024, 1, 2, 6, 0)
+        fresh = make_event(['bbc_world', 'npr_news'], now, "Fresh story", 9.0)
+        grown = make_event(['reuters_world', 'ap_top', 'npr_news'], now, "Growing story", 5.0)
+        steady = make_event(['wsj_world', 'bloomberg'], now, "Steady story", 1.0)
+        fresh.id, grown.id, steady.id = 10, 11, 12
+        delta = BriefDelta(
+            ranked_at=now,
+            previous_ranked_at=now - timedelta(days=1),
+            new_event_ids=[10],
+            updated_item_ids={11: [2]},
+            unchanged_event_ids=[12],
+            dropped=[(7, "Old story")],
+        )
+        events = [fresh, grown, steady]
+
+        doc = delta_to_dict(delta, build_brief_view(events, generated_at=now))
+
+        assert doc['since'] == '2024-01-01T06:00:00'
+        assert [e['id'] for e in doc['new']] == [10]
+        assert doc['new'][0] == brief_to_dict(build_brief_view(events, generated_at=now))['events'][0]
+        assert [(e['id'], e['rank'], e['new_item_count']) for e in doc['updated']] == [(11, 2, 1)]
+        assert [i['source_id'] for i in doc['updated'][0]['new_items']] == ['npr_news']
+        assert doc['dropped'] == [{'id': 7, 'title': "Old story"}]
+        assert doc['unchanged'] == [12]
+
+        render_json_brief(events, tmp_path / 'brief.json',
+                          view=build_brief_view(events, generated_at=now), delta=delta)
+        assert json.loads((tmp_path / 'brief.delta.json').read_text()) == doc
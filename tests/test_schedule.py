@@ -0,0 +1,70 @@
+"""Tests for adaptive polling."""
+
+import pytest
+from datetime import datetime, timedelta
+from src.models import Source, NewsItem
+from src.store import NewsDatabase
+from src.schedule import poll_interval, select_due_sources, plan_next_polls
+
+
+CONFIG = {
+    'enabled': True,
+    'min_interval_minutes': 30,
+    'max_interval_minutes': 360,
+    'target_items_per_poll': 5,
+    'history_hours': 72,
+    'slack_minutes': 10,
+}
+
+NOW = datetime(2024, 1, 16, 6, 0)
+
+
+def make_source(source_id):
+    """Create a Source for tests."""
+    return Source(source_id, source_id, f"http://{source_id}/rss", "news", "US")
+
+
+class TestPollInterval:
+    """Test interval calculation."""
+
+    def test_interval_follows_rate_within_bounds(self):
+        """Test that busy sources are polled often and quiet ones rarely."""
+        assert poll_interval(5.0, CONFIG) == timedelta(minutes=60)
+        assert poll_interval(100.0, CONFIG) == timedelta(minutes=30)
+        assert poll_interval(0.1, CONFIG) == timedelta(minutes=360)
+        assert poll_interval(0.0, CONFIG) == timedelta(minutes=360)
+
+
+class TestDueSources:
+    """Test selecting which sources to poll."""
+
+    def test_select_due_sources(self):
+        """Test that only new, due, or nearly-due sources are polled."""
+        sources = [make_source(s) for s in ('new', 'due', 'soon', 'later')]
+        schedule = {
+            'due': NOW - timedelta(minutes=1),
+            'soon': NOW + timedelta(minutes=5),
+            'later': NOW + timedelta(hours=2),
+        }
+
+        due, skipped = select_due_sources(sources, schedule, NOW, CONFIG)
+
+        assert [s.id for s in due] == ['new', 'due', 'soon']
+        assert [s.id for s in skipped] == ['later']
+
+    def test_plan_next_polls_persists_schedule(self, tmp_path):
+        """Test that learned schedules are stored in the database."""
+        db = NewsDatabase(tmp_path / 'news.db')
+        db.connect()
+        busy, quiet = make_source('busy'), make_source('quiet')
+        for i in range(720):  # 10 items/hour over 72 hours
+            published = NOW - timedelta(minutes=6 * i)
+            db.insert_item(NewsItem(None, 'busy', f"Title {i}", f"http://busy/{i}",
+                                    published, None, NOW, f"busy{i}"))
+
+        plan_next_polls(db, [busy, quiet], now=NOW, config=CONFIG)
+        schedule = db.get_poll_schedule()
+        db.close()
+
+        assert schedule['busy'] == NOW + timedelta(minutes=30)
+        assert schedule['quiet'] == NOW + timedelta(minutes=360)
@@ -0,0 +1,83 @@
+"""Tests for feed snapshots and offline replay."""
+
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+from src.models import Source
+from src.snapshot import SnapshotReader, SnapshotWriter, prune_snapshots
+from src.ingest import replay_feeds
+from src.pipeline import run_pipeline
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+STARTED_AT = datetime(2024, 1, 16, 6, 0)
+
+
+def record_fixtures(root):
+    """Record the fixture feeds as one snapshot run."""
+    writer = SnapshotWriter(root, started_at=STARTED_AT)
+    for name in ('rss2', 'atom'):
+        source = Source(name, name.upper(), f"https://example.com/{name}", "news", "Global")
+        writer.record(source, (FIXTURES / f'{name}.xml').read_bytes(), STARTED_AT, 12.0)
+    writer.record_error(Source("dead", "Dead", "https://dead.example.com", "wire", "US"),
+                        OSError("connection refused"), STARTED_AT, 3.0)
+    return writer.finish()
+
+
+class TestSnapshots:
+    """Test recording and reading snapshots."""
+
+    def test_bodies_are_content_addressed(self, tmp_path):
+        """Test that identical bodies are stored once across runs."""
+        record_fixtures(tmp_path)
+        writer = SnapshotWriter(tmp_path, started_at=datetime(2024, 1, 16, 7, 0))
+        writer.record(Source("rss2", "RSS2", "u", "news", "Global"),
+                      (FIXTURES / 'rss2.xml').read_bytes(), STARTED_AT, 1.0)
+        writer.finish()
+
+        assert len(list((tmp_path / 'objects').glob('*/*.gz'))) == 2
+
+    def test_runs_started_together_keep_their_manifests(self, tmp_path):
+        """Test that two runs with the same start time get separate directories."""
+        first = record_fixtures(tmp_path)
+        writer = SnapshotWriter(tmp_path, started_at=STARTED_AT)
+        writer.record_error(Source("dead", "Dead", "https://dead.example.com", "wire", "US"),
+                            OSError("timed out"), STARTED_AT, 3.0)
+        second = writer.finish()
+
+        assert first != second
+        assert len(SnapshotReader(first).feeds) == 3
+        assert len(SnapshotReader(second).feeds) == 1
+        assert SnapshotReader(second).run_id == second.name
+
+    def test_replay_feeds(self, tmp_path):
+        """Test that replayed items match the recorded feeds."""
+        reader = SnapshotReader(record_fixtures(tmp_path))
+
+        items = replay_feeds(reader)
+
+        assert reader.started_at == STARTED_AT
+        assert len(items) == 6
+        assert {i.source_id for i in items} == {'rss2', 'atom'}
+        assert all(i.fetched_at == STARTED_AT for i in items)
+
+    def test_prune_removes_old_runs_and_objects(self, tmp_path):
+        """Test that pruning drops expired runs and orphaned objects."""
+        record_fixtures(tmp_path)
+
+        assert prune_snapshots(tmp_path, keep_days=1) == 1
+        assert list((tmp_path / 'objects').glob('*/*.gz')) == []
+
+
+class TestReplayPipeline:
+    """Test running the whole pipeline offline."""
+
+    def test_run_pipeline_replay(self, tmp_path):
+        """Test that a replay writes its brief into the snapshot directory."""
+        run_dir = record_fixtures(tmp_path)
+
+        assert run_pipeline(replay_dir=run_dir) == 0
+        assert (run_dir / 'output' / 'brief.md').exists()
+        assert '2024-01-16' in (run_dir / 'output' / 'brief.md').read_text()
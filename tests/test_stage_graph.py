@@ -0,0 +1,135 @@
+"""Tests for running pipeline stages as a dependency graph."""
+
+import threading
+import time
+
+import pytest
+
+from src.stage_graph import Stage, StageGraph
+
+
+def sleeper(seconds, value=None):
+    """A stage function that sleeps and returns a value."""
+    def run(**inputs):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+class TestStageGraphValidation:
+    """Test graph validation."""
+
+    def test_missing_input(self):
+        """Test that an input nobody produces is rejected."""
+        with pytest.raises(ValueError, match="nothing produces"):
+            StageGraph([Stage('render', sleeper(0), inputs=('view',))])
+
+    def test_duplicate_output(self):
+        """Test that two producers of one value are rejected."""
+        with pytest.raises(ValueError, match="produced twice"):
+            StageGraph([
+                Stage('a', sleeper(0), outputs=('x',)),
+                Stage('b', sleeper(0), outputs=('x',)),
+            ])
+
+    def test_cycle(self):
+        """Test that a dependency cycle is rejected."""
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph([
+                Stage('a', sleeper(0), inputs=('y',), outputs=('x',)),
+                Stage('b', sleeper(0), inputs=('x',), outputs=('y',)),
+            ])
+
+
+class TestStageGraphRun:
+    """Test running stages with overlap."""
+
+    def test_outputs_passed_to_dependents(self):
+        """Test that stages receive their inputs, including multiple outputs."""
+        graph = StageGraph([
+            Stage('fetch', lambda n: (list(range(n)), 'ok'), inputs=('n',),
+                  outputs=('items', 'health')),
+            Stage('count', lambda items: len(items), inputs=('items',), outputs=('count',)),
+        ], provided=('n',))
+
+        values = graph.run({'n': 3})
+
+        assert values['items'] == [0, 1, 2]
+        assert values['health'] == 'ok'
+        assert values['count'] == 3
+
+    def test_independent_stages_overlap(self):
+        """Test that independent stages run at the same time."""
+        graph = StageGraph([
+            Stage(name, sleeper(0.2), outputs=(name,)) for name in ('md', 'html', 'json')
+        ])
+
+        started = time.perf_counter()
+        graph.run(max_workers=3)
+
+        assert time.perf_counter() - started < 0.5
+        assert graph.wall_seconds < sum(t.seconds for t in graph.timings.values())
+
+    def test_single_worker_runs_in_order(self):
+        """Test that one worker runs stages sequentially in list order."""
+        order = []
+        stages = [
+            Stage(name, lambda name=name: order.append(name), outputs=(name,))
+            for name in ('sources', 'fetch', 'render')
+        ]
+
+        StageGraph(stages).run(max_workers=1, on_stage_done=order.append)
+
+        assert order == ['sources', 'sources', 'fetch', 'fetch', 'render', 'render']
+
+    def test_shared_resource_is_exclusive(self):
+        """Test that stages holding the same resource never overlap."""
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def db_stage():
+            with lock:
+                active.append(1)
+                overlaps.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        graph = StageGraph([
+            Stage(f's{i}', db_stage, outputs=(f's{i}',), resources=('db',)) for i in range(4)
+        ])
+        graph.run(max_workers=4)
+
+        assert max(overlaps) == 1
+
+    def test_critical_path(self):
+        """Test that the critical path follows the slowest dependency chain."""
+        graph = StageGraph([
+            Stage('sources', sleeper(0.01), outputs=('sources',)),
+            Stage('upsert', sleeper(0.01), inputs=('sources',), outputs=('stored',)),
+            Stage('fetch', sleeper(0.15), inputs=('sources',), outputs=('items',)),
+            Stage('store', sleeper(0.01), inputs=('items', 'stored'), outputs=('count',)),
+        ])
+
+        graph.run(max_workers=2)
+
+        assert graph.critical_path() == ['sources', 'fetch', 'store']
+        assert graph.report_lines()[-1].endswith('sources -> fetch -> store')
+
+    def test_failure_stops_later_stages(self):
+        """Test that a failing stage's error is raised and dependents don't run."""
+        ran = []
+
+        def fail():
+            raise RuntimeError("feed down")
+
+        graph = StageGraph([
+            Stage('fetch', fail, outputs=('items',)),
+            Stage('store', lambda items: ran.append('store'), inputs=('items',),
+                  outputs=('count',)),
+        ])
+
+        with pytest.raises(RuntimeError, match="feed down"):
+            graph.run()
+        assert ran == []
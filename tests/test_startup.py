@@ -0,0 +1,92 @@
+"""Startup-time budget for the CLI, measured with `python -X importtime`."""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for slow CI machines; eager imports cost well over this
+STARTUP_BUDGET_MS = 100
+
+# Modules only fetching feeds needs
+FETCH_STACK = ['feedparser', 'dateutil', 'urllib.request', 'src.ingest']
+
+# Modules only the fetch and full-run commands need
+FETCH_ONLY = FETCH_STACK + ['src.pipeline']
+
+# What each command that doesn't fetch imports (see the run_* handlers in src.main)
+COMMAND_IMPORTS = {
+    'cluster': 'import src.main; from src.pipeline import cluster_and_rank; '
+               'from src.store import NewsDatabase',
+    'rerank': 'import src.main; from src.pipeline import rerank; '
+              'from src.render import render_all; from src.store import NewsDatabase',
+    'render': 'import src.main; from src.dedup import collapse_event_duplicates; '
+              'from src.render import render_all; from src.store import NewsDatabase',
+    'profiles': 'import src.main; from src.profiles import render_profiles; '
+                'from src.store import NewsDatabase',
+    'archive': 'import src.main; from src.pipeline import archive_and_cleanup; '
+               'from src.store import NewsDatabase',
+    'stats': 'import src.main; from src.store import NewsDatabase',
+}
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """
+    Run an import statement in a fresh interpreter.
+
+    Returns:
+        Map of module name -> cumulative import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Tests for lazy CLI imports."""
+
+    def test_cli_imports_no_pipeline_modules(self):
+        """Importing the CLI loads neither third-party packages nor pipeline stages."""
+        times = import_times('import src.main')
+
+        for module in FETCH_ONLY + ['yaml', 'src.store', 'src.render']:
+            assert module not in times
+
+    @pytest.mark.parametrize('command', sorted(COMMAND_IMPORTS))
+    def test_commands_skip_fetch_dependencies(self, command):
+        """Commands that don't fetch never load the fetch stack."""
+        times = import_times(COMMAND_IMPORTS[command])
+
+        for module in FETCH_STACK:
+            assert module not in times
+
+    def test_render_modules_skip_optional_encoders(self):
+        """Loading the renderers imports neither brotli nor msgpack; they load when used."""
+        times = import_times(COMMAND_IMPORTS['render'])
+
+        for module in ['brotli', 'msgpack']:
+            assert module not in times
+
+    def test_stats_skips_yaml(self):
+        """The stats command needs no configuration, so PyYAML stays unloaded."""
+        assert 'yaml' not in import_times('import src.main, src.store')
+
+    def test_startup_within_budget(self):
+        """Importing the CLI stays within the startup budget (best of three)."""
+        best_us = min(import_times('import src.main')['src.main'] for _ in range(3))
+
+        assert best_us / 1000 < STARTUP_BUDGET_MS
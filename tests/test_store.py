@@ -0,0 +1,347 @@
+"""Tests for database storage."""
+
+import sqlite3
+
+import pytest
+from datetime import datetime, timedelta
+from src.models import Source, NewsItem, Event
+from src.store import NewsDatabase
+from src.dedup import item_simhash
+from src.utils import make_guid_hash, make_url_hash
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Provide a connected database in a temporary directory."""
+    database = NewsDatabase(tmp_path / 'news.db')
+    database.connect()
+    database.upsert_source(Source("source1", "Source 1", "http://s1/rss", "news", "US"))
+    yield database
+    database.close()
+
+
+def make_item(guid, title, summary=None, published_at=None, source_id="source1"):
+    """Create a NewsItem for tests."""
+    now = datetime.utcnow()
+    return NewsItem(None, source_id, title, f"http://link/{guid}",
+                    published_at or now, summary, now, make_guid_hash(guid))
+
+
+def guid_of(item):
+    """The test guid an item was created with (kept in its link)."""
+    return item.link.rsplit('/', 1)[1]
+
+
+class TestSearch:
+    """Test full-text search over items."""
+
+    def test_search_finds_title_and_summary(self, db):
+        """Test that both titles and summaries are indexed."""
+        db.insert_item(make_item("h1", "Central bank raises rates", "Inflation remains high"))
+        db.insert_item(make_item("h2", "Storm hits coast", "Thousands without power"))
+
+        assert [guid_of(r.item) for r in db.search_items("rates")] == ["h1"]
+        assert [guid_of(r.item) for r in db.search_items("power")] == ["h2"]
+
+    def test_search_ranks_title_matches_first(self, db):
+        """Test that title matches outrank summary-only matches."""
+        db.insert_item(make_item("h1", "Storm hits coast", "Election officials delayed"))
+        db.insert_item(make_item("h2", "Election results announced", "Counting finished"))
+
+        results = db.search_items("election")
+        assert [guid_of(r.item) for r in results] == ["h2", "h1"]
+
+    def test_search_time_filter(self, db):
+        """Test that results are limited to the requested window."""
+        old = datetime.utcnow() - timedelta(days=30)
+        db.insert_item(make_item("old", "Summit opens in Geneva", published_at=old))
+        db.insert_item(make_item("new", "Summit closes in Geneva"))
+
+        assert len(db.search_items("summit")) == 2
+        assert [guid_of(r.item) for r in db.search_items("summit", hours=24)] == ["new"]
+
+    def test_search_rejects_hours_with_since(self, db):
+        """Test that two conflicting window starts are an error, not a silent override."""
+        with pytest.raises(ValueError):
+            db.search_items("summit", hours=24, since=datetime(2024, 1, 1))
+
+    def test_search_handles_punctuation(self, db):
+        """Test that FTS syntax characters in queries are treated as text."""
+        db.insert_item(make_item("h1", "U.S.-China talks resume"))
+
+        assert len(db.search_items('China: "talks" -')) == 1
+
+    def test_search_index_backfilled_on_connect(self, tmp_path):
+        """Test that items stored before the index existed are searchable."""
+        database = NewsDatabase(tmp_path / 'news.db')
+        database.connect()
+        database.insert_item(make_item("h1", "Ceasefire agreed"))
+        database.conn.execute('DROP TABLE items_fts')
+        database.close()
+
+        database.connect()
+        assert len(database.search_items("ceasefire")) == 1
+        database.close()
+
+
+class TestSimHashColumn:
+    """Test that item fingerprints are stored for near-duplicate collapse."""
+
+    def test_simhash_round_trips(self, db):
+        """Test that the fingerprint computed at insert is read back unchanged."""
+        db.insert_item(make_item("h1", "Ceasefire agreed", "Talks end after weeks"))
+
+        item = db.get_recent_items(hours=1)[0]
+
+        assert item.simhash == item_simhash("Ceasefire agreed", "Talks end after weeks")
+
+    def test_missing_simhashes_backfilled_on_connect(self, tmp_path):
+        """Test that items stored without a fingerprint get one on connect."""
+        database = NewsDatabase(tmp_path / 'news.db')
+        database.connect()
+        database.insert_item(make_item("h1", "Ceasefire agreed"))
+        database.conn.execute('UPDATE items SET simhash = NULL')
+        database.conn.commit()
+        database.close()
+
+        database.connect()
+        assert database.get_recent_items(hours=1)[0].simhash == item_simhash("Ceasefire agreed", None)
+        database.close()
+
+
+class TestCanonicalUrlColumn:
+    """Test the canonical URL hash used to spot cross-feed copies."""
+
+    def test_existing_hashes_looked_up_in_bulk(self, db):
+        """Test that only stored GUIDs and canonical URLs are reported."""
+        db.insert_item(make_item("h1", "Ceasefire agreed"))
+
+        assert db.existing_guid_hashes([make_guid_hash("h1"), make_guid_hash("h2")]) == \
+            {make_guid_hash("h1")}
+        assert db.existing_url_hashes([
+            make_url_hash("https://www.link/h1?utm_source=rss"),
+            make_url_hash("http://link/h2"),
+        ]) == {make_url_hash("http://link/h1")}
+
+    def test_lookup_handles_more_values_than_one_query(self, db):
+        """Test that lookups are chunked below SQLite's variable limit."""
+        db.insert_item(make_item("h1", "Ceasefire agreed"))
+
+        keys = [make_guid_hash(f"x{i}") for i in range(2000)] + [make_guid_hash("h1")]
+
+        assert db.existing_guid_hashes(keys) == {make_guid_hash("h1")}
+
+    def test_missing_url_hashes_backfilled_on_connect(self, tmp_path):
+        """Test that items stored without a canonical URL hash get one on connect."""
+        database = NewsDatabase(tmp_path / 'news.db')
+        database.connect()
+        database.insert_item(make_item("h1", "Ceasefire agreed"))
+        database.conn.execute('UPDATE items SET canonical_url_hash = NULL')
+        database.conn.commit()
+        database.close()
+
+        database.connect()
+        assert database.existing_url_hashes([make_url_hash("http://link/h1")])
+        database.close()
+
+
+class TestIntegerGuidMigration:
+    """Test upgrading databases that stored guid hashes as hex text."""
+
+    def test_text_guids_migrated_in_place(self, tmp_path):
+        """Test that old rows keep their ids, stay unique and remain searchable."""
+        path = tmp_path / 'news.db'
+        conn = sqlite3.connect(str(path))
+        conn.execute('''
+            CREATE TABLE items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                summary TEXT,
+                fetched_at TEXT NOT NULL,
+                guid_hash TEXT UNIQUE NOT NULL
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO items VALUES
+            (7, 'source1', 'Ceasefire agreed', 'https://www.link/h1?utm_source=rss',
+             '2024-01-15T06:00:00', NULL, '2024-01-15T06:05:00', 'ffffffffffffffff')
+        ''')
+        conn.commit()
+        conn.close()
+
+        database = NewsDatabase(path)
+        database.connect()
+        try:
+            types = {row['name']: row['type'] for row in
+                     database.conn.execute('PRAGMA table_info(items)')}
+            rows = database.conn.execute('SELECT id, guid_hash FROM items').fetchall()
+
+            assert types['guid_hash'] == 'INTEGER'
+            assert [tuple(row) for row in rows] == [(7, -1)]
+            # Re-fetched under a new-style key, the article is known by its URL
+            assert database.existing_url_hashes([make_url_hash("http://link/h1")])
+            assert len(database.search_items("ceasefire")) == 1
+        finally:
+            database.close()
+
+
+class TestStoredClusters:
+    """Test persisting clusters and briefs for re-ranking and re-rendering."""
+
+    def test_clusters_round_trip_in_order(self, db):
+        """Test that clusters come back in clustering order with item order kept."""
+        items = [make_item(f"h{i}", f"Story {i}") for i in range(5)]
+        for item in items:
+            item.id = db.insert_item(item)
+        now = datetime(2024, 1, 15, 12, 0)
+        clusters = [
+            Event(None, [items[3], items[0]], now, canonical_title="First"),
+            Event(None, [items[1], items[4], items[2]], now, canonical_title="Second"),
+        ]
+
+        db.save_clusters(clusters, created_at=now)
+        db.save_clusters(clusters, created_at=now)  # Replaces, never appends
+        loaded = db.get_clusters()
+
+        assert [e.canonical_title for e in loaded] == ["First", "Second"]
+        assert [[guid_of(i) for i in e.items] for e in loaded] == [["h3", "h0"], ["h1", "h4", "h2"]]
+        assert loaded[1].source_count == 1
+        assert loaded[0].created_at == now
+
+    def test_continuing_story_updated_in_place(self, db):
+        """Test that a story ranked again keeps its row, with new score and members."""
+        old = datetime(2024, 1, 15, 6, 0)
+        items = [make_item(f"h{i}", f"Story {i}", published_at=old + timedelta(hours=i))
+                 for i in range(4)]
+        for item in items:
+            item.id = db.insert_item(item)
+
+        first = [Event(None, items[:2], old, score=3.0, canonical_title="Story")]
+        assert db.upsert_events(first, ranked_at=old) == 1
+
+        later = old + timedelta(hours=6)
+        second = [
+            Event(None, items[:3], later, score=7.0, canonical_title="Story grows"),
+            Event(None, [items[3]], later, score=1.0, canonical_title="Other"),
+        ]
+        assert db.upsert_events(second, ranked_at=later) == 1
+
+        assert second[0].id == first[0].id
+        assert db.get_stats()['events'] == 2
+        stored = db.get_latest_events()
+        assert [(e.canonical_title, e.score, len(e.items)) for e in stored] == \
+            [("Story grows", 7.0, 3), ("Other", 1.0, 1)]
+        assert stored[0].created_at == old  # First seen
+
+    def test_story_matched_by_members_after_first_item_ages_out(self, db):
+        """Test that shared members identify a story whose signature changed."""
+        start = datetime(2024, 1, 15, 6, 0)
+        items = [make_item(f"h{i}", f"Story {i}", published_at=start + timedelta(hours=i))
+                 for i in range(4)]
+        for item in items:
+            item.id = db.insert_item(item)
+
+        first = [Event(None, items[:3], start, canonical_title="Story")]
+        db.upsert_events(first, ranked_at=start)
+        second = [Event(None, items[1:], start, canonical_title="Story")]
+        db.upsert_events(second, ranked_at=start + timedelta(days=1))
+
+        assert second[0].signature != first[0].signature
+        assert second[0].id == first[0].id
+
+    def test_stored_event_continued_at_most_once(self, db):
+        """Test that a story split in two keeps its id for one part only."""
+        run = datetime(2024, 1, 15, 6, 0)
+        items = [make_item(f"h{i}", f"Story {i}", published_at=run + timedelta(hours=i))
+                 for i in range(4)]
+        for item in items:
+            item.id = db.insert_item(item)
+
+        db.upsert_events([Event(None, items, run)], ranked_at=run)
+        halves = [Event(None, items[:2], run), Event(None, items[2:], run)]
+        assert db.upsert_events(halves, ranked_at=run + timedelta(hours=6)) == 1
+
+        assert halves[0].id != halves[1].id
+
+    def test_events_from_before_upserts_are_continued(self, tmp_path):
+        """Test that events stored by older versions get an identity on connect."""
+        database = NewsDatabase(tmp_path / 'news.db')
+        database.connect()
+        database.upsert_source(Source("source1", "Source 1", "http://s1/rss", "news", "US"))
+        items = [make_item(f"h{i}", f"Story {i}") for i in range(2)]
+        for item in items:
+            item.id = database.insert_item(item)
+        run = datetime(2024, 1, 15, 6, 0)
+        event_id = database.create_event([item.id for item in items], created_at=run)
+        database.conn.execute('UPDATE events SET signature = NULL, ranked_at = NULL')
+        database.conn.commit()
+        database.close()
+
+        database.connect()
+        event = Event(None, items, run)
+        inserted = database.upsert_events([event], ranked_at=run + timedelta(days=1))
+        database.close()
+
+        assert (inserted, event.id) == (0, event_id)
+
+    def test_brief_delta(self, db):
+        """Test new, updated, unchanged and dropped events between two briefs."""
+        start = datetime(2024, 1, 15, 6, 0)
+        items = [make_item(f"h{i}", f"Story {i}", published_at=start + timedelta(minutes=i))
+                 for i in range(7)]
+        for item in items:
+            item.id = db.insert_item(item)
+
+        first = [Event(None, items[0:2], start, canonical_title="Growing"),
+                 Event(None, items[2:3], start, canonical_title="Steady"),
+                 Event(None, items[3:4], start, canonical_title="Gone")]
+        db.upsert_events(first, ranked_at=start)
+        assert db.get_brief_delta().new_event_ids == [e.id for e in first]
+
+        later = start + timedelta(hours=12)
+        second = [Event(None, [items[0], items[1], items[4]], later, canonical_title="Growing"),
+                  Event(None, items[2:3], later, canonical_title="Steady"),
+                  Event(None, items[5:7], later, canonical_title="Fresh")]
+        db.upsert_events(second, ranked_at=later)
+
+        delta = db.get_brief_delta()
+        assert delta.previous_ranked_at == start
+        assert delta.new_event_ids == [second[2].id]
+        assert delta.updated_item_ids == {first[0].id: [items[4].id]}
+        assert delta.unchanged_event_ids == [first[1].id]
+        assert delta.dropped == [(first[2].id, "Gone")]
+
+    def test_empty_run_replaces_previous_brief(self, db):
+        """Test that a run ranking no events empties the brief and drops the old events."""
+        start = datetime(2024, 1, 15, 6, 0)
+        item = make_item("h0", "Earthquake strikes Japan coast", published_at=start)
+        item.id = db.insert_item(item)
+        first = [Event(None, [item], start, canonical_title="Earthquake strikes Japan coast")]
+        db.upsert_events(first, ranked_at=start)
+
+        later = start + timedelta(hours=6)
+        assert db.upsert_events([], ranked_at=later) == 0
+
+        delta = db.get_brief_delta()
+        assert db.get_latest_events() == []
+        assert (delta.ranked_at, delta.previous_ranked_at) == (later, start)
+        assert delta.new_event_ids == []
+        assert delta.dropped == [(first[0].id, "Earthquake strikes Japan coast")]
+
+    def test_latest_events_only_from_last_run(self, db):
+        """Test that only the last ranking run's events are returned, by score."""
+        ids = [db.insert_item(make_item(f"h{i}", f"Story {i}")) for i in range(3)]
+        db.create_event([ids[0]], score=9.0, canonical_title="Old",
+                        created_at=datetime(2024, 1, 14, 6, 0))
+        run = datetime(2024, 1, 15, 6, 0)
+        db.create_event([ids[1]], score=1.0, canonical_title="Low", created_at=run)
+        db.create_event([ids[1], ids[2]], score=5.0, canonical_title="High", created_at=run)
+
+        events = db.get_latest_events()
+
+        assert [e.canonical_title for e in events] == ["High", "Low"]
+        assert len(events[0].items) == 2
+        assert events[0].created_at == run
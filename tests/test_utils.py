@@ -1,12 +1,21 @@
 """Tests for utility functions."""
 
+import random
+import stat
+import sys
+
 import pytest
 from src.utils import (
     preprocess_title,
     get_title_tokens,
     jaccard_similarity,
     title_similarity,
-    make_guid_hash
+    make_guid_hash,
+    canonicalize_url,
+    make_url_hash,
+    write_if_changed,
+    TokenVocabulary,
+    ids_jaccard
 )
 
 
@@ -105,6 +114,55 @@ class TestSimilarity:
         assert sim < 0.3
 
 
+class TestTokenVocabulary:
+    """Test integer token ids and id-list similarity."""
+
+    def test_ids_ordered_rarest_first(self):
+        """Test that rarer tokens get smaller ids."""
+        vocab = TokenVocabulary.from_token_sets([{'fed', 'rates'}, {'fed', 'cut'}, {'fed'}])
+
+        assert list(vocab.token_ids({'fed', 'cut', 'rates'})) == [0, 1, 2]
+        assert vocab.ids['fed'] == 2
+
+    def test_unknown_tokens_added(self):
+        """Test that encoding a new token extends the vocabulary."""
+        vocab = TokenVocabulary.from_token_sets([{'fed'}])
+
+        assert list(vocab.token_ids({'fed', 'ecb'})) == [0, 1]
+        assert len(vocab) == 2
+
+    def test_ids_jaccard_matches_sets(self):
+        """Test that id-list similarity equals set similarity exactly."""
+        titles = [
+            "Fed raises interest rates",
+            "Federal Reserve raises rates again",
+            "Earthquake hits Japan",
+            "",
+        ]
+        token_sets = [get_title_tokens(t) for t in titles]
+        vocab = TokenVocabulary.from_token_sets(token_sets)
+        encoded = [vocab.token_ids(tokens) for tokens in token_sets]
+
+        for a, ids_a in zip(token_sets, encoded):
+            for b, ids_b in zip(token_sets, encoded):
+                assert ids_jaccard(set(ids_a), ids_b) == jaccard_similarity(a, b)
+
+    def test_id_lists_smaller_than_string_sets(self):
+        """Test that encoded titles stay small even with a large vocabulary."""
+        rng = random.Random(0)
+        words = [f"word{i}" for i in range(20000)]
+        weights = [1 / (rank + 1) for rank in range(len(words))]
+        token_sets = [set(rng.choices(words, weights, k=8)) for _ in range(5000)]
+        vocab = TokenVocabulary.from_token_sets(token_sets)
+        assert len(vocab) > 5000
+
+        encoded = [vocab.token_ids(tokens) for tokens in token_sets]
+
+        id_bytes = sum(sys.getsizeof(ids) for ids in encoded)
+        set_bytes = sum(sys.getsizeof(tokens) for tokens in token_sets)
+        assert id_bytes * 3 < set_bytes
+
+
 class TestGuidHash:
     """Test GUID hashing for deduplication."""
 
@@ -123,8 +181,63 @@ class TestGuidHash:
         hash2 = make_guid_hash(text2)
         assert hash1 != hash2
 
-    def test_make_guid_hash_length(self):
-        """Test that hash has expected length (16 chars)."""
-        text = "test"
-        hash_val = make_guid_hash(text)
-        assert len(hash_val) == 16
+    def test_make_guid_hash_fits_sqlite_integer(self):
+        """Test that hash is a signed 64-bit integer."""
+        hash_val = make_guid_hash("test")
+        assert isinstance(hash_val, int)
+        assert -2 ** 63 <= hash_val < 2 ** 63
+
+
+class TestCanonicalUrl:
+    """Test URL canonicalization for cross-feed deduplication."""
+
+    @pytest.mark.parametrize('variant', [
+        "http://www.example.com/news/quake-123",
+        "https://example.com/news/quake-123/",
+        "https://EXAMPLE.com/news/quake-123?utm_source=rss&utm_medium=feed",
+        "https://example.com/news/quake-123?at_medium=RSS&fbclid=abc#comments",
+        "https://amp.example.com/news/quake-123",
+        "https://example.com/news/quake-123/amp",
+        "https://m.example.com/news/quake-123.amp",
+    ])
+    def test_variants_share_canonical_form(self, variant):
+        """Test that tracking, scheme, host and AMP variants collapse."""
+        assert canonicalize_url(variant) == "https://example.com/news/quake-123"
+        assert make_url_hash(variant) == make_url_hash("https://example.com/news/quake-123")
+
+    def test_meaningful_query_kept_and_sorted(self):
+        """Test that non-tracking parameters identify the article."""
+        assert canonicalize_url("https://example.com/story?page=2&id=5&utm_campaign=x") == \
+            "https://example.com/story?id=5&page=2"
+        assert make_url_hash("https://example.com/story?id=5") != \
+            make_url_hash("https://example.com/story?id=6")
+
+    def test_path_case_preserved(self):
+        """Test that paths, which are case-sensitive, are not lowercased."""
+        assert canonicalize_url("https://example.com/News/A") == "https://example.com/News/A"
+
+
+class TestWriteIfChanged:
+    """Test atomic, change-only file writes."""
+
+    def test_write_if_changed(self, tmp_path):
+        """Test that identical content is not rewritten."""
+        path = tmp_path / 'out' / 'brief.md'
+
+        assert write_if_changed(path, "hello") is True
+        assert write_if_changed(path, "hello") is False
+        assert write_if_changed(path, "hello again") is True
+        assert path.read_text() == "hello again"
+        assert [p.name for p in path.parent.iterdir()] == ['brief.md']
+
+    def test_file_mode_follows_umask_and_existing_file(self, tmp_path, monkeypatch):
+        """Test that new files get umask-based permissions and rewrites keep the old mode."""
+        monkeypatch.setattr('src.utils._UMASK', 0o022)
+        path = tmp_path / 'brief.md'
+
+        write_if_changed(path, "hello")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        path.chmod(0o640)
+        write_if_changed(path, "hello again")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
@@ -0,0 +1,80 @@
+"""Tests for render preparation."""
+
+import pytest
+from datetime import datetime, timedelta
+from src.models import NewsItem, Event
+from src.view import build_brief_view
+from src.render import render_brief
+from src.render_html import render_html_brief
+
+
+def make_event(source_ids, now, title="Shared headline"):
+    """Create an Event with one item per source id."""
+    items = [
+        NewsItem(i, source_id, f"{title} {i}", f"http://link/{source_id}/{i}",
+                 now - timedelta(minutes=i), None, now, f"h{source_id}{i}")
+        for i, source_id in enumerate(source_ids)
+    ]
+    return Event(id=None, items=items, created_at=now, canonical_title=title)
+
+
+class TestBriefView:
+    """Test the shared brief view model."""
+
+    def test_display_items_sorted_wire_first_and_limited(self):
+        """Test that wire sources lead and extra sources are counted."""
+        now = datetime.utcnow()
+        event = make_event(['bbc_world', 'economist', 'reuters_world',
+                            'npr_news', 'nyt_world', 'guardian_world'], now)
+
+        view = build_brief_view([event], generated_at=now)
+        event_view = view.events[0]
+
+        assert event_view.display_items[0].source_id == 'reuters_world'
+        assert event_view.display_items[0].tier == 'wire'
+        assert event_view.display_items[0].source_name == 'Reuters World News'
+        assert len(event_view.display_items) == 5
+        assert event_view.remaining_count == 1
+        assert 'economist' not in [d.source_id for d in event_view.display_items]
+
+    def test_sections_and_stats(self):
+        """Test that events are split into sections and counted once."""
+        now = datetime.utcnow()
+        general = make_event(['bbc_world', 'npr_news'], now, "General story")
+        financial = make_event(['wsj_world', 'bloomberg', 'bbc_world'], now, "Market story")
+
+        view = build_brief_view([general, financial], generated_at=now)
+
+        assert [e.title for e in view.section('general').events] == ["General story"]
+        assert [e.title for e in view.section('financial').events] == ["Market story"]
+        assert view.stats.event_count == 2
+        assert view.stats.item_count == 5
+        assert view.stats.source_mentions == 5
+
+    def test_formatters_share_view(self, tmp_path):
+        """Test that both renderers produce output from one view."""
+        now = datetime.utcnow()
+        events = [make_event(['reuters_world', 'bbc_world'], now)]
+        view = build_brief_view(events, generated_at=now)
+
+        markdown = render_brief(events, tmp_path / 'brief.md', view=view)
+        html = render_html_brief(events, tmp_path / 'brief.html', view=view)
+
+        assert "- **Shared headline**" in markdown
+        assert "[Reuters World News](http://link/reuters_world/0)" in markdown
+        assert '<h2 class="event-title">Shared headline</h2>' in html
+        assert now.strftime('%Y-%m-%d') in markdown
+
+    def test_html_links_hashed_stylesheet(self, tmp_path):
+        """Test that CSS is external, content-hashed and not rewritten."""
+        now = datetime.utcnow()
+        events = [make_event(['reuters_world', 'bbc_world'], now)]
+        view = build_brief_view(events, generated_at=now)
+        (tmp_path / 'brief.0000000000.css').write_text('stale')
+
+        html = render_html_brief(events, tmp_path / 'brief.html', view=view)
+
+        css_files = [p.name for p in tmp_path.glob('brief.*.css')]
+        assert len(css_files) == 1
+        assert f'href="{css_files[0]}"' in html
+        assert '<style>' not in html